@@ -0,0 +1,50 @@
+"""
+效能測試共用工具 - 以無視窗模式初始化 pygame 與遊戲系統
+"""
+
+import os
+import sys
+
+# 效能測試不開視窗、不輸出聲音
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+# 將 src 目錄加入 Python 路徑
+SRC_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "src")
+sys.path.insert(0, os.path.abspath(SRC_PATH))
+
+import pygame
+
+from constants import *
+
+
+def init_headless():
+    """
+    初始化無視窗的 pygame 環境
+
+    Returns:
+        pygame.Surface: 可供 draw() 使用的離屏畫面
+    """
+    pygame.init()
+    try:
+        pygame.mixer.init()
+    except pygame.error:
+        pass  # 沒有音效裝置時不影響效能測試
+
+    from systems.sound_manager import sound_manager
+    from systems.save_system import save_system
+
+    # 效能測試不播放音效，也不寫入玩家存檔
+    sound_manager.set_enabled(False)
+    save_system.persistent = False
+
+    return pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+
+
+def format_summary(name, summary):
+    """格式化一列毫秒摘要"""
+    return (
+        f"{name:<10} mean {summary['mean']:7.3f} ms  "
+        f"p50 {summary['p50']:7.3f}  p95 {summary['p95']:7.3f}  "
+        f"p99 {summary['p99']:7.3f}  max {summary['max']:7.3f}"
+    )
@@ -0,0 +1,230 @@
+"""
+關卡效能測試 - 以固定腳本輸入無視窗地執行每個關卡，量測更新與繪製的吞吐量
+
+用法：
+    python benchmarks/level_benchmark.py --ticks 3600 --json result.json
+    python benchmarks/level_benchmark.py --compare result.json
+"""
+
+import argparse
+import json
+import platform
+import time
+
+from common import init_headless, format_summary
+
+import pygame
+
+from constants import *
+from states.game_states import GameStateManager
+from systems.gc_policy import gc_policy
+from systems.input_source import ScriptedInput
+from systems.particle_system import particle_system
+from systems.perf_stats import summarize_ms
+from systems.sim_clock import SimulationClock
+from systems.sprite_cache import sprite_cache
+
+BENCHMARK_LEVELS = [LEVEL_1, LEVEL_2, LEVEL_2_5, LEVEL_3]
+
+AIM_RIGHT = (WINDOW_WIDTH - 100, GROUND_Y - 60)
+AIM_LEFT = (100, GROUND_Y - 60)
+NO_BUTTONS = (False, False, False)
+LEFT_BUTTON = (True, False, False)
+RIGHT_BUTTON = (False, False, True)
+
+# 固定的腳本輸入：(持續步數, 按住的按鍵, 滑鼠按鍵, 滑鼠位置, 開始時的按鍵事件)
+BENCHMARK_SCRIPT = [
+    (40, [pygame.K_d], NO_BUTTONS, AIM_RIGHT, []),
+    (10, [pygame.K_d], LEFT_BUTTON, AIM_RIGHT, [pygame.K_w]),
+    (20, [], NO_BUTTONS, AIM_RIGHT, [pygame.K_w]),
+    (70, [], RIGHT_BUTTON, AIM_RIGHT, []),
+    (15, [], NO_BUTTONS, AIM_RIGHT, []),
+    (20, [pygame.K_a, pygame.K_LSHIFT], NO_BUTTONS, AIM_LEFT, []),
+    (30, [pygame.K_a], LEFT_BUTTON, AIM_LEFT, [pygame.K_w]),
+    (20, [pygame.K_SPACE], NO_BUTTONS, AIM_LEFT, []),
+    (10, [], NO_BUTTONS, AIM_RIGHT, [pygame.K_q]),
+    (40, [pygame.K_s], NO_BUTTONS, AIM_RIGHT, []),
+]
+
+
+def run_level(screen, level_number, ticks, seed, draw=True, keep_alive=True):
+    """
+    以腳本輸入執行單一關卡並收集每步的耗時
+
+    Args:
+        screen (pygame.Surface): 離屏畫面
+        level_number: 關卡編號
+        ticks (int): 模擬步數
+        seed (int): 亂數種子
+        draw (bool): 是否量測繪製
+        keep_alive (bool): 是否讓玩家保持滿血，確保整段測試都在戰鬥中
+
+    Returns:
+        dict: 該關卡的量測結果
+    """
+    particle_system.clear_all()
+    sprite_cache.reset_stats()
+    gc_policy.reset_stats()
+
+    clock = SimulationClock()
+    script = ScriptedInput(BENCHMARK_SCRIPT)
+    manager = GameStateManager(clock, input_source=script, seed=seed)
+    manager.start_level(level_number)
+
+    update_ms = []
+    draw_ms = []
+    restarts = 0
+
+    for _ in range(ticks):
+        for event in script.get_events():
+            manager.handle_event(event)
+
+        level = manager.current_level
+        if keep_alive:
+            level.player.health = 3
+
+        start = time.perf_counter()
+        manager.update()
+        clock.step()
+        update_ms.append((time.perf_counter() - start) * 1000.0)
+
+        if draw:
+            start = time.perf_counter()
+            screen.fill(BLACK)
+            manager.draw(screen)
+            draw_ms.append((time.perf_counter() - start) * 1000.0)
+
+        # 關卡結束時重新開始，讓每個關卡的工作量保持一致
+        if level.level_complete or level.game_over:
+            manager.start_level(level_number)
+            restarts += 1
+
+    frame_ms = [u + d for u, d in zip(update_ms, draw_ms)] if draw else update_ms
+    total_update = sum(update_ms) / 1000.0
+
+    return {
+        "level": level_number,
+        "ticks": ticks,
+        "restarts": restarts,
+        "update_ticks_per_second": ticks / total_update if total_update > 0 else 0.0,
+        "update": summarize_ms(update_ms),
+        "draw": summarize_ms(draw_ms) if draw else None,
+        "frame": summarize_ms(frame_ms),
+        "sprite_cache": sprite_cache.get_stats() if draw else None,
+        "gc": gc_policy.get_stats(),
+    }
+
+
+def print_result(result):
+    """輸出單一關卡的結果"""
+    print(
+        f"\n關卡 {result['level']}：{result['ticks']} 步，"
+        f"重新開始 {result['restarts']} 次，"
+        f"更新吞吐量 {result['update_ticks_per_second']:.0f} ticks/s"
+    )
+    print("  " + format_summary("update", result["update"]))
+    if result["draw"]:
+        print("  " + format_summary("draw", result["draw"]))
+    print("  " + format_summary("frame", result["frame"]))
+    cache = result.get("sprite_cache")
+    if cache:
+        print(
+            f"  sprite cache: 命中率 {cache['hit_rate'] * 100:.1f}% "
+            f"({cache['hits']} hits / {cache['misses']} misses, "
+            f"{cache['evictions']} evictions, {cache['entries']} entries)"
+        )
+    gc_stats = result.get("gc")
+    if gc_stats:
+        print("  " + format_gc(gc_stats))
+
+
+def format_gc(stats):
+    """格式化垃圾回收暫停的統計"""
+    parts = []
+    for bucket, label in (("play", "遊玩中"), ("pause", "暫停時")):
+        counts = stats["collections"][bucket]
+        parts.append(
+            f"{label} {sum(counts)} 次（gen0/1/2 = {counts[0]}/{counts[1]}/{counts[2]}）"
+            f"共 {stats['pause_ms'][bucket]:.1f} ms、最長 {stats['max_pause_ms'][bucket]:.2f} ms"
+        )
+    return "gc: " + "；".join(parts)
+
+
+def compare_results(current, baseline):
+    """與基準結果比較平均值與 p95 的變化"""
+    baseline_by_level = {str(r["level"]): r for r in baseline["levels"]}
+    print("\n與基準比較（正值代表變慢）：")
+    for result in current["levels"]:
+        base = baseline_by_level.get(str(result["level"]))
+        if base is None:
+            continue
+        for stage in ("update", "draw", "frame"):
+            if not result[stage] or not base[stage]:
+                continue
+            parts = []
+            for key in ("mean", "p95"):
+                old = base[stage][key]
+                new = result[stage][key]
+                change = (new - old) / old * 100.0 if old > 0 else 0.0
+                parts.append(f"{key} {old:.3f} -> {new:.3f} ms ({change:+.1f}%)")
+            print(f"  關卡 {result['level']} {stage:<6} " + "  ".join(parts))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="關卡無視窗效能測試")
+    parser.add_argument("--ticks", type=int, default=FPS * 60, help="每關模擬步數")
+    parser.add_argument("--seed", type=int, default=1234, help="亂數種子")
+    parser.add_argument("--no-draw", action="store_true", help="只量測更新")
+    parser.add_argument(
+        "--allow-death", action="store_true", help="不替玩家補血（死亡後重新開始）"
+    )
+    parser.add_argument(
+        "--gc-mode",
+        choices=("default", "thresholds", "defer"),
+        default=GC_PLAY_MODE if GC_POLICY_ENABLED else "default",
+        help="遊玩中的垃圾回收策略（default 為 Python 預設設定）",
+    )
+    parser.add_argument("--json", help="將結果寫入 JSON 檔")
+    parser.add_argument("--compare", help="與先前輸出的 JSON 結果比較")
+    args = parser.parse_args()
+
+    gc_policy.enabled = args.gc_mode != "default"
+    if gc_policy.enabled:
+        gc_policy.play_mode = args.gc_mode
+
+    screen = init_headless()
+
+    results = {
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "seed": args.seed,
+        "ticks": args.ticks,
+        "gc_mode": args.gc_mode,
+        "levels": [],
+    }
+    for level_number in BENCHMARK_LEVELS:
+        result = run_level(
+            screen,
+            level_number,
+            args.ticks,
+            args.seed,
+            draw=not args.no_draw,
+            keep_alive=not args.allow_death,
+        )
+        results["levels"].append(result)
+        print_result(result)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\n結果已寫入 {args.json}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            compare_results(results, json.load(f))
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
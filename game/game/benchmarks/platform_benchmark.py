@@ -0,0 +1,183 @@
+"""
+平台查詢效能測試 - 比較線性掃描與網格索引在不同平台數量下的查詢耗時
+
+用法：
+    python benchmarks/platform_benchmark.py
+    python benchmarks/platform_benchmark.py --counts 10 100 1000 5000 --queries 20000
+"""
+
+import argparse
+import json
+import random
+import time
+
+from common import format_summary
+
+import pygame
+
+from constants import *
+from systems.perf_stats import summarize_ms
+from systems.platform_system import PlatformSystem
+
+DEFAULT_COUNTS = [4, 10, 50, 200, 1000, 5000]
+BASE_PLATFORM_COUNT = 10  # 現有關卡的平台數量，用來維持相同的平台密度
+
+
+def build_arena(platform_system, count, seed):
+    """
+    依平台數量放大場地並隨機生成平台，維持與現有關卡相近的平台密度
+
+    Returns:
+        tuple: (場地寬度, 場地高度)
+    """
+    rng = random.Random(seed)
+    scale = max(1.0, (count / BASE_PLATFORM_COUNT) ** 0.5)
+    arena_width = int(WINDOW_WIDTH * scale)
+    arena_height = int(WINDOW_HEIGHT * scale)
+
+    for _ in range(count):
+        width = rng.randint(80, 200)
+        x = rng.randint(0, arena_width - width)
+        y = rng.randint(40, arena_height - 40)
+        platform_system.add_platform(x, y, width, rng.choice((20, 25)))
+
+    return arena_width, arena_height
+
+
+def build_queries(arena_width, arena_height, count, seed):
+    """生成固定的查詢位置（實體矩形與垂直速度）"""
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(count):
+        x = rng.randint(0, arena_width - PLAYER_WIDTH)
+        y = rng.randint(0, arena_height - PLAYER_HEIGHT)
+        vel_y = rng.uniform(-10, 15)
+        queries.append((pygame.Rect(x, y, PLAYER_WIDTH, PLAYER_HEIGHT), vel_y))
+    return queries
+
+
+def run_queries(platform_system, queries):
+    """
+    對每個查詢位置執行三種平台查詢
+
+    Returns:
+        tuple: (各查詢類型的每批耗時毫秒列表, 查詢結果)
+    """
+    timings = {"check_collision": [], "is_on_platform": [], "nearest_above": []}
+    results = []
+    batch = 100
+
+    for start in range(0, len(queries), batch):
+        chunk = queries[start : start + batch]
+
+        begin = time.perf_counter()
+        collisions = [platform_system.check_collision(r, v)[0] for r, v in chunk]
+        timings["check_collision"].append((time.perf_counter() - begin) * 1000.0)
+
+        begin = time.perf_counter()
+        on_platform = [platform_system.is_on_platform(r) for r, _ in chunk]
+        timings["is_on_platform"].append((time.perf_counter() - begin) * 1000.0)
+
+        begin = time.perf_counter()
+        nearest = [
+            platform_system.get_nearest_platform_above(r.centerx, r.top)
+            for r, _ in chunk
+        ]
+        timings["nearest_above"].append((time.perf_counter() - begin) * 1000.0)
+
+        results.extend(zip(collisions, on_platform, nearest))
+
+    return timings, results
+
+
+def benchmark_count(count, query_count, seed):
+    """比較單一平台數量下兩種實作的耗時，並確認查詢結果一致"""
+    linear = PlatformSystem(cell_size=None)
+    indexed = PlatformSystem(min_index_count=0)
+    arena = build_arena(linear, count, seed)
+    build_arena(indexed, count, seed)
+    queries = build_queries(*arena, query_count, seed + 1)
+
+    linear_timings, linear_results = run_queries(linear, queries)
+    indexed_timings, indexed_results = run_queries(indexed, queries)
+
+    # 以平台在列表中的位置比較結果，兩個系統的平台物件不同
+    def normalize(system, results):
+        index_of = {id(p): i for i, p in enumerate(system.platforms)}
+        return [
+            (
+                index_of.get(id(c)),
+                on,
+                index_of.get(id(n)),
+            )
+            for c, on, n in results
+        ]
+
+    matches = normalize(linear, linear_results) == normalize(indexed, indexed_results)
+
+    per_query_us = {}
+    for name in linear_timings:
+        linear_total = sum(linear_timings[name]) * 1000.0 / query_count
+        indexed_total = sum(indexed_timings[name]) * 1000.0 / query_count
+        per_query_us[name] = {"linear": linear_total, "indexed": indexed_total}
+
+    return {
+        "platforms": count,
+        "arena": list(arena),
+        "queries": query_count,
+        "results_match": matches,
+        "per_query_us": per_query_us,
+        "linear": {k: summarize_ms(v) for k, v in linear_timings.items()},
+        "indexed": {k: summarize_ms(v) for k, v in indexed_timings.items()},
+    }
+
+
+def print_result(result):
+    """輸出單一平台數量的結果"""
+    status = "一致" if result["results_match"] else "不一致！"
+    print(
+        f"\n{result['platforms']} 個平台（場地 {result['arena'][0]}x{result['arena'][1]}），"
+        f"{result['queries']} 次查詢，結果{status}"
+    )
+    for name, cost in result["per_query_us"].items():
+        speedup = cost["linear"] / cost["indexed"] if cost["indexed"] > 0 else 0.0
+        print(
+            f"  {name:<16} linear {cost['linear']:8.2f} us  "
+            f"indexed {cost['indexed']:8.2f} us  ({speedup:.1f}x)"
+        )
+    print("  每 100 次查詢：")
+    for name in result["indexed"]:
+        print("    " + format_summary(name[:10], result["indexed"][name]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="平台查詢效能測試")
+    parser.add_argument(
+        "--counts", type=int, nargs="+", default=DEFAULT_COUNTS, help="平台數量"
+    )
+    parser.add_argument("--queries", type=int, default=10000, help="每種數量的查詢次數")
+    parser.add_argument("--seed", type=int, default=1234, help="亂數種子")
+    parser.add_argument("--json", help="將結果寫入 JSON 檔")
+    args = parser.parse_args()
+
+    results = {
+        "cell_size": PLATFORM_GRID_CELL_SIZE,
+        "min_index_count": PLATFORM_INDEX_MIN_COUNT,
+        "counts": [],
+    }
+    for count in args.counts:
+        result = benchmark_count(count, args.queries, args.seed)
+        results["counts"].append(result)
+        print_result(result)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\n結果已寫入 {args.json}")
+
+    if not all(r["results_match"] for r in results["counts"]):
+        raise SystemExit("網格索引的查詢結果與線性掃描不一致")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""
+時光倒流效能測試 - 量測每個關卡擷取與儲存世界快照的耗時與記憶體用量
+
+比較完整快照與差異編碼兩種儲存方式，並確認緩衝區中的快照都能正確還原
+
+用法：
+    python benchmarks/rewind_benchmark.py --ticks 3600
+    python benchmarks/rewind_benchmark.py --interval 1 --max-kb 256 --json rewind.json
+"""
+
+import argparse
+import json
+import time
+
+from common import init_headless, format_summary
+from level_benchmark import BENCHMARK_LEVELS, BENCHMARK_SCRIPT
+
+import pygame
+
+from constants import *
+from states.game_states import GameStateManager
+from systems.input_source import ScriptedInput
+from systems.particle_system import particle_system
+from systems.perf_stats import summarize_ms
+from systems.rewind import RewindBuffer
+from systems.sim_clock import SimulationClock
+
+
+def run_level(level_number, ticks, seed, interval, max_bytes):
+    """
+    以腳本輸入執行單一關卡，每隔 interval 步擷取一次快照存入兩種緩衝區
+
+    Returns:
+        dict: 該關卡的量測結果
+    """
+    particle_system.clear_all()
+
+    clock = SimulationClock()
+    script = ScriptedInput(BENCHMARK_SCRIPT)
+    manager = GameStateManager(clock, input_source=script, seed=seed)
+    manager.start_level(level_number)
+
+    buffers = {
+        "full": RewindBuffer(max_bytes=max_bytes, use_delta=False),
+        "delta": RewindBuffer(max_bytes=max_bytes, use_delta=True),
+    }
+    capture_ms = []
+    push_ms = {name: [] for name in buffers}
+    sizes = {name: [] for name in buffers}
+    captured = {}  # 遊戲時間步數 -> 快照，用來驗證還原結果
+    restarts = 0
+
+    level = None
+    for _ in range(ticks):
+        for event in script.get_events():
+            manager.handle_event(event)
+
+        if manager.current_level is not level:
+            level = manager.current_level
+            level.rewind_buffer = None  # 關閉關卡本身的記錄，只量測這裡的緩衝區
+            for buffer in buffers.values():
+                buffer.clear()
+            captured.clear()
+        level.player.health = 3
+
+        tick = clock.sim_tick
+        if tick % interval == 0:
+            start = time.perf_counter()
+            state = level.world_snapshotter.capture()
+            capture_ms.append((time.perf_counter() - start) * 1000.0)
+            captured[tick] = state
+
+            for name, buffer in buffers.items():
+                start = time.perf_counter()
+                buffer.push(tick, state)
+                push_ms[name].append((time.perf_counter() - start) * 1000.0)
+                sizes[name].append(len(buffer.entries[-1][2]))
+
+        manager.update()
+        clock.step()
+
+        if level.level_complete or level.game_over:
+            manager.start_level(level_number)
+            restarts += 1
+
+    # 驗證緩衝區中的快照都能還原成擷取時的內容，並量測解碼耗時
+    decode_ms = {name: [] for name in buffers}
+    matches = True
+    for name, buffer in buffers.items():
+        for index in range(len(buffer)):
+            start = time.perf_counter()
+            tick, state = buffer.state_at(index)
+            decode_ms[name].append((time.perf_counter() - start) * 1000.0)
+            matches = matches and state == captured[tick]
+
+    mean_capture = sum(capture_ms) / len(capture_ms) if capture_ms else 0.0
+    storage = {}
+    for name, buffer in buffers.items():
+        mean_push = sum(push_ms[name]) / len(push_ms[name]) if push_ms[name] else 0.0
+        storage[name] = {
+            "push": summarize_ms(push_ms[name]),
+            "decode": summarize_ms(decode_ms[name]),
+            "mean_bytes": sum(sizes[name]) / len(sizes[name]) if sizes[name] else 0,
+            "per_tick_us": (mean_capture + mean_push) * 1000.0 / interval,
+            "buffer": buffer.get_stats(),
+            "history_seconds": buffer.get_stats()["span_ticks"] / SIM_TICK_RATE,
+        }
+
+    return {
+        "level": level_number,
+        "ticks": ticks,
+        "restarts": restarts,
+        "snapshots": len(capture_ms),
+        "results_match": matches,
+        "capture": summarize_ms(capture_ms),
+        "storage": storage,
+    }
+
+
+def print_result(result):
+    """輸出單一關卡的結果"""
+    status = "一致" if result["results_match"] else "不一致！"
+    print(
+        f"\n關卡 {result['level']}：{result['ticks']} 步，"
+        f"{result['snapshots']} 個快照，重新開始 {result['restarts']} 次，還原結果{status}"
+    )
+    print("  " + format_summary("capture", result["capture"]))
+    for name, storage in result["storage"].items():
+        buffer = storage["buffer"]
+        print(
+            f"  {name:<5} 每步 {storage['per_tick_us']:6.1f} us  "
+            f"平均 {storage['mean_bytes']:7.0f} bytes/快照  "
+            f"保留 {buffer['snapshots']} 個快照 ({buffer['bytes'] / 1024:.0f} KB, "
+            f"{storage['history_seconds']:.1f} 秒)  丟棄 {buffer['evicted']} 個"
+        )
+        print("        " + format_summary("push", storage["push"]))
+        print("        " + format_summary("decode", storage["decode"]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="時光倒流快照效能測試")
+    parser.add_argument("--ticks", type=int, default=FPS * 60, help="每關模擬步數")
+    parser.add_argument("--seed", type=int, default=1234, help="亂數種子")
+    parser.add_argument(
+        "--interval",
+        type=int,
+        default=REWIND_SNAPSHOT_INTERVAL,
+        help="每隔多少步擷取一次快照",
+    )
+    parser.add_argument(
+        "--max-kb",
+        type=int,
+        default=REWIND_MAX_BYTES // 1024,
+        help="緩衝區記憶體上限（KB）",
+    )
+    parser.add_argument("--json", help="將結果寫入 JSON 檔")
+    args = parser.parse_args()
+
+    init_headless()
+
+    results = {
+        "seed": args.seed,
+        "ticks": args.ticks,
+        "interval": args.interval,
+        "max_bytes": args.max_kb * 1024,
+        "levels": [],
+    }
+    for level_number in BENCHMARK_LEVELS:
+        result = run_level(
+            level_number, args.ticks, args.seed, args.interval, args.max_kb * 1024
+        )
+        results["levels"].append(result)
+        print_result(result)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\n結果已寫入 {args.json}")
+
+    pygame.quit()
+
+    if not all(r["results_match"] for r in results["levels"]):
+        raise SystemExit("緩衝區還原的快照與擷取時不一致")
+
+
+if __name__ == "__main__":
+    main()
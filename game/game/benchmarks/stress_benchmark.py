@@ -0,0 +1,449 @@
+"""
+壓力情境效能測試 - 在關卡中放入指定數量的敵人、投射物與粒子，掃描各種數量組合
+量測每幀的更新與繪製耗時，畫出耗時對實體數量的曲線，找出超過幀預算的數量
+
+用法：
+    python benchmarks/stress_benchmark.py --enemy-types MageRobot --enemies 1 2 4 8 16 32
+    python benchmarks/stress_benchmark.py --enemies 1 --projectile-types TrackingBullet \\
+        --projectiles 0 50 100 200 400
+    python benchmarks/stress_benchmark.py --particles 0 500 1000 2000 4000 --csv particles.csv
+"""
+
+import argparse
+import csv
+import itertools
+import json
+import platform
+import random
+import time
+import unicodedata
+
+from common import init_headless, format_summary
+from level_benchmark import BENCHMARK_LEVELS
+
+import pygame
+
+from constants import *
+from entities.enemies import (
+    TrainingDummy,
+    SmallRobot,
+    EliteMech,
+    MageRobot,
+    GiantRobot,
+    Bullet,
+    MissileBullet,
+    LaserBeam,
+    TrackingBullet,
+)
+from states.game_states import GameStateManager
+from systems.input_source import ScriptedInput
+from systems.particle_system import particle_system, Particle
+from systems.perf_stats import summarize_ms
+from systems.sim_clock import SimulationClock
+from systems.world_snapshot import WorldSnapshotter
+
+ENEMY_TYPES = {
+    cls.__name__: cls
+    for cls in (TrainingDummy, SmallRobot, EliteMech, MageRobot, GiantRobot)
+}
+PROJECTILE_TYPES = {
+    cls.__name__: cls for cls in (Bullet, MissileBullet, LaserBeam, TrackingBullet)
+}
+
+FRAME_BUDGET_MS = 1000.0 / FPS
+CURVE_WIDTH = 50  # 曲線長條的最大字元數
+
+# 玩家站在場地中央不動（由腳本保持滿血），敵人持續攻擊
+IDLE_SCRIPT = [(60, [], (False, False, False), (WINDOW_WIDTH // 2, GROUND_Y - 60), [])]
+
+PARTICLE_COLORS = [YELLOW, RED, WHITE, EFFECT_COLOR_COMBO, EFFECT_COLOR_MAGIC]
+
+
+class Scenario:
+    """
+    一組壓力情境的實體數量
+
+    enemies 為每種敵人的數量；projectiles 與 particles 為維持存活的總數，
+    每步更新前補足被回收或消失的部分（敵人自己發射的投射物也計入）。
+    """
+
+    def __init__(self, enemies, projectiles, particles):
+        """
+        Args:
+            enemies (dict): 敵人類型名稱 -> 數量
+            projectiles (dict): 投射物類型名稱 -> 維持存活的數量
+            particles (int): 維持存活的粒子數量
+        """
+        self.enemies = enemies
+        self.projectiles = projectiles
+        self.particles = particles
+
+    @property
+    def enemy_count(self):
+        return sum(self.enemies.values())
+
+    @property
+    def projectile_count(self):
+        return sum(self.projectiles.values())
+
+    def label(self):
+        """情境的簡短說明"""
+        parts = [f"{name}×{count}" for name, count in self.enemies.items() if count]
+        parts += [
+            f"{name}×{count}" for name, count in self.projectiles.items() if count
+        ]
+        if self.particles:
+            parts.append(f"粒子×{self.particles}")
+        return " ".join(parts) or "空場地"
+
+    def to_dict(self):
+        return {
+            "enemies": dict(self.enemies),
+            "projectiles": dict(self.projectiles),
+            "particles": self.particles,
+        }
+
+
+def build_sweep(
+    enemy_types, enemy_counts, projectile_types, projectile_counts, particles
+):
+    """
+    建立所有數量組合的情境
+
+    Args:
+        enemy_types (list): 敵人類型名稱（每種放入相同數量）
+        enemy_counts (list): 每種敵人的數量
+        projectile_types (list): 投射物類型名稱（總數平均分配）
+        projectile_counts (list): 投射物總數
+        particles (list): 粒子數量
+
+    Returns:
+        list: Scenario 列表
+    """
+    scenarios = []
+    for enemy_count, projectile_count, particle_count in itertools.product(
+        enemy_counts, projectile_counts, particles
+    ):
+        share, extra = divmod(projectile_count, len(projectile_types))
+        scenarios.append(
+            Scenario(
+                {name: enemy_count for name in enemy_types},
+                {
+                    name: share + (1 if index < extra else 0)
+                    for index, name in enumerate(projectile_types)
+                },
+                particle_count,
+            )
+        )
+    return scenarios
+
+
+def build_scenario(manager, level_number, scenario, rng):
+    """
+    開始關卡並換成情境指定的敵人
+
+    關卡原本的敵人被移除，平台與玩家保持不變；敵人平均分布在地面上。
+    所有敵人都不會受到攻擊，場上至少要有一個敵人，否則關卡會立即完成。
+
+    Returns:
+        GameLevel: 建立好的關卡
+    """
+    particle_system.clear_all()
+    manager.start_level(level_number)
+    level = manager.current_level
+    level.enemies.clear()
+    level.projectile_manager.clear()
+    level.health_item_spawner.items.clear()
+
+    classes = [
+        ENEMY_TYPES[name]
+        for name, count in scenario.enemies.items()
+        for _ in range(count)
+    ]
+    rng.shuffle(classes)
+    spacing = (WINDOW_WIDTH - 100) / max(1, len(classes))
+    for index, cls in enumerate(classes):
+        enemy = cls(0, 0, clock=level.clock)
+        enemy.x = int(50 + spacing * (index + 0.5) - enemy.width / 2)
+        enemy.y = GROUND_Y - enemy.height
+        level._add_enemy(enemy)
+
+    # 快照以設定時的敵人編號，換掉敵人後重新建立（與關卡初始化的順序相同）
+    level.world_snapshotter = WorldSnapshotter(level)
+    if level.rewind_buffer is not None:
+        level.rewind_buffer.clear()
+    level.initial_state = level.world_snapshotter.capture()
+
+    # 情境的投射物不受一般的數量上限限制
+    level.projectile_manager.max_projectiles = max(
+        PROJECTILE_MAX_COUNT, scenario.projectile_count * 2
+    )
+    return level
+
+
+def spawn_projectile(level, cls, rng):
+    """從畫面上方隨機位置朝地面發射一個投射物"""
+    x = rng.uniform(0, WINDOW_WIDTH)
+    y = rng.uniform(0, GROUND_Y / 2)
+    target_x = rng.uniform(0, WINDOW_WIDTH)
+    if cls is TrackingBullet:
+        args = (x, y, level.player)
+    else:
+        args = (x, y, target_x, GROUND_Y)
+    kwargs = {"clock": level.clock} if cls in (LaserBeam, TrackingBullet) else {}
+    return level.projectile_manager.spawn(cls, None, *args, **kwargs)
+
+
+def top_up(level, scenario, rng):
+    """補足情境指定的投射物與粒子數量"""
+    manager = level.projectile_manager
+    for name, target in scenario.projectiles.items():
+        cls = PROJECTILE_TYPES[name]
+        live = sum(1 for projectile in manager.active if type(projectile) is cls)
+        for _ in range(target - live):
+            spawn_projectile(level, cls, rng)
+
+    for _ in range(scenario.particles - particle_system.get_particle_count()):
+        particle_system.add_particle(
+            Particle(
+                rng.uniform(0, WINDOW_WIDTH),
+                rng.uniform(0, GROUND_Y),
+                rng.uniform(-3, 3),
+                rng.uniform(-5, 1),
+                rng.choice(PARTICLE_COLORS),
+                rng.randint(2, 6),
+                rng.randint(20, 60),
+                gravity=0.2,
+            )
+        )
+
+
+def run_scenario(screen, level_number, scenario, ticks, warmup, seed, draw=True):
+    """
+    執行一組情境並收集每步的耗時
+
+    Returns:
+        dict: 該情境的量測結果
+    """
+    rng = random.Random(seed)
+    clock = SimulationClock()
+    script = ScriptedInput(IDLE_SCRIPT)
+    manager = GameStateManager(clock, input_source=script, seed=seed)
+    level = build_scenario(manager, level_number, scenario, rng)
+
+    update_ms = []
+    draw_ms = []
+    live = {"enemies": [], "projectiles": [], "particles": []}
+
+    for tick in range(warmup + ticks):
+        level.player.health = 3
+        top_up(level, scenario, rng)
+
+        start = time.perf_counter()
+        manager.update()
+        clock.step()
+        update_elapsed = (time.perf_counter() - start) * 1000.0
+
+        draw_elapsed = 0.0
+        if draw:
+            start = time.perf_counter()
+            screen.fill(BLACK)
+            manager.draw(screen)
+            draw_elapsed = (time.perf_counter() - start) * 1000.0
+
+        if tick < warmup:
+            continue
+        update_ms.append(update_elapsed)
+        if draw:
+            draw_ms.append(draw_elapsed)
+        live["enemies"].append(len(level.enemies))
+        live["projectiles"].append(len(level.projectile_manager))
+        live["particles"].append(particle_system.get_particle_count())
+
+    frame_ms = [u + d for u, d in zip(update_ms, draw_ms)] if draw else update_ms
+    return {
+        "scenario": scenario.to_dict(),
+        "label": scenario.label(),
+        "ticks": ticks,
+        "live": {name: sum(values) / len(values) for name, values in live.items()},
+        "update": summarize_ms(update_ms),
+        "draw": summarize_ms(draw_ms) if draw else None,
+        "frame": summarize_ms(frame_ms),
+        "over_budget": sum(1 for ms in frame_ms if ms > FRAME_BUDGET_MS)
+        / len(frame_ms),
+    }
+
+
+def print_result(result):
+    """輸出單一情境的結果"""
+    live = result["live"]
+    print(
+        f"\n{result['label']}：平均存活 敵人 {live['enemies']:.1f}、"
+        f"投射物 {live['projectiles']:.1f}、粒子 {live['particles']:.0f}"
+    )
+    print("  " + format_summary("update", result["update"]))
+    if result["draw"]:
+        print("  " + format_summary("draw", result["draw"]))
+    print("  " + format_summary("frame", result["frame"]))
+
+
+def display_width(text):
+    """文字在終端機中的顯示寬度（全形字元佔兩格）"""
+    return sum(2 if unicodedata.east_asian_width(c) in "WF" else 1 for c in text)
+
+
+def print_curve(results, key="p95"):
+    """以長條圖輸出每個情境的幀耗時，標出幀預算的位置"""
+    worst = max(max(r["frame"][key] for r in results), FRAME_BUDGET_MS)
+    scale = CURVE_WIDTH / worst
+    budget_column = int(FRAME_BUDGET_MS * scale)
+    label_width = max(display_width(r["label"]) for r in results)
+
+    print(f"\n幀耗時 {key}（| 為 {FRAME_BUDGET_MS:.1f} ms 幀預算，! 表示超過）：")
+    for result in results:
+        ms = result["frame"][key]
+        filled = int(ms * scale)
+        bar = list("#" * filled + " " * (CURVE_WIDTH + 1 - filled))
+        bar[budget_column] = "|" if bar[budget_column] == " " else "!"
+        padding = " " * (label_width - display_width(result["label"]))
+        print(f"  {result['label']}{padding}  {''.join(bar)} {ms:7.2f} ms")
+
+    broken = [r for r in results if r["frame"][key] > FRAME_BUDGET_MS]
+    if broken:
+        print(f"第一個超過幀預算的情境：{broken[0]['label']}")
+    else:
+        print("所有情境都在幀預算內")
+
+
+def write_csv(path, results):
+    """每個情境寫成一列（方便以試算表或繪圖工具畫出曲線）"""
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = None
+        for result in results:
+            row = {
+                "label": result["label"],
+                "enemies": sum(result["scenario"]["enemies"].values()),
+                "projectiles": sum(result["scenario"]["projectiles"].values()),
+                "particles": result["scenario"]["particles"],
+                "live_enemies": round(result["live"]["enemies"], 1),
+                "live_projectiles": round(result["live"]["projectiles"], 1),
+                "live_particles": round(result["live"]["particles"], 1),
+                "over_budget": round(result["over_budget"], 4),
+            }
+            for stage in ("update", "draw", "frame"):
+                if result[stage]:
+                    for key in ("mean", "p95", "max"):
+                        row[f"{stage}_{key}"] = round(result[stage][key], 3)
+            if writer is None:
+                writer = csv.DictWriter(f, fieldnames=list(row))
+                writer.writeheader()
+            writer.writerow(row)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="壓力情境效能測試")
+    parser.add_argument(
+        "--level",
+        type=float,
+        choices=BENCHMARK_LEVELS,
+        default=LEVEL_3,
+        help="使用哪一關的平台與場地（敵人會被換掉）",
+    )
+    parser.add_argument(
+        "--enemy-types",
+        nargs="+",
+        choices=sorted(ENEMY_TYPES),
+        default=["MageRobot"],
+        help="放入的敵人類型（每種放入相同數量）",
+    )
+    parser.add_argument(
+        "--enemies",
+        nargs="+",
+        type=int,
+        default=[1, 2, 4, 8, 16, 32],
+        help="每種敵人的數量（可列出多個值進行掃描）",
+    )
+    parser.add_argument(
+        "--projectile-types",
+        nargs="+",
+        choices=sorted(PROJECTILE_TYPES),
+        default=["TrackingBullet"],
+        help="額外維持的投射物類型（總數平均分配）",
+    )
+    parser.add_argument(
+        "--projectiles",
+        nargs="+",
+        type=int,
+        default=[0],
+        help="額外維持存活的投射物總數（可列出多個值進行掃描）",
+    )
+    parser.add_argument(
+        "--particles",
+        nargs="+",
+        type=int,
+        default=[0],
+        help="維持存活的粒子數量（可列出多個值進行掃描）",
+    )
+    parser.add_argument(
+        "--ticks", type=int, default=FPS * 10, help="每組情境量測的步數"
+    )
+    parser.add_argument(
+        "--warmup", type=int, default=FPS, help="開始量測前先執行的步數"
+    )
+    parser.add_argument("--seed", type=int, default=1234, help="亂數種子")
+    parser.add_argument("--no-draw", action="store_true", help="只量測更新")
+    parser.add_argument("--json", help="將結果寫入 JSON 檔")
+    parser.add_argument("--csv", help="將每組情境的摘要寫入 CSV 檔")
+    args = parser.parse_args()
+
+    if min(args.enemies) < 1:
+        parser.error("每種敵人至少要有 1 個，否則關卡會立即完成")
+    level_number = BENCHMARK_LEVELS[BENCHMARK_LEVELS.index(args.level)]
+
+    screen = init_headless()
+    scenarios = build_sweep(
+        args.enemy_types,
+        args.enemies,
+        args.projectile_types,
+        args.projectiles,
+        args.particles,
+    )
+
+    results = {
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "seed": args.seed,
+        "level": level_number,
+        "ticks": args.ticks,
+        "frame_budget_ms": FRAME_BUDGET_MS,
+        "scenarios": [],
+    }
+    for scenario in scenarios:
+        result = run_scenario(
+            screen,
+            level_number,
+            scenario,
+            args.ticks,
+            args.warmup,
+            args.seed,
+            draw=not args.no_draw,
+        )
+        results["scenarios"].append(result)
+        print_result(result)
+
+    print_curve(results["scenarios"], "mean")
+    print_curve(results["scenarios"], "p95")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\n結果已寫入 {args.json}")
+    if args.csv:
+        write_csv(args.csv, results["scenarios"])
+        print(f"曲線資料已寫入 {args.csv}")
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
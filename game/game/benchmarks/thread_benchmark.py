@@ -0,0 +1,164 @@
+"""
+模擬/繪製執行緒分離效能測試 - 比較單執行緒與模擬執行緒兩種方式的吞吐量
+
+單執行緒：每個步長更新後繪製一次（與無視窗模式相同）
+模擬執行緒：背景執行緒不限速地更新並發布繪製幀，主執行緒不斷繪製最新的幀
+
+用法：
+    python benchmarks/thread_benchmark.py --ticks 3600
+    python benchmarks/thread_benchmark.py --levels 3 --json thread.json
+"""
+
+import argparse
+import json
+import time
+
+from common import init_headless
+from level_benchmark import BENCHMARK_LEVELS, BENCHMARK_SCRIPT
+
+import pygame
+
+from constants import *
+from states.game_states import GameStateManager
+from systems.input_source import ScriptedInput
+from systems.particle_system import particle_system
+from systems.sim_clock import SimulationClock
+from systems.sim_thread import SimulationThread
+
+
+def final_state(manager):
+    """關卡最後的狀態摘要（確認兩種方式的模擬結果一致）"""
+    level = manager.current_level
+    return (
+        round(level.player.x, 3),
+        round(level.player.y, 3),
+        level.player.health,
+        tuple((round(e.x, 3), round(e.y, 3), e.health) for e in level.enemies),
+        len(level.projectile_manager),
+    )
+
+
+def new_session(level_number, seed):
+    """建立固定腳本輸入的關卡"""
+    particle_system.clear_all()
+    clock = SimulationClock()
+    script = ScriptedInput(BENCHMARK_SCRIPT)
+    manager = GameStateManager(clock, input_source=script, seed=seed)
+    manager.start_level(level_number)
+    return clock, script, manager
+
+
+def run_serial(screen, level_number, ticks, seed):
+    """單執行緒：每個步長更新並繪製一次"""
+    clock, script, manager = new_session(level_number, seed)
+
+    start = time.perf_counter()
+    for _ in range(ticks):
+        for event in script.get_events():
+            manager.handle_event(event)
+        manager.update()
+        clock.step()
+        screen.fill(BLACK)
+        manager.draw(screen)
+    wall = time.perf_counter() - start
+
+    return {
+        "wall_seconds": wall,
+        "ticks_per_second": ticks / wall,
+        "frames": ticks,
+        "frames_per_second": ticks / wall,
+        "state": final_state(manager),
+    }
+
+
+def run_threaded(screen, level_number, ticks, seed):
+    """模擬執行緒：背景更新並發布繪製幀，主執行緒繪製最新的幀"""
+    clock, script, manager = new_session(level_number, seed)
+    sim_thread = SimulationThread(manager, clock, realtime=False, max_ticks=ticks)
+    sim_thread.event_source = script
+
+    frames = 0
+    last_tick = None
+    start = time.perf_counter()
+    sim_thread.start()
+    while sim_thread.is_alive():
+        frame = sim_thread.latest_frame()
+        if frame is None or frame.tick == last_tick:
+            time.sleep(0)  # 沒有新的幀時讓出 GIL
+            continue
+        last_tick = frame.tick
+        screen.fill(BLACK)
+        frame.draw(screen)
+        frames += 1
+    sim_thread.join()
+    wall = time.perf_counter() - start
+
+    if sim_thread.error is not None:
+        raise sim_thread.error
+
+    return {
+        "wall_seconds": wall,
+        "ticks_per_second": ticks / wall,
+        "frames": frames,
+        "frames_per_second": frames / wall,
+        "publish_ms_per_frame": sim_thread.publish_ms / sim_thread.frames_published,
+        "state": final_state(manager),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="模擬/繪製執行緒分離效能測試")
+    parser.add_argument("--ticks", type=int, default=FPS * 60, help="每關模擬步數")
+    parser.add_argument("--seed", type=int, default=1234, help="亂數種子")
+    parser.add_argument(
+        "--levels", type=float, nargs="+", help="只測試指定關卡（預設為全部）"
+    )
+    parser.add_argument("--json", help="將結果寫入 JSON 檔")
+    args = parser.parse_args()
+
+    screen = init_headless()
+    levels = BENCHMARK_LEVELS
+    if args.levels:
+        levels = [int(v) if float(v).is_integer() else v for v in args.levels]
+
+    results = {"seed": args.seed, "ticks": args.ticks, "levels": []}
+    for level_number in levels:
+        serial = run_serial(screen, level_number, args.ticks, args.seed)
+        threaded = run_threaded(screen, level_number, args.ticks, args.seed)
+        matches = serial.pop("state") == threaded.pop("state")
+        results["levels"].append(
+            {
+                "level": level_number,
+                "results_match": matches,
+                "serial": serial,
+                "threaded": threaded,
+            }
+        )
+
+        status = "一致" if matches else "不一致！"
+        print(f"\n關卡 {level_number}：{args.ticks} 步，模擬結果{status}")
+        print(
+            f"  單執行緒  {serial['wall_seconds']:6.2f} 秒  "
+            f"{serial['ticks_per_second']:7.0f} ticks/s  "
+            f"{serial['frames_per_second']:7.0f} frames/s"
+        )
+        print(
+            f"  模擬執行緒 {threaded['wall_seconds']:6.2f} 秒  "
+            f"{threaded['ticks_per_second']:7.0f} ticks/s  "
+            f"{threaded['frames_per_second']:7.0f} frames/s  "
+            f"（建立繪製幀 {threaded['publish_ms_per_frame']:.3f} ms/幀）"
+        )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\n結果已寫入 {args.json}")
+
+    pygame.quit()
+
+    if not all(r["results_match"] for r in results["levels"]):
+        raise SystemExit("模擬執行緒的結果與單執行緒不一致")
+
+
+if __name__ == "__main__":
+    main()
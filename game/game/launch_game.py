@@ -9,8 +9,14 @@ import os
 src_path = os.path.join(os.path.dirname(__file__), "src")
 sys.path.insert(0, src_path)
 
+# 啟動分析需要在匯入遊戲模組之前開始，才能記錄匯入耗時
+from startup_profiler import startup_profiler, requested
+
+if requested():
+    startup_profiler.start()
+
 # 導入並啟動遊戲
-from main import Game
+from main import main
 
 if __name__ == "__main__":
     print("正在啟動老鼠格鬥遊戲...")
@@ -25,9 +31,8 @@ if __name__ == "__main__":
     print()
 
     try:
-        # 啟動遊戲（pygame 會在 Game 類中初始化）
-        game = Game()
-        game.run()
+        # 啟動遊戲（pygame 會在 Game 類中初始化，--headless 等參數由 main 解析）
+        main()
     except KeyboardInterrupt:
         print("遊戲已結束")
     except Exception as e:
@@ -2,11 +2,118 @@
 遊戲常數定義
 """
 
+GAME_VERSION = "1.0.0"  # 遊戲版本（幀時間報告以此區分不同版本）
+
 # 視窗設定
 WINDOW_WIDTH = 1024
 WINDOW_HEIGHT = 768
 FPS = 60
 
+# 模擬時鐘設定
+SIM_TICK_RATE = FPS  # 模擬固定步長頻率（每秒步數）
+SIM_MAX_CATCH_UP_STEPS = 5  # 單幀最多補跑的模擬步數，避免畫面卡頓後追趕不完
+
+# 繪製設定
+RENDER_MAX_FPS = 240  # 畫面更新率上限（與模擬頻率無關，0 表示不限制）
+RENDER_INTERPOLATION = True  # 是否以前後兩個模擬步長的位置插值繪製
+RENDER_INTERPOLATION_MAX_JUMP = 64  # 單步位移超過此距離（像素）視為瞬移，直接繪製新位置
+
+# 畫質調節設定（依實際幀耗時自動降低或恢復特效品質）
+QUALITY_LOW = 0
+QUALITY_MEDIUM = 1
+QUALITY_HIGH = 2
+QUALITY_NAMES = {QUALITY_LOW: "低", QUALITY_MEDIUM: "中", QUALITY_HIGH: "高"}
+QUALITY_SETTINGS = {
+    # particle_scale：爆炸與清屏等特效的粒子數量比例
+    # ring_scale：清屏特效的光環數量比例
+    # glow_layers：血量道具的發光層數
+    # shockwave_cracks：BOSS 衝擊波的地面裂痕數量
+    # shockwave_alpha：BOSS 衝擊波環是否以半透明表面繪製
+    QUALITY_HIGH: {
+        "particle_scale": 1.0,
+        "ring_scale": 1.0,
+        "glow_layers": 3,
+        "shockwave_cracks": 8,
+        "shockwave_alpha": True,
+    },
+    QUALITY_MEDIUM: {
+        "particle_scale": 0.6,
+        "ring_scale": 0.6,
+        "glow_layers": 2,
+        "shockwave_cracks": 4,
+        "shockwave_alpha": True,
+    },
+    QUALITY_LOW: {
+        "particle_scale": 0.3,
+        "ring_scale": 0.35,
+        "glow_layers": 1,
+        "shockwave_cracks": 0,
+        "shockwave_alpha": False,
+    },
+}
+QUALITY_GOVERNOR_ENABLED = True  # 是否依幀耗時自動調整畫質
+QUALITY_FRAME_BUDGET_MS = 1000 / FPS  # 每幀的耗時預算（不含等待下一幀的時間）
+QUALITY_WINDOW_FRAMES = 30  # 計算平均幀耗時的幀數（調整後需重新累積才會再次調整）
+QUALITY_DOWNGRADE_RATIO = 1.0  # 平均耗時超過預算的此比例時降低畫質
+QUALITY_UPGRADE_RATIO = 0.6  # 平均耗時低於預算的此比例時才考慮恢復畫質
+QUALITY_UPGRADE_FRAMES = 180  # 需連續保持餘裕的幀數才恢復一級（約 3 秒，避免來回切換）
+QUALITY_HISTORY_SIZE = 32  # 保留最近幾次畫質調整的記錄
+
+# 效能分析浮層設定（F3 顯示浮層，F4 輸出分析資料）
+PROFILER_WINDOW_FRAMES = 120  # 計算各階段平均耗時的幀數
+PROFILER_OVERLAY_REFRESH_FRAMES = 15  # 浮層文字每隔多少幀重新繪製一次
+PROFILER_OVERLAY_ALPHA = 190  # 浮層背景透明度
+PROFILER_DUMP_PATH = "frame_profile.json"  # F4 輸出的分析資料檔
+
+# 幀時間報告設定（以 --frame-stats 啟用）
+FRAME_STATS_DIR = "frame_stats"  # 報告輸出目錄
+FRAME_STATS_PERCENTILES = (50, 90, 99)  # 摘要的百分位
+FRAME_STATS_HISTOGRAM_EDGES_MS = (4, 8, 12, 16.7, 20, 25, 33.3, 50, 100)  # 分布區間上限
+
+# 取樣分析設定（以 --sample-profile 或 F5 啟用）
+SAMPLING_INTERVAL_MS = 2  # 取樣間隔（毫秒）
+SAMPLING_MAX_DEPTH = 64  # 每次取樣記錄的最大堆疊深度
+SAMPLING_OUTPUT_DIR = "profiles"  # F5 停止取樣時輸出 folded stack 檔的目錄
+
+# 啟動分析設定（以 --startup-profile 啟用）
+STARTUP_PROFILE_PATH = "startup_profile.json"  # 啟動分析報告
+STARTUP_REPORT_TOP = 15  # 列出自身耗時最多的模組數量
+
+# 配置追蹤設定（以 --alloc-track 啟用）
+ALLOC_REPORT_TOP = 15  # 結束時列出的呼叫位置數量
+
+# 記憶體報告設定（以 --memory-report 啟用）
+# tracemalloc 為每個配置記錄的堆疊深度（加深可看到完整呼叫鏈，但遊戲會慢很多）
+MEMORY_TRACE_FRAMES = 1
+MEMORY_GROWTH_THRESHOLD_KB = 256  # 與同類檢查點的基準相比累積增加超過此值時標記為可疑
+MEMORY_REPORT_TOP = 10  # 標記時列出增加最多的配置位置數量
+MEMORY_LOG_PATH = "memory.log"  # 記憶體報告記錄檔
+MEMORY_LOG_MAX_BYTES = 1024 * 1024  # 記錄檔超過此大小時輪替
+MEMORY_LOG_BACKUP_COUNT = 3  # 保留的舊記錄檔數量
+
+# 卡頓偵測設定（以 --hitch-log 啟用）
+HITCH_THRESHOLD_MS = 25  # 單幀耗時超過此值（毫秒）視為卡頓
+HITCH_SAMPLE_INTERVAL_MS = 5  # 監視執行緒檢查目前幀耗時的間隔（毫秒）
+HITCH_STACK_DEPTH = 24  # 記錄的堆疊深度（由最內層算起）
+HITCH_LOG_PATH = "hitches.log"  # 卡頓記錄檔
+HITCH_LOG_MAX_BYTES = 1024 * 1024  # 記錄檔超過此大小時輪替
+HITCH_LOG_BACKUP_COUNT = 3  # 保留的舊記錄檔數量
+
+# 垃圾回收策略設定
+GC_POLICY_ENABLED = True  # 是否在關卡載入、遊玩與暫停時切換垃圾回收策略
+GC_PLAY_MODE = "thresholds"  # 遊玩中的策略："thresholds" 提高門檻，"defer" 停用自動回收
+GC_PLAY_THRESHOLDS = (2000, 50, 1000)  # 遊玩中的分代門檻（Python 預設為 700, 10, 10）
+GC_DEFER_COLLECT_INTERVAL = FPS * 2  # "defer" 模式下回收最年輕一代的間隔（步數）
+
+# 時光倒流設定
+REWIND_ENABLED = True  # 是否記錄時光倒流快照
+REWIND_SNAPSHOT_INTERVAL = 6  # 每隔多少模擬步數記錄一次快照
+REWIND_KEYFRAME_INTERVAL = 10  # 每隔多少個快照存一次完整快照（其餘只存差異）
+REWIND_USE_DELTA = True  # 是否以差異編碼儲存快照
+REWIND_MAX_SNAPSHOTS = 600  # 緩衝區最多保留的快照數量（6 步一次約為 60 秒）
+REWIND_MAX_BYTES = 2 * 1024 * 1024  # 緩衝區的記憶體上限（位元組，低記憶體機台可調低）
+REWIND_STEP_SNAPSHOTS = 10  # 每按一次倒流鍵退回的快照數量（約 1 秒）
+
 # 顏色定義 (RGB)
 BLACK = (0, 0, 0)
 WHITE = (255, 255, 255)
@@ -124,6 +231,11 @@ CRITICAL_HIT_CHANCE = 0.1  # 暴擊機率
 PARTICLE_GRAVITY = 0.1  # 粒子重力
 HEALING_PARTICLE_COUNT = 8  # 治療粒子數量
 
+# 特效圖像快取設定
+SPRITE_CACHE_MAX_ENTRIES = 1024  # 快取的預繪圖像數量上限
+SPRITE_CACHE_MAX_PIXELS = 4 * 1024 * 1024  # 快取圖像的總像素上限（限制記憶體用量）
+SPRITE_CACHE_ALPHA_STEP = 16  # 透明度分級的間隔
+
 # 特效顏色設定
 EFFECT_COLOR_NORMAL = YELLOW  # 普通特效顏色
 EFFECT_COLOR_CRITICAL = RED  # 暴擊特效顏色
@@ -160,9 +272,14 @@ TRACKING_BULLET_SIZE = 12
 TRACKING_BULLET_TRACKING_STRENGTH = 0.07  # 追蹤強度
 TRACKING_BULLET_LIFETIME = 3000  # 子彈存在時間（3秒）
 
+# 投射物管理設定
+PROJECTILE_MAX_COUNT = 256  # 關卡內同時存在的投射物上限（超過時不再生成）
+
 # 平台設定
 PLATFORM_COLOR = (100, 100, 100)  # 平台顏色（灰色）
 PLATFORM_BORDER_COLOR = (200, 200, 200)  # 平台邊框顏色
+PLATFORM_GRID_CELL_SIZE = 128  # 平台空間索引的格子大小（像素）
+PLATFORM_INDEX_MIN_COUNT = 32  # 平台數量少於此值時直接線性掃描（較快）
 
 # 擊退設定
 KNOCKBACK_FORCE = 50  # 擊退力度
@@ -5,12 +5,23 @@
 import pygame
 import math
 from constants import *
+from systems.sim_clock import default_clock
+from systems.rng import default_rng
+from systems.quality_governor import quality_governor
 
 
 class Bullet:
     """BOSS 發射的子彈"""
 
+    destructible = False  # 是否能被拳頭打掉
+    persistent = False  # 持續性攻擊：擊中玩家後不消失，只造成一次傷害
+    tracking = False  # 是否需要由關卡傳入玩家進行追蹤
+
     def __init__(self, x, y, target_x, target_y):
+        self.reset(x, y, target_x, target_y)
+
+    def reset(self, x, y, target_x, target_y):
+        """重設子彈狀態（供投射物物件池重複使用）"""
         self.x = x
         self.y = y
         self.size = BOSS_BULLET_SIZE
@@ -52,8 +63,9 @@ class Bullet:
 class MissileBullet(Bullet):
     """導彈子彈 - 具有追蹤能力"""
 
-    def __init__(self, x, y, target_x, target_y):
-        super().__init__(x, y, target_x, target_y)
+    def reset(self, x, y, target_x, target_y):
+        """重設導彈狀態"""
+        super().reset(x, y, target_x, target_y)
         self.size = 12  # 比普通子彈大
         self.speed = 6  # 比普通子彈慢但有追蹤
         self.tracking = True
@@ -100,13 +112,21 @@ class MissileBullet(Bullet):
 class LaserBeam(Bullet):
     """雷射光束 - 寬範圍直線攻擊"""
 
-    def __init__(self, x, y, target_x, target_y):
-        super().__init__(x, y, target_x, target_y)
+    persistent = True
+
+    def __init__(self, x, y, target_x, target_y, clock=None):
+        self.reset(x, y, target_x, target_y, clock)
+
+    def reset(self, x, y, target_x, target_y, clock=None):
+        """重設雷射光束狀態"""
+        super().reset(x, y, target_x, target_y)
+        self.clock = clock if clock is not None else default_clock
         self.width = 15  # 雷射寬度
         self.length = 0  # 雷射長度，逐漸增長
         self.max_length = 400
         self.grow_speed = 20
         self.damage_dealt = False
+        self.start_time = None  # 達到最大長度的時間
 
         # 計算雷射方向
         dx = target_x - x
@@ -127,11 +147,9 @@ class LaserBeam(Bullet):
         # 雷射存在時間限制
         if self.length >= self.max_length:
             # 保持一段時間後消失
-            import pygame
-
-            if not hasattr(self, "start_time"):
-                self.start_time = pygame.time.get_ticks()
-            elif pygame.time.get_ticks() - self.start_time > 500:
+            if self.start_time is None:
+                self.start_time = self.clock.get_ticks()
+            elif self.clock.get_ticks() - self.start_time > 500:
                 self.alive = False
 
     def get_rect(self):
@@ -166,14 +184,23 @@ class LaserBeam(Bullet):
 class TrackingBullet:
     """法師機器人發射的追蹤子彈"""
 
-    def __init__(self, x, y, target_player):
+    destructible = True  # 可以被拳頭打掉
+    persistent = False
+    tracking = False  # 追蹤目標在建立時指定，不需由關卡傳入
+
+    def __init__(self, x, y, target_player, clock=None):
+        self.reset(x, y, target_player, clock)
+
+    def reset(self, x, y, target_player, clock=None):
+        """重設追蹤子彈狀態（供投射物物件池重複使用）"""
         self.x = x
         self.y = y
         self.target_player = target_player
+        self.clock = clock if clock is not None else default_clock
         self.size = TRACKING_BULLET_SIZE
         self.speed = TRACKING_BULLET_SPEED
         self.alive = True
-        self.spawn_time = pygame.time.get_ticks()
+        self.spawn_time = self.clock.get_ticks()
         self.lifetime = TRACKING_BULLET_LIFETIME
 
         # 初始速度方向（朝向玩家）
@@ -190,7 +217,7 @@ class TrackingBullet:
 
     def update(self):
         """更新追蹤子彈"""
-        current_time = pygame.time.get_ticks()
+        current_time = self.clock.get_ticks()
 
         # 檢查存在時間
         if current_time - self.spawn_time > self.lifetime:
@@ -260,7 +287,7 @@ class TrackingBullet:
 class Enemy:
     """敵人基類"""
 
-    def __init__(self, x, y, width, height, health=1):
+    def __init__(self, x, y, width, height, health=1, clock=None):
         self.x = x
         self.y = y
         self.width = width
@@ -270,6 +297,9 @@ class Enemy:
         self.alive = True
         self.death_sound_played = False  # 防止死亡音效重複播放
         self.platform_system = None  # 將由GameLevel設定
+        self.projectile_manager = None  # 將由GameLevel設定
+        self.rng = default_rng  # 亂數串流（敵人只在繪製抖動時使用 render 串流）
+        self.clock = clock if clock is not None else default_clock  # 模擬時鐘
 
         # 物理狀態
         self.vel_x = 0
@@ -293,13 +323,13 @@ class Enemy:
         if not self.invincible and self.alive:
             self.health -= damage
             self.invincible = True
-            self.invincible_start_time = pygame.time.get_ticks()
+            self.invincible_start_time = self.clock.get_ticks()
 
             if knockback:
                 self.apply_knockback(source_x)
             if stun:
                 self.stunned = True
-                self.stun_start_time = pygame.time.get_ticks()
+                self.stun_start_time = self.clock.get_ticks()
 
             if self.health <= 0:
                 self.alive = False
@@ -324,7 +354,7 @@ class Enemy:
     def apply_knockback(self, source_x=None):
         """應用擊退效果"""
         self.knockback = True
-        self.knockback_start_time = pygame.time.get_ticks()
+        self.knockback_start_time = self.clock.get_ticks()
 
         if source_x is not None:
             # 根據攻擊源位置決定擊退方向
@@ -344,7 +374,7 @@ class Enemy:
 
     def update(self, player):
         """更新敵人狀態（子類重寫）"""
-        current_time = pygame.time.get_ticks()
+        current_time = self.clock.get_ticks()
 
         # 更新無敵時間
         if self.invincible:
@@ -458,6 +488,17 @@ class Enemy:
         """獲取碰撞矩形"""
         return pygame.Rect(self.x, self.y, self.width, self.height)
 
+    def _fire(self, projectile_type, *args, **kwargs):
+        """
+        透過關卡的投射物管理器發射投射物
+
+        Returns:
+            投射物物件，沒有管理器或達到數量上限時返回 None
+        """
+        if self.projectile_manager is None:
+            return None
+        return self.projectile_manager.spawn(projectile_type, self, *args, **kwargs)
+
     def draw(self, screen):
         """繪製敵人（子類重寫）"""
         pass
@@ -466,8 +507,10 @@ class Enemy:
 class TrainingDummy(Enemy):
     """訓練用人偶 - 第一關敵人"""
 
-    def __init__(self, x, y):
-        super().__init__(x, y, DUMMY_WIDTH, DUMMY_HEIGHT, health=DUMMY_HEALTH)
+    def __init__(self, x, y, clock=None):
+        super().__init__(
+            x, y, DUMMY_WIDTH, DUMMY_HEIGHT, health=DUMMY_HEALTH, clock=clock
+        )
         self.color = GRAY
 
     def update(self, player):
@@ -479,7 +522,7 @@ class TrainingDummy(Enemy):
     def apply_knockback(self, source_x=None):
         """應用擊退效果 - 訓練人偶專用版本"""
         self.knockback = True
-        self.knockback_start_time = pygame.time.get_ticks()
+        self.knockback_start_time = self.clock.get_ticks()
 
         if source_x is not None:
             # 根據攻擊源位置決定擊退方向
@@ -500,7 +543,7 @@ class TrainingDummy(Enemy):
     def draw(self, screen):
         """繪製訓練人偶"""
         # 無敵時閃爍效果
-        if self.invincible and (pygame.time.get_ticks() // 100) % 2:
+        if self.invincible and (self.clock.get_ticks() // 100) % 2:
             color = WHITE
         else:
             color = self.color
@@ -531,9 +574,14 @@ class TrainingDummy(Enemy):
 class SmallRobot(Enemy):
     """小型老鼠機器人 - 第二關敵人"""
 
-    def __init__(self, x, y):
+    def __init__(self, x, y, clock=None):
         super().__init__(
-            x, y, SMALL_ROBOT_WIDTH, SMALL_ROBOT_HEIGHT, health=SMALL_ROBOT_HEALTH
+            x,
+            y,
+            SMALL_ROBOT_WIDTH,
+            SMALL_ROBOT_HEIGHT,
+            health=SMALL_ROBOT_HEALTH,
+            clock=clock,
         )
         self.color = (100, 100, 150)  # 藍灰色
         self.speed = SMALL_ROBOT_SPEED
@@ -547,7 +595,7 @@ class SmallRobot(Enemy):
 
     def update(self, player):
         """更新小型機器人"""
-        current_time = pygame.time.get_ticks()
+        current_time = self.clock.get_ticks()
 
         # 在更新物理狀態之前先處理AI行為
         if not self.stunned and not self.knockback:
@@ -636,14 +684,14 @@ class SmallRobot(Enemy):
     def apply_knockback(self, source_x=None):
         """應用擊退效果"""
         self.charging = False  # 停止衝撞
-        self.charge_cooldown = pygame.time.get_ticks() + 1500
+        self.charge_cooldown = self.clock.get_ticks() + 1500
         # 調用父類的擊退方法
         super().apply_knockback(source_x)
 
     def draw(self, screen):
         """繪製小型機器人"""
         # 無敵時閃爍效果
-        if self.invincible and (pygame.time.get_ticks() // 100) % 2:
+        if self.invincible and (self.clock.get_ticks() // 100) % 2:
             color = WHITE
         elif self.stunned:
             color = YELLOW  # 眩暈時變黃
@@ -664,9 +712,14 @@ class SmallRobot(Enemy):
 class EliteMech(Enemy):
     """精英機甲兵 - 新的中級敵人"""
 
-    def __init__(self, x, y):
+    def __init__(self, x, y, clock=None):
         super().__init__(
-            x, y, ELITE_MECH_WIDTH, ELITE_MECH_HEIGHT, health=ELITE_MECH_HEALTH
+            x,
+            y,
+            ELITE_MECH_WIDTH,
+            ELITE_MECH_HEIGHT,
+            health=ELITE_MECH_HEALTH,
+            clock=clock,
         )
         self.color = (100, 150, 200)  # 藍色
         self.speed = ELITE_MECH_SPEED
@@ -681,7 +734,7 @@ class EliteMech(Enemy):
 
     def update(self, player):
         """更新精英機甲兵"""
-        current_time = pygame.time.get_ticks()
+        current_time = self.clock.get_ticks()
         super().update(player)
 
         if not self.stunned and not self.knockback:
@@ -723,7 +776,7 @@ class EliteMech(Enemy):
     def draw(self, screen):
         """繪製精英機甲兵"""
         # 基本身體顏色
-        if self.invincible and (pygame.time.get_ticks() // 100) % 2:
+        if self.invincible and (self.clock.get_ticks() // 100) % 2:
             color = WHITE
         elif self.stunned:
             color = YELLOW
@@ -752,15 +805,19 @@ class EliteMech(Enemy):
 class MageRobot(Enemy):
     """法師機器人 - 2.5關敵人"""
 
-    def __init__(self, x, y):
+    def __init__(self, x, y, clock=None):
         super().__init__(
-            x, y, MAGE_ROBOT_WIDTH, MAGE_ROBOT_HEIGHT, health=MAGE_ROBOT_HEALTH
+            x,
+            y,
+            MAGE_ROBOT_WIDTH,
+            MAGE_ROBOT_HEIGHT,
+            health=MAGE_ROBOT_HEALTH,
+            clock=clock,
         )
         self.color = (120, 50, 150)  # 紫色
         self.speed = MAGE_ROBOT_SPEED
         self.direction = 1
         self.attack_cooldown = 0
-        self.bullets = []  # 追蹤子彈列表
         self.retreat_distance = 150  # 保持與玩家的距離
         self.attack_range = MAGE_ROBOT_ATTACK_RANGE
 
@@ -778,7 +835,7 @@ class MageRobot(Enemy):
 
     def update(self, player):
         """更新法師機器人"""
-        current_time = pygame.time.get_ticks()
+        current_time = self.clock.get_ticks()
         super().update(player)
 
         if not self.stunned and not self.knockback:
@@ -837,12 +894,6 @@ class MageRobot(Enemy):
                     self.x -= self.speed * 0.5
                     self.direction = -1
 
-        # 更新子彈
-        for bullet in self.bullets[:]:
-            bullet.update()
-            if not bullet.alive:
-                self.bullets.remove(bullet)
-
     def _try_jump_to_player(self, player):
         """嘗試跳躍到玩家位置"""
         if not self.on_ground or self.stunned or self.knockback:
@@ -889,7 +940,13 @@ class MageRobot(Enemy):
         best_platform = None
         max_distance = 0
 
-        for platform in self.platform_system.platforms:
+        # 只查詢瞬移範圍內的平台
+        self_center_x = self.x + self.width // 2
+        candidates = self.platform_system.query_x_range(
+            self_center_x - MAGE_ROBOT_TELEPORT_RANGE - 1,
+            self_center_x + MAGE_ROBOT_TELEPORT_RANGE + 1,
+        )
+        for platform in candidates:
             platform_center_x = platform.x + platform.width // 2
             platform_center_y = platform.y
 
@@ -898,7 +955,7 @@ class MageRobot(Enemy):
             distance_to_player = abs(platform_center_x - player_center_x)
 
             # 選擇距離玩家最遠但在瞬移範圍內的平台
-            distance_to_self = abs(platform_center_x - (self.x + self.width // 2))
+            distance_to_self = abs(platform_center_x - self_center_x)
             if (
                 distance_to_player > max_distance
                 and distance_to_self <= MAGE_ROBOT_TELEPORT_RANGE
@@ -928,7 +985,7 @@ class MageRobot(Enemy):
                 pass  # 如果粒子系統不可用就跳過特效
 
             self.teleporting = True
-            self.teleport_charge_time = pygame.time.get_ticks()
+            self.teleport_charge_time = self.clock.get_ticks()
 
             return True
 
@@ -940,18 +997,19 @@ class MageRobot(Enemy):
         mage_center_x = self.x + self.width // 2
         mage_center_y = self.y + self.height // 2
 
-        tracking_bullet = TrackingBullet(mage_center_x, mage_center_y, player)
-        self.bullets.append(tracking_bullet)
+        self._fire(
+            TrackingBullet, mage_center_x, mage_center_y, player, clock=self.clock
+        )
 
     def draw(self, screen):
         """繪製法師機器人"""
         # 瞬移特效
         if (
             self.teleporting
-            and pygame.time.get_ticks() - self.teleport_charge_time < 300
+            and self.clock.get_ticks() - self.teleport_charge_time < 300
         ):
             # 閃爍效果表示剛瞬移
-            if (pygame.time.get_ticks() // 50) % 2:
+            if (self.clock.get_ticks() // 50) % 2:
                 alpha_surface = pygame.Surface((self.width, self.height))
                 alpha_surface.set_alpha(128)
                 alpha_surface.fill((255, 255, 255))
@@ -960,7 +1018,7 @@ class MageRobot(Enemy):
             self.teleporting = False
 
         # 根據狀態決定顏色
-        if self.invincible and (pygame.time.get_ticks() // 100) % 2:
+        if self.invincible and (self.clock.get_ticks() // 100) % 2:
             color = WHITE
         elif self.stunned:
             color = YELLOW
@@ -994,7 +1052,7 @@ class MageRobot(Enemy):
         pygame.draw.circle(screen, (255, 215, 0), (staff_x, staff_y), 5)
 
         # 繪製瞬移充能效果
-        current_time = pygame.time.get_ticks()
+        current_time = self.clock.get_ticks()
         if current_time < self.teleport_cooldown:
             cooldown_remaining = (
                 self.teleport_cooldown - current_time
@@ -1009,16 +1067,12 @@ class MageRobot(Enemy):
                     2,
                 )
 
-        # 繪製子彈
-        for bullet in self.bullets:
-            bullet.draw(screen)
-
 
 class GiantRobot(Enemy):
     """巨型老鼠機器人 - 第三關BOSS"""
 
-    def __init__(self, x, y):
-        super().__init__(x, y, BOSS_WIDTH, BOSS_HEIGHT, health=BOSS_HEALTH)
+    def __init__(self, x, y, clock=None):
+        super().__init__(x, y, BOSS_WIDTH, BOSS_HEIGHT, health=BOSS_HEALTH, clock=clock)
         self.color = (150, 50, 50)  # 深紅色
         self.speed = BOSS_SPEED
         self.direction = 1
@@ -1028,7 +1082,6 @@ class GiantRobot(Enemy):
         self.jump_speed = BOSS_JUMP_SPEED
         self.double_jump_speed = BOSS_DOUBLE_JUMP_SPEED
         self.jump_cooldown = 0
-        self.bullets = []  # 子彈列表
         self.ranged_attack_cooldown = 0
 
         # 特殊攻擊視覺效果
@@ -1046,7 +1099,7 @@ class GiantRobot(Enemy):
     def update(self, player):
         """更新巨型機器人BOSS"""
         super().update(player)
-        current_time = pygame.time.get_ticks()
+        current_time = self.clock.get_ticks()
 
         # 檢查是否進入狂暴模式
         if self.health / self.max_health <= 0.3 and not self.rage_mode:
@@ -1158,12 +1211,6 @@ class GiantRobot(Enemy):
                 self.x += self.vel_x
                 self.vel_x *= 0.9  # 空中阻力
 
-        # 更新子彈
-        for bullet in self.bullets[:]:  # 使用切片創建副本來安全地修改列表
-            bullet.update()
-            if not bullet.alive:
-                self.bullets.remove(bullet)
-
         # 更新特殊攻擊視覺效果
         if self.special_attack_active:
             if (
@@ -1211,7 +1258,17 @@ class GiantRobot(Enemy):
         best_platform = None
         min_total_distance = float("inf")
 
-        for platform in self.platform_system.platforms:
+        # 只查詢 BOSS 與玩家之間、水平距離 150 內的平台
+        search_top = player_y - 51
+        candidates = self.platform_system.query_rect(
+            pygame.Rect(
+                current_x - 151,
+                search_top,
+                302,
+                max(0, current_y - search_top + 1),
+            )
+        )
+        for platform in candidates:
             platform_center_x = platform.x + platform.width // 2
             platform_center_y = platform.y
 
@@ -1322,8 +1379,9 @@ class GiantRobot(Enemy):
         player_center_x = player.x + player.width // 2
         player_center_y = player.y + player.height // 2
 
-        bullet = Bullet(boss_center_x, boss_center_y, player_center_x, player_center_y)
-        self.bullets.append(bullet)
+        self._fire(
+            Bullet, boss_center_x, boss_center_y, player_center_x, player_center_y
+        )
 
     def _missile_barrage_attack(self, player):
         """新攻擊：子彈齊射"""
@@ -1341,8 +1399,7 @@ class GiantRobot(Enemy):
             target_x = player.x + player.width // 2 + math.sin(angle_rad) * 100
             target_y = player.y + player.height // 2 + math.cos(angle_rad) * 50
 
-            bullet = Bullet(boss_center_x, boss_center_y, target_x, target_y)
-            self.bullets.append(bullet)
+            self._fire(Bullet, boss_center_x, boss_center_y, target_x, target_y)
 
     def _laser_beam_attack(self, player):
         """新攻擊：雷射光束"""
@@ -1351,16 +1408,20 @@ class GiantRobot(Enemy):
         player_center_x = player.x + player.width // 2
         player_center_y = player.y + player.height // 2
 
-        laser = LaserBeam(
-            boss_center_x, boss_center_y, player_center_x, player_center_y
+        self._fire(
+            LaserBeam,
+            boss_center_x,
+            boss_center_y,
+            player_center_x,
+            player_center_y,
+            clock=self.clock,
         )
-        self.bullets.append(laser)
 
     def _special_attack(self, player):
         """特殊攻擊技能 - 範圍攻擊"""
         # 啟動視覺效果
         self.special_attack_active = True
-        self.special_attack_start_time = pygame.time.get_ticks()
+        self.special_attack_start_time = self.clock.get_ticks()
 
         # 創建衝擊波環效果
         boss_center_x = self.x + self.width // 2
@@ -1382,7 +1443,7 @@ class GiantRobot(Enemy):
     def apply_knockback(self, source_x=None):
         """BOSS受到擊退效果較小但仍會有效果"""
         self.knockback = True
-        self.knockback_start_time = pygame.time.get_ticks()
+        self.knockback_start_time = self.clock.get_ticks()
 
         if source_x is not None:
             # 根據攻擊源位置決定擊退方向
@@ -1412,13 +1473,13 @@ class GiantRobot(Enemy):
 
             self.health -= actual_damage
             self.invincible = True
-            self.invincible_start_time = pygame.time.get_ticks()
+            self.invincible_start_time = self.clock.get_ticks()
 
             if knockback:
                 self.apply_knockback(source_x)
             if stun:
                 self.stunned = True
-                self.stun_start_time = pygame.time.get_ticks()
+                self.stun_start_time = self.clock.get_ticks()
 
             if self.health <= 0:
                 self.alive = False
@@ -1446,14 +1507,14 @@ class GiantRobot(Enemy):
         shake_offset_x = 0
         shake_offset_y = 0
         if self.special_attack_active:
-            import random
+            rng = self.rng.render  # 繪製抖動不影響模擬用的亂數串流
 
             shake_intensity = 5
-            shake_offset_x = random.randint(-shake_intensity, shake_intensity)
-            shake_offset_y = random.randint(-shake_intensity, shake_intensity)
+            shake_offset_x = rng.randint(-shake_intensity, shake_intensity)
+            shake_offset_y = rng.randint(-shake_intensity, shake_intensity)
 
         # 根據狀態決定顏色
-        if self.invincible and (pygame.time.get_ticks() // 100) % 2:
+        if self.invincible and (self.clock.get_ticks() // 100) % 2:
             color = WHITE
         elif self.stunned:
             color = YELLOW
@@ -1489,7 +1550,7 @@ class GiantRobot(Enemy):
 
         # 繪製雷射蓄力效果
         if self.laser_charging:
-            charge_progress = (pygame.time.get_ticks() - self.laser_charge_time) / 2000
+            charge_progress = (self.clock.get_ticks() - self.laser_charge_time) / 2000
             charge_size = int(20 * charge_progress)
             pygame.draw.circle(
                 screen,
@@ -1530,15 +1591,24 @@ class GiantRobot(Enemy):
         # 繪製血量條
         self._draw_health_bar(screen)
 
-        # 繪製子彈
-        for bullet in self.bullets:
-            bullet.draw(screen)
-
     def _draw_special_attack_effects(self, screen):
         """繪製特殊攻擊的視覺效果"""
+        quality = quality_governor.settings
+
         # 繪製衝擊波環
         for ring in self.shockwave_rings:
             if ring["alpha"] > 0:
+                if not quality["shockwave_alpha"]:
+                    # 低畫質：直接畫在螢幕上，省下每個環的透明表面
+                    pygame.draw.circle(
+                        screen,
+                        ring["color"],
+                        (int(ring["x"]), int(ring["y"])),
+                        ring["radius"],
+                        3,
+                    )
+                    continue
+
                 # 創建帶透明度的表面
                 ring_surface = pygame.Surface((ring["radius"] * 2, ring["radius"] * 2))
                 ring_surface.set_alpha(ring["alpha"])
@@ -1564,15 +1634,16 @@ class GiantRobot(Enemy):
         ground_y = GROUND_Y
 
         # 從BOSS位置向外發射的裂痕線
-        import random
+        rng = self.rng.render
 
-        for i in range(8):
-            angle = (i * 45) * math.pi / 180  # 每45度一條裂痕
+        crack_count = quality["shockwave_cracks"]
+        for i in range(crack_count):
+            angle = (i * 360 / crack_count) * math.pi / 180  # 平均分布的裂痕
             end_x = boss_center_x + math.cos(angle) * 150
             end_y = ground_y + math.sin(angle) * 30
 
             # 隨機抖動讓裂痕看起來更自然
-            end_x += random.randint(-10, 10)
+            end_x += rng.randint(-10, 10)
             end_y = min(end_y, ground_y + 20)  # 確保不超出地面太多
 
             pygame.draw.line(
@@ -5,17 +5,21 @@
 import pygame
 import math
 from constants import *
+from systems.sim_clock import default_clock
+from systems.rng import default_rng
+from systems.quality_governor import quality_governor
 
 
 class HealthItem:
     """血量道具"""
 
-    def __init__(self, x, y):
+    def __init__(self, x, y, clock=None):
         self.x = x
         self.y = y
         self.size = HEALTH_ITEM_SIZE
         self.alive = True
-        self.spawn_time = pygame.time.get_ticks()
+        self.clock = clock if clock is not None else default_clock
+        self.spawn_time = self.clock.get_ticks()
         self.float_offset = 0  # 浮動動畫偏移
         self.collected = False
 
@@ -24,7 +28,7 @@ class HealthItem:
 
     def update(self):
         """更新血量道具"""
-        current_time = pygame.time.get_ticks()
+        current_time = self.clock.get_ticks()
 
         # 浮動動畫
         self.float_offset = math.sin((current_time - self.spawn_time) / 300.0) * 5
@@ -76,8 +80,8 @@ class HealthItem:
         heart_color = (255, 100, 100)  # 淺紅色
         glow_color = (255, 150, 150)  # 發光效果
 
-        # 發光效果
-        for i in range(3):
+        # 發光效果（低畫質時減少層數）
+        for i in range(quality_governor.settings["glow_layers"]):
             glow_size = self.size // 2 + i * 2
             alpha = 50 - i * 15
             glow_surface = pygame.Surface((glow_size * 2, glow_size * 2))
@@ -131,13 +135,15 @@ class HealthItem:
 class HealthItemSpawner:
     """血量道具生成器"""
 
-    def __init__(self):
-        self.last_spawn_time = pygame.time.get_ticks()
+    def __init__(self, clock=None, rng=None):
+        self.clock = clock if clock is not None else default_clock
+        self.rng = rng if rng is not None else default_rng  # 使用其中的生成串流
+        self.last_spawn_time = self.clock.get_ticks()
         self.items = []
 
     def update(self, platform_system=None):
         """更新道具生成器"""
-        current_time = pygame.time.get_ticks()
+        current_time = self.clock.get_ticks()
 
         # 檢查是否需要生成新道具
         if current_time - self.last_spawn_time > HEALTH_ITEM_SPAWN_INTERVAL:
@@ -152,28 +158,28 @@ class HealthItemSpawner:
 
     def spawn_health_item(self, platform_system=None):
         """生成血量道具"""
-        import random
+        rng = self.rng.spawns
 
         # 隨機選擇生成位置
         possible_positions = []
 
         # 地面位置
         for i in range(5):
-            x = random.randint(50, WINDOW_WIDTH - 50)
+            x = rng.randint(50, WINDOW_WIDTH - 50)
             possible_positions.append((x, GROUND_Y))
 
         # 平台位置
         if platform_system:
             for platform in platform_system.platforms:
                 # 在平台上隨機生成
-                x = random.randint(
+                x = rng.randint(
                     int(platform.x + 20), int(platform.x + platform.width - 20)
                 )
                 possible_positions.append((x, platform.y))
 
         if possible_positions:
-            x, y = random.choice(possible_positions)
-            item = HealthItem(x, y)
+            x, y = rng.choice(possible_positions)
+            item = HealthItem(x, y, clock=self.clock)
             self.items.append(item)
 
     def check_collection(self, player):
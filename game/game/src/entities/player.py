@@ -5,10 +5,12 @@
 import pygame
 import math
 from constants import *
+from systems.sim_clock import default_clock
+from systems.input_source import live_input
 
 
 class Player:
-    def __init__(self, x, y):
+    def __init__(self, x, y, clock=None, input_source=None):
         self.x = x
         self.y = y
         self.width = PLAYER_WIDTH
@@ -19,6 +21,8 @@ class Player:
         self.double_jump_available = True  # 二段跳可用性
         self.health = 3  # 三顆愛心
         self.platform_system = None  # 將由GameLevel設定
+        self.clock = clock if clock is not None else default_clock  # 模擬時鐘
+        self.input_source = input_source if input_source is not None else live_input
 
         # 狀態
         self.is_defending = False
@@ -56,8 +60,8 @@ class Player:
         self.max_combo = 10
 
         # 拳頭
-        self.left_fist = Fist(self, "left")
-        self.right_fist = Fist(self, "right")
+        self.left_fist = Fist(self, "left", self.clock)
+        self.right_fist = Fist(self, "right", self.clock)
 
         # 下平台系統
         self.drop_through_time = 0  # 下穿平台的計時器
@@ -66,6 +70,7 @@ class Player:
         # 輸入狀態
         self.keys = pygame.key.get_pressed()
         self.mouse_buttons = pygame.mouse.get_pressed()
+        self.mouse_pos = (0, 0)
 
     def handle_event(self, event):
         """處理單次事件（如跳躍）"""
@@ -83,9 +88,11 @@ class Player:
 
     def handle_input(self):
         """處理玩家輸入"""
-        self.keys = pygame.key.get_pressed()
-        self.mouse_buttons = pygame.mouse.get_pressed()
-        current_time = pygame.time.get_ticks()
+        snapshot = self.input_source.poll()
+        self.keys = snapshot.keys
+        self.mouse_buttons = snapshot.mouse_buttons
+        self.mouse_pos = snapshot.mouse_pos
+        current_time = self.clock.get_ticks()
 
         # 移動輸入
         moving = False
@@ -152,7 +159,7 @@ class Player:
             self.is_crouching = False
 
         # 攻擊輸入
-        mouse_pos = pygame.mouse.get_pos()
+        mouse_pos = self.mouse_pos
         is_air_attack = not self.on_ground  # 檢查是否為空中攻擊
 
         # 左鍵攻擊
@@ -173,7 +180,7 @@ class Player:
 
     def update(self):
         """更新玩家狀態"""
-        current_time = pygame.time.get_ticks()
+        current_time = self.clock.get_ticks()
 
         # 處理輸入
         self.handle_input()
@@ -248,7 +255,7 @@ class Player:
         if self.platform_system is None:
             return
 
-        current_time = pygame.time.get_ticks()
+        current_time = self.clock.get_ticks()
 
         # 檢查是否在下穿期間，如果是則忽略平台碰撞
         if current_time - self.drop_through_time < self.drop_through_duration:
@@ -274,7 +281,7 @@ class Player:
 
     def take_damage(self):
         """受到傷害 - 新增反擊機制"""
-        current_time = pygame.time.get_ticks()
+        current_time = self.clock.get_ticks()
 
         # 檢查是否在防禦中
         if self.is_defending:
@@ -306,7 +313,7 @@ class Player:
 
     def try_counter_attack(self, enemies):
         """嘗試執行反擊攻擊"""
-        current_time = pygame.time.get_ticks()
+        current_time = self.clock.get_ticks()
 
         if (
             self.counter_attack_ready
@@ -337,13 +344,13 @@ class Player:
         """激活清屏技能"""
         if self.clear_screen_available:
             self.clear_screen_available = False
-            self.clear_screen_cooldown_start = pygame.time.get_ticks()
+            self.clear_screen_cooldown_start = self.clock.get_ticks()
             return True
         return False
 
     def update_combo_system(self, hit_enemy=False):
         """更新連擊系統"""
-        current_time = pygame.time.get_ticks()
+        current_time = self.clock.get_ticks()
 
         if hit_enemy:
             self.combo_count = min(self.combo_count + 1, self.max_combo)
@@ -369,18 +376,19 @@ class Player:
         player_rect = self.get_rect()
         for enemy in enemies:
             if enemy.alive and player_rect.colliderect(enemy.get_rect()):
-                # 滑行特殊攻擊：將敵人往上方擊飛
-                player_center_x = self.x + self.width // 2
-                enemy.take_damage(
-                    SLIDE_ATTACK_DAMAGE, knockback=True, source_x=player_center_x
-                )
+                self.apply_slide_hit(enemy)
+
+    def apply_slide_hit(self, enemy):
+        """滑行特殊攻擊：將敵人往上方擊飛"""
+        player_center_x = self.x + self.width // 2
+        enemy.take_damage(SLIDE_ATTACK_DAMAGE, knockback=True, source_x=player_center_x)
 
-                # 特殊擊退效果：向上擊飛（無論是否無敵都生效）
-                enemy.vel_y = -8  # 向上速度（從-15調整為-8）
-                enemy.on_ground = False  # 確保敵人離開地面狀態，讓重力生效
-                enemy.knockback_vel_x = self.slide_direction * SLIDE_ATTACK_KNOCKBACK
-                enemy.knockback = True
-                enemy.knockback_start_time = pygame.time.get_ticks()
+        # 特殊擊退效果：向上擊飛（無論是否無敵都生效）
+        enemy.vel_y = -8  # 向上速度（從-15調整為-8）
+        enemy.on_ground = False  # 確保敵人離開地面狀態，讓重力生效
+        enemy.knockback_vel_x = self.slide_direction * SLIDE_ATTACK_KNOCKBACK
+        enemy.knockback = True
+        enemy.knockback_start_time = self.clock.get_ticks()
 
     def get_rect(self):
         """獲取碰撞矩形"""
@@ -398,7 +406,7 @@ class Player:
         actual_y = self.y + (self.height - actual_height)
 
         # 無敵時閃爍效果
-        if self.invincible and (pygame.time.get_ticks() // 100) % 2:
+        if self.invincible and (self.clock.get_ticks() // 100) % 2:
             color = (128, 128, 128)  # 灰色閃爍
         else:
             color = BROWN  # 老鼠顏色
@@ -425,8 +433,9 @@ class Player:
 
 
 class Fist:
-    def __init__(self, player, side):
+    def __init__(self, player, side, clock=None):
         self.player = player
+        self.clock = clock if clock is not None else player.clock
         self.side = side  # "left" 或 "right"
         self.x = 0
         self.y = 0
@@ -446,12 +455,12 @@ class Fist:
         """開始蓄力"""
         if not self.is_attacking and not self.charging:
             self.charging = True
-            self.charge_start_time = pygame.time.get_ticks()
+            self.charge_start_time = self.clock.get_ticks()
 
     def release_attack(self, mouse_pos, is_air_attack=False):
         """釋放攻擊"""
         if self.charging:
-            current_time = pygame.time.get_ticks()
+            current_time = self.clock.get_ticks()
             charge_duration = current_time - self.charge_start_time
 
             # 設定目標位置（朝向滑鼠方向）
@@ -499,7 +508,7 @@ class Fist:
     def start_attack(self, mouse_pos):
         """舊版本的立即攻擊（保持兼容性）"""
         if not self.is_attacking:
-            current_time = pygame.time.get_ticks()
+            current_time = self.clock.get_ticks()
 
             # 設定目標位置（朝向滑鼠方向）
             player_center_x = self.player.x + self.player.width // 2
@@ -529,7 +538,7 @@ class Fist:
 
     def update(self):
         """更新拳頭狀態"""
-        current_time = pygame.time.get_ticks()
+        current_time = self.clock.get_ticks()
 
         if self.charging:
             # 蓄力中，拳頭跟隨玩家並變大/閃爍
@@ -603,7 +612,7 @@ class Fist:
 
     def draw(self, screen):
         """繪製拳頭"""
-        current_time = pygame.time.get_ticks()
+        current_time = self.clock.get_ticks()
 
         if self.charging:
             charge_duration = current_time - self.charge_start_time
@@ -3,70 +3,718 @@
 玩家操作老鼠角色完成三個關卡
 """
 
-import pygame
 import sys
 import os
 
 # 添加當前目錄到路徑
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+# 啟動分析需要在匯入其他模組（包括 pygame）之前開始，才能記錄匯入耗時
+from startup_profiler import startup_profiler, requested
+
+if requested():
+    startup_profiler.start()
+
+import argparse
+import pygame
+import queue
+import time
+
 from states.game_states import GameStateManager
+from systems.sim_clock import SimulationClock
+from systems.input_source import live_input
+from systems.replay import InputRecorder, Replay, ReplayInput
+from systems.rng import new_seed
+from systems.sim_thread import SimulationThread
+from systems.quality_governor import quality_governor
+from systems.hitch_detector import hitch_detector
+from systems.frame_profiler import frame_profiler
+from systems.frame_stats import FrameStatsRecorder
+from systems.sampling_profiler import sampling_profiler
+from systems.alloc_tracker import alloc_tracker
+from systems.memory_report import memory_report
+from systems.gc_policy import gc_policy
 from constants import *
 
 
 class Game:
-    def __init__(self):
-        pygame.init()
+    def __init__(self, headless=False, seed=None, record_path=None):
+        self.headless = headless
+        self.record_path = record_path  # 錄製重播的輸出路徑（None 表示不錄製）
+
+        if headless:
+            # 無視窗模式：使用 SDL dummy 驅動，不開啟視窗也不輸出聲音
+            os.environ["SDL_VIDEODRIVER"] = "dummy"
+            os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+        with startup_profiler.stage("pygame.init"):
+            pygame.init()
 
         # 初始化音效系統
         try:
-            pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
+            with startup_profiler.stage("pygame.mixer.init"):
+                pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
             print("音效系統初始化成功")
         except pygame.error as e:
             print(f"音效系統初始化失敗: {e}")
 
-        self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+        with startup_profiler.stage("pygame.display.set_mode"):
+            self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
         pygame.display.set_caption("老鼠格鬥遊戲")
         self.clock = pygame.time.Clock()
-        self.state_manager = GameStateManager()
+        self.sim_clock = SimulationClock()  # 固定步長的模擬時鐘
+        self.profile_dump_path = None  # 結束時輸出幀分析資料的路徑
+        self.frame_stats = None  # 每個關卡的幀時間報告（None 表示不記錄）
+        self.sample_profile_path = None  # 結束時輸出取樣分析結果的路徑
+        self.startup_profile_path = None  # 啟動分析報告的輸出路徑
+        self.quality_report = False  # 結束時是否輸出畫質調節的統計
+        self.gc_report = False  # 結束時是否輸出垃圾回收的暫停時間
+        frame_profiler.count_source = self.profile_counts
+
+        # 錄製時固定關卡種子，重新開始關卡也能以相同的亂數重現
+        self.recorder = None
+        if record_path:
+            self.recorder = InputRecorder(live_input, self.sim_clock)
+            if seed is None:
+                seed = new_seed()
+        with startup_profiler.stage("GameStateManager.__init__"):
+            self.state_manager = GameStateManager(
+                self.sim_clock, input_source=self.recorder, seed=seed
+            )
 
         # 初始化音效管理器並開始播放背景音樂
         from systems.sound_manager import sound_manager
 
         self.sound_manager = sound_manager
 
+        if headless:
+            # 批次模擬不需要音效，也不應該寫入玩家的存檔
+            from systems.save_system import save_system
+
+            self.sound_manager.set_enabled(False)
+            save_system.persistent = False
+            return
+
         # 確保音效系統已載入
         self.sound_manager.ensure_loaded()
 
         # 開始播放背景音樂
-        self.sound_manager.play_background_music()
+        with startup_profiler.stage("play_background_music"):
+            self.sound_manager.play_background_music()
 
     def run(self):
         """主遊戲迴圈"""
         running = True
-        while running:
-            # 處理事件
+        frame_ms = self.sim_clock.tick_ms  # 第一幀至少推進一步
+        try:
+            while running:
+                frame_profiler.begin_frame()
+
+                # 處理事件
+                for event in pygame.event.get():
+                    if event.type == pygame.QUIT:
+                        running = False
+                    elif not self._handle_profiler_key(event):
+                        self.state_manager.handle_event(event)
+                frame_profiler.lap("events")
+
+                # 以固定步長更新遊戲邏輯，畫面變慢時補跑落後的步數
+                for _ in range(self.sim_clock.accumulate(frame_ms)):
+                    self.state_manager.update()
+                    self.sim_clock.step()
+                    frame_profiler.lap("update.other")
+
+                # 繪製畫面（畫面更新率不受模擬頻率限制，以前後兩步的位置插值）
+                blend = self.sim_clock.get_blend() if RENDER_INTERPOLATION else 1.0
+                self.screen.fill(BLACK)
+                self.state_manager.draw(self.screen, blend)
+                frame_profiler.lap("draw.other")
+                frame_profiler.draw_overlay(self.screen)
+                frame_profiler.lap("draw.profiler_overlay")
+
+                # 更新顯示
+                pygame.display.flip()
+                frame_profiler.lap("display.flip")
+                frame_profiler.end_frame()
+                if startup_profiler.active:
+                    self._report_startup("first_frame")
+                frame_ms = self.clock.tick(RENDER_MAX_FPS)
+
+                # 以不含等待時間的幀耗時調整特效畫質
+                quality_governor.record_frame(self.clock.get_rawtime())
+        finally:
+            self._finish_session()
+
+        pygame.quit()
+        sys.exit()
+
+    def run_threaded(self):
+        """
+        主遊戲迴圈（模擬與繪製分開執行緒）
+
+        模擬執行緒以固定步長更新並發布凍結的繪製幀；主執行緒只處理視窗事件與繪製最新的幀，
+        pygame 在繪製與顯示時釋放 GIL 的部分可以與模擬重疊，繪製變慢也不會延誤輸入處理。
+        鍵盤與滑鼠狀態在主執行緒讀取後轉交，音效呼叫則排入佇列回到主執行緒播放
+        """
+        sim_thread = SimulationThread(self.state_manager, self.sim_clock)
+        if self.recorder is not None:
+            self.recorder.source = sim_thread.input
+        else:
+            self.state_manager.input_source = sim_thread.input
+        self.sound_manager.defer(queue.SimpleQueue())
+        sim_thread.post_input(live_input.poll())
+        sim_thread.start()
+
+        running = True
+        try:
+            while running and not sim_thread.stopped:
+                for event in pygame.event.get():
+                    if event.type == pygame.QUIT:
+                        running = False
+                    else:
+                        sim_thread.post_event(event)
+                sim_thread.post_input(live_input.poll())
+                self.sound_manager.run_deferred()
+
+                frame = sim_thread.latest_frame()
+                if frame is not None:
+                    blend = frame.get_blend() if RENDER_INTERPOLATION else 1.0
+                    self.screen.fill(BLACK)
+                    frame.draw(self.screen, blend)
+                    pygame.display.flip()
+                    if startup_profiler.active:
+                        self._report_startup("first_frame")
+                self.clock.tick(RENDER_MAX_FPS)
+                quality_governor.record_frame(self.clock.get_rawtime())
+        finally:
+            sim_thread.stop()
+            sim_thread.join()
+            self.sound_manager.run_deferred()
+            self.sound_manager.defer(None)
+            self._finish_session()
+
+        if sim_thread.error is not None:
+            raise sim_thread.error
+
+        pygame.quit()
+        sys.exit()
+
+    def _finish_session(self):
+        """
+        結束遊戲時儲存重播並輸出各項報告
+
+        主迴圈以 finally 呼叫，無論從選單離開、關閉視窗或發生例外都會執行；
+        沒有啟用的報告不做任何事
+        """
+        self._save_recording()
+        self._report_quality()
+        self._report_gc()
+        self._report_memory()
+        self._report_hitches()
+        self._report_allocations()
+        if self.profile_dump_path:
+            frame_profiler.dump(self.profile_dump_path)
+            print(f"幀分析資料已寫入 {self.profile_dump_path}")
+        if self.frame_stats is not None:
+            self.frame_stats.stop()
+            for path in self.frame_stats.written:
+                print(f"幀時間報告：{path}")
+        if sampling_profiler.running:
+            self._finish_sampling(self.sample_profile_path)
+
+    def _save_recording(self):
+        """儲存錄製的重播（沒有錄製時不做任何事）"""
+        if self.recorder is not None and self.recorder.save(self.record_path):
+            print(f"重播已儲存：{self.record_path}")
+
+    def _report_startup(self, mark=None):
+        """
+        結束啟動分析，輸出依耗時排序的報告
+
+        Args:
+            mark (str): 結束前記錄的最後一個階段名稱（例如繪製第一幀）
+        """
+        if mark is not None:
+            startup_profiler.mark(mark)
+        report = startup_profiler.finish()
+        if report is None:
+            return
+        print(startup_profiler.format_report(report, top=STARTUP_REPORT_TOP))
+        if self.startup_profile_path:
+            startup_profiler.write_report(self.startup_profile_path, report)
+            print(f"啟動分析報告已寫入 {self.startup_profile_path}")
+
+    def _report_quality(self):
+        """結束時輸出畫質調節的統計（方便調整預算與門檻，需以 --quality-report 開啟）"""
+        if not self.quality_report:
+            return
+        stats = quality_governor.get_stats()
+        if not stats["frames"]:
+            return
+        print(
+            f"特效畫質：結束時為{stats['level_name']}，"
+            f"調整 {stats['changes']} 次（降低 {stats['downgrades']}、"
+            f"恢復 {stats['upgrades']}，每分鐘 {stats['changes_per_minute']:.1f} 次），"
+            f"平均幀耗時 {stats['average_ms']:.1f} / {stats['budget_ms']:.1f} ms"
+        )
+
+    def _handle_profiler_key(self, event):
+        """
+        處理幀分析的快捷鍵（F3 切換浮層、F4 輸出分析資料）
+
+        Returns:
+            bool: 事件是否已處理
+        """
+        if event.type != pygame.KEYDOWN:
+            return False
+        if event.key == pygame.K_F3:
+            frame_profiler.toggle_overlay()
+            return True
+        if event.key == pygame.K_F4:
+            path = self.profile_dump_path or PROFILER_DUMP_PATH
+            frame_profiler.dump(path)
+            print(f"幀分析資料已寫入 {path}")
+            return True
+        if event.key == pygame.K_F5:
+            if sampling_profiler.running:
+                self._finish_sampling()
+            else:
+                sampling_profiler.reset()
+                sampling_profiler.start()
+                print("取樣分析開始（再按一次 F5 停止並輸出）")
+            return True
+        return False
+
+    def _finish_sampling(self, path=None):
+        """停止取樣分析並輸出 folded stack 檔"""
+        sampling_profiler.stop()
+        if path is None:
+            stamp = time.strftime("%Y%m%d_%H%M%S")
+            path = os.path.join(SAMPLING_OUTPUT_DIR, f"profile_{stamp}.folded")
+        sampling_profiler.write_folded(path)
+
+        stats = sampling_profiler.get_stats()
+        print(
+            f"取樣分析：{stats['samples']} 次取樣 / {stats['elapsed_seconds']:.1f} 秒"
+            f"（{stats['samples_per_second']:.0f} 次/秒），已寫入 {path}"
+        )
+        for name, count, share in sampling_profiler.top_functions(5):
+            print(f"  {share * 100:5.1f}%  {name}")
+
+    def profile_counts(self):
+        """幀分析顯示的實體數量"""
+        level = self.state_manager.current_level
+        if self.state_manager.current_state != GAME_STATE or level is None:
+            return {}
+
+        by_type = {}
+        for projectile in level.projectile_manager:
+            name = type(projectile).__name__
+            by_type[name] = by_type.get(name, 0) + 1
+        return {
+            "effects": level.particle_system.get_effect_count(),
+            "particles": level.particle_system.get_particle_count(),
+            "enemies": len(level.enemies),
+            "projectiles": len(level.projectile_manager),
+            "projectiles_by_type": by_type,
+            "projectile_pool": level.projectile_manager.get_stats(),
+        }
+
+    def describe_frame(self):
+        """目前遊戲狀態的簡短說明（寫入卡頓記錄）"""
+        manager = self.state_manager
+        text = f"狀態 {manager.current_state}，模擬步 {self.sim_clock.tick_count}"
+        if manager.current_state == GAME_STATE and manager.current_level:
+            level = manager.current_level
+            text += (
+                f"，關卡 {level.level_number}，敵人 {len(level.enemies)}，"
+                f"投射物 {len(level.projectile_manager)}，"
+                f"粒子 {level.particle_system.get_particle_count()}"
+            )
+        return text
+
+    def _report_gc(self):
+        """結束時輸出垃圾回收的暫停時間（需以 --gc-report 開啟）"""
+        if not self.gc_report:
+            return
+        stats = gc_policy.get_stats()
+        for bucket, label in (("play", "遊玩中"), ("pause", "暫停時")):
+            counts = stats["collections"][bucket]
+            if not sum(counts):
+                continue
+            print(
+                f"垃圾回收（{label}）：{sum(counts)} 次"
+                f"（gen0/1/2 = {counts[0]}/{counts[1]}/{counts[2]}），"
+                f"共 {stats['pause_ms'][bucket]:.1f} ms，"
+                f"最長 {stats['max_pause_ms'][bucket]:.2f} ms"
+            )
+
+    def _report_memory(self):
+        """結束時輸出記憶體報告的摘要"""
+        if not memory_report.enabled:
+            return
+        stats = memory_report.get_stats()
+        memory_report.stop()
+        print(
+            f"記憶體報告：{stats['checkpoints']} 個檢查點，{stats['flagged']} 個可疑增加，"
+            f"記錄於 {stats['log_path']}"
+        )
+        for kind, entry in stats["kinds"].items():
+            print(
+                f"  {kind}：{entry['count']} 次，堆積 {entry['first'] / 1024:.1f} → "
+                f"{entry['last'] / 1024:.1f} KB（{entry['growth'] / 1024:+.1f} KB）"
+            )
+
+    def _report_hitches(self):
+        """結束時輸出卡頓偵測的摘要"""
+        if not hitch_detector.enabled:
+            return
+        stats = hitch_detector.get_stats()
+        hitch_detector.stop()
+        print(
+            f"卡頓偵測：{stats['frames']} 幀中有 {stats['hitches']} 幀超過 "
+            f"{stats['threshold_ms']:.0f} ms（最慢 {stats['worst_ms']:.1f} ms），"
+            f"記錄於 {stats['log_path']}"
+        )
+        for name, count in sorted(
+            stats["section_hitches"].items(), key=lambda item: -item[1]
+        ):
+            print(f"  {name}：{count} 次")
+
+    def _report_allocations(self):
+        """結束時輸出配置追蹤的排名"""
+        if not alloc_tracker.enabled:
+            return
+        alloc_tracker.stop()
+        print(alloc_tracker.format_report())
+
+    def run_headless(
+        self, level_number, max_ticks, draw=False, stop_on_end=True, seed=None
+    ):
+        """
+        無視窗、不限幀率地執行關卡模擬
+
+        不呼叫 pygame.display.flip() 與 clock.tick(FPS)，模擬以 CPU 能跑的最快速度推進
+
+        Args:
+            level_number: 要執行的關卡編號
+            max_ticks (int): 最多執行的模擬步數
+            draw (bool): 是否仍然繪製到離屏畫面（用於量測繪製成本）
+            stop_on_end (bool): 關卡完成或遊戲結束時是否提早停止
+            seed: 關卡亂數種子（None 表示隨機產生，實際種子會記錄在結果中）
+
+        Returns:
+            dict: 執行結果摘要
+        """
+        self.state_manager.start_level(level_number, seed)
+        level = self.state_manager.current_level
+
+        start_tick = self.sim_clock.tick_count
+        start_time = time.perf_counter()
+        ticks = 0
+        while ticks < max_ticks:
+            # 保持 SDL 事件佇列暢通（dummy 驅動不會產生輸入事件）
+            pygame.event.pump()
+
+            self.state_manager.update()
+            self.sim_clock.step()
+            ticks += 1
+
+            if draw:
+                self.screen.fill(BLACK)
+                self.state_manager.draw(self.screen)
+
+            if stop_on_end and (level.game_over or level.level_complete):
+                break
+
+        wall_time = time.perf_counter() - start_time
+        sim_time = (self.sim_clock.tick_count - start_tick) * self.sim_clock.tick_ms
+
+        if level.level_complete:
+            outcome = "complete"
+        elif level.game_over:
+            outcome = "game_over"
+        else:
+            outcome = "timeout"
+
+        return {
+            "level": level_number,
+            "seed": level.seed,
+            "ticks": ticks,
+            "outcome": outcome,
+            "player_health": level.player.health,
+            "enemies_left": len(level.enemies),
+            "sim_seconds": sim_time / 1000.0,
+            "wall_seconds": wall_time,
+            "speedup": (sim_time / 1000.0) / wall_time if wall_time > 0 else 0.0,
+        }
+
+    def run_replay(self, replay, draw=True, realtime=False):
+        """
+        重新播放錄製的輸入
+
+        Args:
+            replay (Replay): 要播放的重播
+            draw (bool): 是否繪製畫面
+            realtime (bool): 是否以正常速度顯示在視窗中（否則不限幀率）
+
+        Returns:
+            dict: 執行結果摘要
+        """
+        # 觀看重播不應該改變玩家的存檔與最佳時間
+        from systems.save_system import save_system
+
+        save_system.persistent = False
+
+        replay_input = ReplayInput(replay, self.sim_clock)
+        self.state_manager = GameStateManager(
+            self.sim_clock, input_source=replay_input, seed=replay.seed
+        )
+
+        # 冷卻時間以絕對時間計算，時鐘必須對齊錄製開始的步數
+        self.sim_clock.reset(replay.start_tick)
+        self.state_manager.start_level(replay.level_number)
+        level = self.state_manager.current_level
+
+        start_time = time.perf_counter()
+        ticks = 0
+        while (
+            not replay_input.finished and self.state_manager.current_state == GAME_STATE
+        ):
+            quit_requested = False
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
-                    running = False
-                else:
-                    self.state_manager.handle_event(event)
+                    quit_requested = True
+            if quit_requested:
+                break
+
+            for event in replay_input.get_events():
+                if self.state_manager.current_state != GAME_STATE:
+                    break  # 錄製中按 ESC 回到選單，之後的事件不屬於關卡
+                self.state_manager.handle_event(event)
+            if self.state_manager.current_state != GAME_STATE:
+                break
 
-            # 更新遊戲邏輯
             self.state_manager.update()
+            self.sim_clock.step()
+            ticks += 1
+
+            if draw:
+                self.screen.fill(BLACK)
+                self.state_manager.draw(self.screen)
+            if realtime:
+                pygame.display.flip()
+                self.clock.tick(FPS)
+
+        wall_time = time.perf_counter() - start_time
+        sim_time = ticks * self.sim_clock.tick_ms / 1000.0
+        # 進入下一關時回報最後的關卡；回到選單時 current_level 已清除，沿用離開前的關卡
+        level = self.state_manager.current_level or level
+
+        return {
+            "level": level.level_number,
+            "seed": replay.seed,
+            "ticks": ticks,
+            "recorded_ticks": len(replay),
+            "player_health": level.player.health,
+            "enemies_left": len(level.enemies),
+            "sim_seconds": sim_time,
+            "wall_seconds": wall_time,
+            "speedup": sim_time / wall_time if wall_time > 0 else 0.0,
+        }
+
 
-            # 繪製畫面
-            self.screen.fill(BLACK)
-            self.state_manager.draw(self.screen)
+def parse_level(text):
+    """解析關卡編號（支援 2.5 隱藏關卡）"""
+    value = float(text)
+    return int(value) if value.is_integer() else value
 
-            # 更新顯示
-            pygame.display.flip()
-            self.clock.tick(FPS)
 
+# 命令列可指定的固定畫質
+QUALITY_CHOICES = {
+    "auto": QUALITY_HIGH,
+    "high": QUALITY_HIGH,
+    "medium": QUALITY_MEDIUM,
+    "low": QUALITY_LOW,
+}
+
+
+def parse_args(argv=None):
+    """解析命令列參數"""
+    parser = argparse.ArgumentParser(description="老鼠格鬥遊戲")
+    parser.add_argument(
+        "--headless", action="store_true", help="無視窗、不限幀率地執行關卡模擬"
+    )
+    parser.add_argument(
+        "--level", type=parse_level, default=LEVEL_1, help="無視窗模式執行的關卡"
+    )
+    parser.add_argument(
+        "--ticks", type=int, default=FPS * 60, help="無視窗模式最多執行的模擬步數"
+    )
+    parser.add_argument(
+        "--no-draw", action="store_true", help="無視窗模式下完全跳過 draw()"
+    )
+    parser.add_argument("--seed", type=int, help="關卡亂數種子（相同種子結果相同）")
+    parser.add_argument("--record", metavar="PATH", help="將遊玩過程的輸入錄製成重播檔")
+    parser.add_argument(
+        "--replay", metavar="PATH", help="播放重播檔（搭配 --headless 時不限幀率）"
+    )
+    parser.add_argument(
+        "--threaded", action="store_true", help="模擬與繪製在不同執行緒中執行"
+    )
+    parser.add_argument(
+        "--hitch-log",
+        nargs="?",
+        const=HITCH_LOG_PATH,
+        metavar="PATH",
+        help=f"記錄超過門檻的卡頓幀（預設寫入 {HITCH_LOG_PATH}）",
+    )
+    parser.add_argument(
+        "--hitch-threshold",
+        type=float,
+        default=HITCH_THRESHOLD_MS,
+        metavar="MS",
+        help="卡頓門檻（毫秒）",
+    )
+    parser.add_argument(
+        "--profile-dump",
+        metavar="PATH",
+        help="整段遊玩都記錄各階段耗時，結束時輸出 JSON（F3 浮層、F4 隨時輸出）",
+    )
+    parser.add_argument(
+        "--frame-stats",
+        nargs="?",
+        const=FRAME_STATS_DIR,
+        metavar="DIR",
+        help=f"每個關卡結束時輸出幀時間百分位與分布（預設目錄 {FRAME_STATS_DIR}）",
+    )
+    parser.add_argument(
+        "--sample-profile",
+        metavar="PATH",
+        help="整段遊玩進行取樣分析，結束時輸出 folded stack 檔（遊戲中也可按 F5 切換）",
+    )
+    parser.add_argument(
+        "--sample-interval",
+        type=float,
+        default=SAMPLING_INTERVAL_MS,
+        metavar="MS",
+        help="取樣間隔（毫秒）",
+    )
+    parser.add_argument(
+        "--startup-profile",
+        nargs="?",
+        const=STARTUP_PROFILE_PATH,
+        metavar="PATH",
+        help=f"記錄啟動到第一幀之間各階段與模組匯入的耗時（預設寫入 {STARTUP_PROFILE_PATH}）",
+    )
+    parser.add_argument(
+        "--alloc-track",
+        action="store_true",
+        help="統計每幀建立的 Surface、Rect 與物件，結束時輸出排名（遊戲會明顯變慢）",
+    )
+    parser.add_argument(
+        "--memory-report",
+        nargs="?",
+        const=MEMORY_LOG_PATH,
+        metavar="PATH",
+        help=f"關卡開始、重新開始與回到選單時記錄堆積快照的差異（預設 {MEMORY_LOG_PATH}）",
+    )
+    parser.add_argument(
+        "--quality",
+        choices=QUALITY_CHOICES,
+        default="auto",
+        help="特效畫質（auto 依幀耗時自動調整）",
+    )
+    parser.add_argument(
+        "--quality-report",
+        action="store_true",
+        help="結束時輸出特效畫質調整的次數與平均幀耗時",
+    )
+    parser.add_argument(
+        "--gc-report",
+        action="store_true",
+        help="結束時輸出遊玩中與暫停時的垃圾回收次數與暫停時間",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """遊戲進入點"""
+    args = parse_args(argv)
+    if args.startup_profile:
+        startup_profiler.start()  # 以 argv 呼叫時無法在匯入前開始，只記錄之後的階段
+    sampling_profiler.interval_ms = args.sample_interval
+    if args.quality != "auto":
+        quality_governor.enabled = False
+        quality_governor.reset(QUALITY_CHOICES[args.quality])
+
+    if args.replay:
+        replay = Replay.load(args.replay)
+        with startup_profiler.stage("Game.__init__"):
+            game = Game(headless=args.headless)
+        game.startup_profile_path = args.startup_profile
+        game._report_startup()
+        result = game.run_replay(
+            replay, draw=not args.no_draw, realtime=not args.headless
+        )
+        print(
+            f"重播 {args.replay}：關卡 {result['level']}（種子 {result['seed']}），"
+            f"{result['ticks']}/{result['recorded_ticks']} 步，"
+            f"實際 {result['wall_seconds']:.2f} 秒（{result['speedup']:.1f}x）"
+        )
         pygame.quit()
-        sys.exit()
+        return
+
+    if args.headless:
+        with startup_profiler.stage("Game.__init__"):
+            game = Game(headless=True)
+        game.startup_profile_path = args.startup_profile
+        game._report_startup()
+        result = game.run_headless(
+            args.level, args.ticks, draw=not args.no_draw, seed=args.seed
+        )
+        print(
+            f"關卡 {result['level']}（種子 {result['seed']}）：{result['outcome']}，"
+            f"{result['ticks']} 步 / 模擬 {result['sim_seconds']:.1f} 秒，"
+            f"實際 {result['wall_seconds']:.2f} 秒（{result['speedup']:.1f}x）"
+        )
+        pygame.quit()
+        return
+
+    if args.memory_report:
+        memory_report.start(args.memory_report)  # 在建立遊戲前開始，追蹤所有配置
+    with startup_profiler.stage("Game.__init__"):
+        game = Game(seed=args.seed, record_path=args.record)
+    game.startup_profile_path = args.startup_profile
+    game.quality_report = args.quality_report
+    game.gc_report = args.gc_report
+    if args.threaded:
+        if (
+            args.hitch_log
+            or args.profile_dump
+            or args.frame_stats
+            or args.sample_profile
+            or args.alloc_track
+        ):
+            print("卡頓偵測與幀分析只支援單執行緒的主迴圈，已略過")
+        game.run_threaded()
+    else:
+        if args.sample_profile:
+            game.sample_profile_path = args.sample_profile
+            sampling_profiler.start()
+        if args.frame_stats:
+            game.frame_stats = FrameStatsRecorder(game.state_manager, args.frame_stats)
+            game.frame_stats.start()
+        if args.profile_dump:
+            game.profile_dump_path = args.profile_dump
+            frame_profiler.require("dump")
+        if args.hitch_log:
+            hitch_detector.threshold_ms = args.hitch_threshold
+            hitch_detector.start(args.hitch_log, describe=game.describe_frame)
+        if args.alloc_track:
+            alloc_tracker.start()
+        game.run()
 
 
 if __name__ == "__main__":
-    game = Game()
-    game.run()
+    main()
@@ -0,0 +1,293 @@
+"""
+啟動分析 - 記錄從啟動到第一幀之間各階段與每個模組匯入的耗時
+必須在匯入其他模組之前開始，因此放在 src 最上層且只使用標準函式庫
+（匯入 systems 套件就會連帶匯入 pygame 與多個系統模組）
+"""
+
+import json
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+FLAG = "--startup-profile"
+
+
+def requested(argv=None):
+    """
+    命令列是否要求啟動分析（在 argparse 解析之前檢查）
+
+    Args:
+        argv (list): 命令列參數（None 表示 sys.argv）
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+    return any(arg == FLAG or arg.startswith(FLAG + "=") for arg in argv)
+
+
+class _TimedLoader:
+    """
+    匯入期間暫時取代模組的載入器，計時 create_module（例如載入擴充模組）
+    與 exec_module（執行模組頂層程式碼），完成後還原為原本的載入器
+    """
+
+    def __init__(self, profiler, name, loader):
+        self._profiler = profiler
+        self._name = name
+        self._loader = loader
+
+    def __getattr__(self, attr):
+        return getattr(self._loader, attr)
+
+    def create_module(self, spec):
+        create = getattr(self._loader, "create_module", None)
+        if create is None:
+            return None
+        start = self._profiler._enter_import()
+        try:
+            return create(spec)
+        finally:
+            self._profiler._exit_import(self._name, start)
+
+    def exec_module(self, module):
+        start = self._profiler._enter_import()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profiler._exit_import(self._name, start)
+            if module.__spec__ is not None and module.__spec__.loader is self:
+                module.__spec__.loader = self._loader
+            if getattr(module, "__loader__", None) is self:
+                module.__loader__ = self._loader
+
+
+class _ImportTimer:
+    """sys.meta_path 上的尋找器：交給其餘尋找器找到模組後，以 _TimedLoader 包裝載入器"""
+
+    def __init__(self, profiler):
+        self._profiler = profiler
+        self._finding = set()
+
+    def find_spec(self, fullname, path=None, target=None):
+        if fullname in self._finding or not self._profiler._on_thread():
+            return None
+        self._finding.add(fullname)
+        try:
+            for finder in sys.meta_path:
+                if finder is self:
+                    continue
+                find_spec = getattr(finder, "find_spec", None)
+                if find_spec is None:
+                    continue
+                spec = find_spec(fullname, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+        finally:
+            self._finding.discard(fullname)
+
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _TimedLoader(self._profiler, fullname, spec.loader)
+        return spec
+
+
+class StartupProfiler:
+    """
+    啟動分析器
+
+    階段以 stage(名稱) 包住要計時的程式碼，可以巢狀：每個階段記錄累計耗時
+    與扣除子階段後的自身耗時。模組匯入以 sys.meta_path 上的尋找器計時，
+    與 python -X importtime 相同，自身耗時不含其中再匯入的模組。
+    只記錄呼叫 start() 的執行緒；finish() 後移除匯入掛鉤，stage() 不再計時。
+    """
+
+    def __init__(self):
+        self.active = False
+        self.started_at = None
+        self.total_ms = 0.0
+        self.stages = {}  # 名稱 -> [累計毫秒, 自身毫秒, 次數, 上層階段]
+        self.imports = {}  # 模組名稱 -> [累計毫秒, 自身毫秒]
+
+        self._thread_id = None
+        self._finder = None
+        self._stage_stack = []  # [名稱, 子階段累計毫秒]
+        self._import_stack = []  # 子模組匯入累計毫秒
+        self._last_mark = None
+
+    def _on_thread(self):
+        return threading.get_ident() == self._thread_id
+
+    def start(self):
+        """開始分析並安裝匯入掛鉤（已開始時不做任何事）"""
+        if self.active:
+            return
+        self.active = True
+        self._thread_id = threading.get_ident()
+        self.started_at = self._last_mark = time.perf_counter()
+        self._finder = _ImportTimer(self)
+        sys.meta_path.insert(0, self._finder)
+
+    def finish(self):
+        """
+        結束分析並移除匯入掛鉤
+
+        Returns:
+            dict: 分析報告（未開始時返回 None）
+        """
+        if not self.active:
+            return None
+        self.total_ms = (time.perf_counter() - self.started_at) * 1000.0
+        self.active = False
+        if self._finder in sys.meta_path:
+            sys.meta_path.remove(self._finder)
+        self._finder = None
+        return self.get_report()
+
+    # ---- 模組匯入 ----
+
+    def _enter_import(self):
+        self._import_stack.append(0.0)
+        return time.perf_counter()
+
+    def _exit_import(self, name, start):
+        elapsed = (time.perf_counter() - start) * 1000.0
+        children = self._import_stack.pop()
+        entry = self.imports.get(name)
+        if entry is None:
+            entry = self.imports[name] = [0.0, 0.0]
+        entry[0] += elapsed
+        entry[1] += elapsed - children
+        if self._import_stack:
+            self._import_stack[-1] += elapsed
+
+    # ---- 階段 ----
+
+    @contextmanager
+    def stage(self, name):
+        """
+        計時一個啟動階段
+
+        Args:
+            name (str): 階段名稱（例如 "pygame.init"、"MainMenu"）
+        """
+        if not self.active or not self._on_thread():
+            yield
+            return
+
+        parent = self._stage_stack[-1][0] if self._stage_stack else None
+        frame = [name, 0.0]
+        self._stage_stack.append(frame)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self._stage_stack.pop()
+            self._record_stage(name, (end - start) * 1000.0, frame[1], parent)
+            if self._stage_stack:
+                self._stage_stack[-1][1] += (end - start) * 1000.0
+            else:
+                self._last_mark = end
+
+    def mark(self, name):
+        """
+        記錄一個從上一個最外層階段結束到現在的階段（例如繪製第一幀）
+
+        Args:
+            name (str): 階段名稱
+        """
+        if not self.active or self._stage_stack:
+            return
+        now = time.perf_counter()
+        elapsed = (now - self._last_mark) * 1000.0
+        self._record_stage(name, elapsed, 0.0, None)
+        self._last_mark = now
+
+    def _record_stage(self, name, elapsed, children, parent):
+        entry = self.stages.get(name)
+        if entry is None:
+            entry = self.stages[name] = [0.0, 0.0, 0, parent]
+        entry[0] += elapsed
+        entry[1] += elapsed - children
+        entry[2] += 1
+
+    # ---- 報告 ----
+
+    def get_report(self):
+        """
+        整理分析結果，階段與模組都依自身耗時由多到少排列
+
+        Returns:
+            dict: 可序列化為 JSON 的報告
+        """
+        stages = [
+            {
+                "name": name,
+                "self_ms": self_ms,
+                "total_ms": total_ms,
+                "count": count,
+                "parent": parent,
+            }
+            for name, (total_ms, self_ms, count, parent) in self.stages.items()
+        ]
+        stages.sort(key=lambda entry: -entry["self_ms"])
+        imports = [
+            {"module": name, "self_ms": self_ms, "total_ms": total_ms}
+            for name, (total_ms, self_ms) in self.imports.items()
+        ]
+        imports.sort(key=lambda entry: -entry["self_ms"])
+
+        total_ms = self.total_ms
+        if self.active:
+            total_ms = (time.perf_counter() - self.started_at) * 1000.0
+        return {
+            "total_ms": total_ms,
+            "import_ms": sum(entry["self_ms"] for entry in imports),
+            "module_count": len(imports),
+            "stages": stages,
+            "imports": imports,
+        }
+
+    def format_report(self, report=None, top=15):
+        """
+        將報告轉成文字
+
+        Args:
+            report (dict): get_report() 的結果（None 表示重新整理）
+            top (int): 列出的模組數量
+        """
+        if report is None:
+            report = self.get_report()
+        lines = [
+            f"啟動分析：共 {report['total_ms']:.1f} ms，"
+            f"其中匯入 {report['module_count']} 個模組 {report['import_ms']:.1f} ms",
+            "階段（依自身耗時排序，自身耗時不含子階段）：",
+            f"  {'自身 ms':>7}  {'累計 ms':>7}  名稱",
+        ]
+        for entry in report["stages"]:
+            name = entry["name"]
+            if entry["parent"]:
+                name += f"（於 {entry['parent']}）"
+            if entry["count"] > 1:
+                name += f" ×{entry['count']}"
+            lines.append(f"  {entry['self_ms']:9.1f}  {entry['total_ms']:9.1f}  {name}")
+        lines.append(f"模組匯入（依自身耗時排序，前 {top} 個）：")
+        lines.append(f"  {'自身 ms':>7}  {'累計 ms':>7}  模組")
+        for entry in report["imports"][:top]:
+            lines.append(
+                f"  {entry['self_ms']:9.1f}  {entry['total_ms']:9.1f}  {entry['module']}"
+            )
+        return "\n".join(lines)
+
+    def write_report(self, path, report=None):
+        """將報告寫成 JSON"""
+        if report is None:
+            report = self.get_report()
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        return path
+
+
+# 全域啟動分析器實例
+startup_profiler = StartupProfiler()
@@ -4,48 +4,130 @@
 
 import pygame
 import math
-import random
 from constants import *
 from entities.player import Player
-from entities.enemies import TrainingDummy, SmallRobot, GiantRobot, EliteMech, MageRobot
+from entities.enemies import (
+    TrainingDummy,
+    SmallRobot,
+    GiantRobot,
+    EliteMech,
+    MageRobot,
+    MissileBullet,
+)
 from entities.items import HealthItemSpawner
 from systems.platform_system import PlatformSystem
+from systems.projectile_manager import ProjectileManager
+from systems.collision_system import (
+    CollisionSystem,
+    LAYER_PLAYER,
+    LAYER_FIST,
+    LAYER_ENEMY,
+    LAYER_ENEMY_PROJECTILE,
+)
 from systems.font_manager import get_font
 from systems.save_system import save_system
 from systems.particle_system import particle_system
 from systems.sound_manager import sound_manager
+from systems.sim_clock import default_clock
+from systems.rng import default_rng
+from systems.rewind import RewindBuffer
+from systems.world_snapshot import WorldSnapshotter
+from systems.interpolation import RenderInterpolator
+from systems.quality_governor import quality_governor
+from systems.frame_profiler import frame_profiler
+from systems.gc_policy import gc_policy, PAUSE_GAME_OVER, PAUSE_LEVEL_COMPLETE
+from systems.memory_report import memory_report, CHECKPOINT_LEVEL_RESTART
 
 
 class GameLevel:
-    def __init__(self, state_manager, level_number):
+    def __init__(
+        self, state_manager, level_number, clock=None, input_source=None, seed=None
+    ):
         self.state_manager = state_manager
         self.level_number = level_number
-        self.player = Player(100, GROUND_Y - PLAYER_HEIGHT)
+        self.clock = clock if clock is not None else default_clock  # 模擬時鐘
+        self.input_source = input_source  # 玩家輸入來源（None 表示即時輸入）
+
+        # 每次開始關卡都重新設定亂數串流，相同種子的關卡過程完全相同
+        self.rng = default_rng
+        self.seed = self.rng.seed(seed)
+
+        self.player = Player(
+            100,
+            GROUND_Y - PLAYER_HEIGHT,
+            clock=self.clock,
+            input_source=self.input_source,
+        )
         self.enemies = []
         self.level_complete = False
         self.game_over = False
         self.death_sound_played = False  # 防止死亡音效重複播放
 
         # 計時系統
-        self.start_time = pygame.time.get_ticks()
+        self.start_time = self.clock.get_ticks()
         self.completion_time = None
         self.level_completed_saved = False  # 確保只保存一次
+        # 本次挑戰擊敗的敵人數（隨快照倒流，關卡結束時才計入存檔）
+        self.enemies_defeated = 0
 
         # 平台系統
         self.platform_system = PlatformSystem()
         self.player.platform_system = self.platform_system
 
+        # 關卡共用的投射物管理器
+        self.projectile_manager = ProjectileManager()
+
+        # 戰鬥碰撞管線
+        self.collision_system = CollisionSystem()
+        self._fist_hit_enemy = False
+        self._setup_collisions()
+
         # UI 字體 - 使用支援中文的字體
         self.font_large = get_font("large")
         self.font_medium = get_font("medium")
         self.font_small = get_font("small")
 
         # 血量道具生成器
-        self.health_item_spawner = HealthItemSpawner()
+        self.health_item_spawner = HealthItemSpawner(clock=self.clock, rng=self.rng)
 
         # 關卡設定
         self._setup_level()
 
+        # 時光倒流（需在關卡設定完成後建立，以設定時的敵人順序編號）
+        self.world_snapshotter = WorldSnapshotter(self)
+        self.rewind_buffer = RewindBuffer() if REWIND_ENABLED else None
+
+        # 關卡開始時的狀態，重新開始時直接還原，不重建玩家、敵人與平台
+        self.initial_state = self.world_snapshotter.capture()
+
+        # 繪製插值（記錄每個模擬步長開始前的位置）
+        self.interpolator = RenderInterpolator()
+        # 繪製使用的粒子系統（繪製快照會換成凍結的副本）
+        self.particle_system = particle_system
+
+        # 通知輸入來源關卡已開始（錄製與重播以此對齊步長）
+        self.player.input_source.on_level_start(self.level_number, self.seed)
+
+    def _setup_collisions(self):
+        """註冊戰鬥碰撞處理函式（依原本的檢查順序）"""
+        collisions = self.collision_system
+        collisions.add_handler(LAYER_FIST, LAYER_ENEMY, self._on_fist_hit_enemy)
+        collisions.add_stage(self._finish_fist_hits)
+        collisions.add_handler(
+            LAYER_FIST, LAYER_ENEMY_PROJECTILE, self._on_fist_hit_projectile
+        )
+        collisions.add_handler(LAYER_PLAYER, LAYER_ENEMY, self._on_slide_hit_enemy)
+        collisions.add_handler(
+            LAYER_PLAYER, LAYER_ENEMY_PROJECTILE, self._on_projectile_hit_player
+        )
+
+    def _add_enemy(self, enemy):
+        """將敵人加入關卡並注入關卡共用的系統"""
+        enemy.platform_system = self.platform_system
+        enemy.projectile_manager = self.projectile_manager
+        enemy.rng = self.rng
+        self.enemies.append(enemy)
+
     def _setup_level(self):
         """設定關卡內容"""
         if self.level_number == LEVEL_1:
@@ -54,9 +136,8 @@ class GameLevel:
             self.background_color = (50, 100, 50)  # 綠色
 
             # 添加敵人
-            enemy = TrainingDummy(500, GROUND_Y - DUMMY_HEIGHT)
-            enemy.platform_system = self.platform_system
-            self.enemies.append(enemy)
+            enemy = TrainingDummy(500, GROUND_Y - DUMMY_HEIGHT, clock=self.clock)
+            self._add_enemy(enemy)
 
             # 添加簡單的平台
             self.platform_system.add_platform(300, GROUND_Y - 120, 150, 20)
@@ -70,14 +151,14 @@ class GameLevel:
             # 添加混合敵人類型
             # 2個小機器人
             for i in range(2):
-                enemy = SmallRobot(400 + i * 180, GROUND_Y - SMALL_ROBOT_HEIGHT)
-                enemy.platform_system = self.platform_system
-                self.enemies.append(enemy)
+                enemy = SmallRobot(
+                    400 + i * 180, GROUND_Y - SMALL_ROBOT_HEIGHT, clock=self.clock
+                )
+                self._add_enemy(enemy)
 
             # 1個精英機甲兵
-            elite_enemy = EliteMech(650, GROUND_Y - 70)
-            elite_enemy.platform_system = self.platform_system
-            self.enemies.append(elite_enemy)
+            elite_enemy = EliteMech(650, GROUND_Y - 70, clock=self.clock)
+            self._add_enemy(elite_enemy)
 
             # 添加更多平台，創造更複雜的戰鬥環境
             self.platform_system.add_platform(200, GROUND_Y - 100, 100, 20)
@@ -129,9 +210,8 @@ class GameLevel:
                     )  # 在250寬度150的平台中央
                     mage_y = second_high_platform_y - MAGE_ROBOT_HEIGHT
 
-                mage = MageRobot(mage_x, mage_y)
-                mage.platform_system = self.platform_system
-                self.enemies.append(mage)
+                mage = MageRobot(mage_x, mage_y, clock=self.clock)
+                self._add_enemy(mage)
 
         elif self.level_number == LEVEL_3:
             # 第三關：實驗室（BOSS）
@@ -139,9 +219,8 @@ class GameLevel:
             self.background_color = (80, 50, 100)  # 紫色
 
             # 添加BOSS
-            boss = GiantRobot(600, GROUND_Y - BOSS_HEIGHT)
-            boss.platform_system = self.platform_system
-            self.enemies.append(boss)
+            boss = GiantRobot(600, GROUND_Y - BOSS_HEIGHT, clock=self.clock)
+            self._add_enemy(boss)
 
             # BOSS戰場地，增加更多平台提供豐富的戰術走位選擇
             # 左側低平台
@@ -164,14 +243,16 @@ class GameLevel:
 
     def handle_event(self, event):
         """處理關卡事件"""
-        # 將事件傳遞給玩家
+        # 將事件傳遞給玩家，並讓輸入來源記錄送達關卡的事件
         if self.player:
+            self.player.input_source.observe_event(event)
             self.player.handle_event(event)
 
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_ESCAPE:
                 # 返回主選單時恢復背景音樂音量
                 sound_manager.restore_bgm_volume()
+                self._save_enemy_defeats()
                 self.state_manager.return_to_menu()
             elif event.key == pygame.K_q:
                 # 處理Q鍵：反擊或清屏技能
@@ -187,9 +268,12 @@ class GameLevel:
                     # 執行清屏技能
                     if self.player.activate_clear_screen_skill():
                         self._execute_clear_screen_skill()
+            elif event.key == pygame.K_BACKSPACE:
+                # 時光倒流（遊戲結束後也可以倒流回死亡之前）
+                self.rewind()
             elif event.key == pygame.K_r and (self.game_over or self.level_complete):
                 # 重新開始關卡
-                self.__init__(self.state_manager, self.level_number)
+                self.restart()
             elif event.key == pygame.K_RETURN and self.level_complete:
                 # 進入下一關
                 if self.level_number == LEVEL_2:
@@ -211,24 +295,43 @@ class GameLevel:
                 sound_manager.restore_bgm_volume()
                 self.state_manager.change_state(LEVEL_SELECT_STATE)
 
+    def _interpolated_entities(self):
+        """繪製時需要插值位置的實體"""
+        player = self.player
+        return [player, player.left_fist, player.right_fist] + (
+            self.enemies + self.projectile_manager.active
+        )
+
     def update(self):
         """更新關卡邏輯"""
+        # 記錄本步長開始前的位置，供繪製插值使用
+        self.interpolator.capture(self._interpolated_entities())
+        frame_profiler.lap("update.interpolation")
+
         if self.game_over or self.level_complete:
             # 即使遊戲結束也要更新粒子系統
             particle_system.update()
+            frame_profiler.lap("update.particles")
             return
 
         # 更新粒子系統
         particle_system.update()
+        frame_profiler.lap("update.particles")
+
+        # 記錄時光倒流快照（本步長更新前的狀態）
+        self._record_rewind_snapshot()
+        frame_profiler.lap("update.rewind")
 
         # 更新玩家
         self.player.update()
+        frame_profiler.lap("update.player")
 
         # 更新血量道具系統
         self.health_item_spawner.update(self.platform_system)
 
         # 檢查道具拾取
         self.health_item_spawner.check_collection(self.player)
+        frame_profiler.lap("update.items")
 
         # 檢查玩家生命值
         if self.player.health <= 0:
@@ -243,6 +346,9 @@ class GameLevel:
                         self.death_sound_played = True
                     except ImportError:
                         pass
+
+                # 玩家暫時無法操作，趁機完整回收遊玩中累積的物件
+                gc_policy.at_pause(PAUSE_GAME_OVER)
             return
 
         # 更新敵人
@@ -250,31 +356,25 @@ class GameLevel:
             if enemy.alive:
                 enemy.update(self.player)
             else:
-                # 敵人死亡時更新統計
-                save_system.add_enemy_defeat()
+                # 敵人死亡時更新統計，並回收它發射的投射物
+                self.enemies_defeated += 1
+                self.projectile_manager.despawn_owner(enemy)
                 self.enemies.remove(enemy)
+        frame_profiler.lap("update.enemies")
 
-        # 檢查拳頭攻擊敵人
-        self._check_fist_collisions()
-
-        # 檢查拳頭打掉追蹤子彈
-        self._check_fist_bullet_collisions()
-
-        # 檢查滑行攻擊
-        self.player.check_slide_attack(self.enemies)
+        # 更新所有敵人的投射物
+        self.projectile_manager.update()
+        frame_profiler.lap("update.projectiles")
 
-        # 檢查 BOSS 子彈攻擊玩家
-        self._check_bullet_collisions()
-
-        # 檢查法師機器人子彈碰撞
-        self._check_mage_bullet_collisions()
+        # 檢查拳頭、滑行攻擊與敵方子彈的碰撞
+        self._check_combat_collisions()
 
         # 檢查關卡完成條件
         if not self.enemies:  # 所有敵人都被擊敗
             if not self.level_complete:
                 self.level_complete = True
                 self.completion_time = (
-                    pygame.time.get_ticks() - self.start_time
+                    self.clock.get_ticks() - self.start_time
                 ) / 1000.0  # 轉換為秒
 
                 # 添加關卡完成特效
@@ -286,208 +386,188 @@ class GameLevel:
 
                 # 保存關卡完成進度（只保存一次）
                 if not self.level_completed_saved:
+                    self._save_enemy_defeats()
                     save_system.complete_level(
                         self.level_number, self.completion_time, self.player.health
                     )
                     self.level_completed_saved = True
 
-    def _check_fist_collisions(self):
-        """檢查拳頭與敵人的碰撞"""
-        hit_enemy = False
+                gc_policy.at_pause(PAUSE_LEVEL_COMPLETE)
 
-        for enemy in self.enemies:
-            if not enemy.alive:
-                continue
-
-            # 檢查左拳碰撞
-            if (
-                self.player.left_fist.is_attacking
-                and not self.player.left_fist.returning
-                and self.player.left_fist.get_rect().colliderect(enemy.get_rect())
-            ):
-                # 計算傷害和效果
-                base_damage = (
-                    CHARGE_DAMAGE_MULTIPLIER if self.player.left_fist.is_charged else 1
-                )
+    def restart(self):
+        """
+        重新開始關卡：就地還原關卡開始時的快照，沿用現有的物件、平台索引與字體
 
-                # 應用連擊傷害倍數
-                damage_multiplier = self.player.get_combo_damage_multiplier()
-                final_damage = int(base_damage * damage_multiplier)
+        遊戲時間退回到關卡開始時，冷卻與計時器與第一次開始時相同；
+        亂數串流以管理器的種子重新設定（未指定時重新產生）
+        """
+        self._save_enemy_defeats()  # 上一次挑戰到此結束
+        self.world_snapshotter.restore(self.initial_state)
+        self.seed = self.rng.seed(self.state_manager.seed)
+        if self.rewind_buffer is not None:
+            self.rewind_buffer.clear()
+        self.interpolator.reset()
 
-                # 空中攻擊傷害加成
-                if self.player.left_fist.is_air_attack:
-                    final_damage = int(final_damage * AIR_ATTACK_DAMAGE_MULTIPLIER)
+        # 通知輸入來源關卡已重新開始
+        self.player.input_source.on_level_start(self.level_number, self.seed)
 
-                knockback = self.player.left_fist.is_charged
-                stun = self.player.left_fist.is_charged  # 只有蓄力攻擊造成眩暈
+        memory_report.checkpoint(CHECKPOINT_LEVEL_RESTART, f"關卡 {self.level_number}")
 
-                # 傳遞左拳位置作為攻擊源
-                enemy.take_damage(
-                    final_damage, knockback, stun, source_x=self.player.left_fist.x
-                )
+    def _save_enemy_defeats(self):
+        """
+        將本次挑戰擊敗的敵人數計入存檔（關卡完成、重新開始或離開關卡時呼叫）
 
-                # 播放攻擊音效
-                try:
-                    from systems.sound_manager import sound_manager
+        時光倒流會還原這個計數，倒流後再次擊敗同一個敵人不會重複計入
+        """
+        if self.enemies_defeated:
+            save_system.add_enemy_defeat(self.enemies_defeated)
+            self.enemies_defeated = 0
 
-                    sound_manager.play_hit_sound(
-                        is_charged=self.player.left_fist.is_charged
-                    )
-                except ImportError:
-                    pass
-
-                # 添加擊中特效
-                hit_x = enemy.x + enemy.width // 2
-                hit_y = enemy.y + enemy.height // 2
-                is_charged = self.player.left_fist.is_charged
-                particle_system.create_hit_effect(hit_x, hit_y, is_charged)
-
-                # 添加傷害數字特效
-                is_critical = damage_multiplier > 1.0 or final_damage > base_damage
-                particle_system.create_damage_text(
-                    hit_x, hit_y - 20, final_damage, is_critical
-                )
+    def _record_rewind_snapshot(self):
+        """每隔固定步數將世界快照存入時光倒流緩衝區"""
+        if self.rewind_buffer is None:
+            return
+        tick = self.clock.sim_tick
+        if tick % REWIND_SNAPSHOT_INTERVAL == 0:
+            self.rewind_buffer.push(tick, self.world_snapshotter.capture())
+
+    def rewind(self, steps=REWIND_STEP_SNAPSHOTS):
+        """
+        退回到數個快照之前的狀態
+
+        Args:
+            steps (int): 從最新快照往前退回的快照數量
+
+        Returns:
+            bool: 是否成功倒流
+        """
+        if self.rewind_buffer is None or self.level_complete:
+            return False
+
+        result = self.rewind_buffer.rewind(steps)
+        if result is None:
+            return False
+
+        _, state = result
+        self.world_snapshotter.restore(state)
+        self.interpolator.reset()
+        particle_system.clear_all()  # 特效不在快照中，避免殘留未來的特效
+        return True
+
+    def _check_combat_collisions(self):
+        """收集本幀所有碰撞框並分派戰鬥碰撞"""
+        collisions = self.collision_system
+        collisions.begin_frame()
+
+        player = self.player
+        collisions.add(LAYER_PLAYER, player, player.get_rect())
+        for fist in (player.left_fist, player.right_fist):
+            if fist.is_attacking and not fist.returning:
+                collisions.add(LAYER_FIST, fist, fist.get_rect())
 
-                self.player.left_fist.returning = True  # 拳頭立即返回
-                hit_enemy = True
-
-            # 檢查右拳碰撞
-            if (
-                self.player.right_fist.is_attacking
-                and not self.player.right_fist.returning
-                and self.player.right_fist.get_rect().colliderect(enemy.get_rect())
-            ):
-                # 計算傷害和效果
-                base_damage = (
-                    CHARGE_DAMAGE_MULTIPLIER if self.player.right_fist.is_charged else 1
-                )
+        for enemy in self.enemies:
+            if enemy.alive:
+                collisions.add(LAYER_ENEMY, enemy, enemy.get_rect())
+        for projectile in self.projectile_manager.active:
+            collisions.add(LAYER_ENEMY_PROJECTILE, projectile, projectile.get_rect())
+        frame_profiler.lap("update.collision.collect")
+
+        self._fist_hit_enemy = False
+        collisions.dispatch(
+            self._profile_collision_pass if frame_profiler.active else None
+        )
 
-                # 應用連擊傷害倍數
-                damage_multiplier = self.player.get_combo_damage_multiplier()
-                final_damage = int(base_damage * damage_multiplier)
+        # 特殊處理：導彈的追蹤更新
+        for missile in self.projectile_manager.iter_type(MissileBullet):
+            if missile.tracking:
+                missile.update(player)  # 傳入玩家以供追蹤
+        frame_profiler.lap("update.missile_tracking")
 
-                # 空中攻擊傷害加成
-                if self.player.right_fist.is_air_attack:
-                    final_damage = int(final_damage * AIR_ATTACK_DAMAGE_MULTIPLIER)
+    def _profile_collision_pass(self, source_layer, target_layer):
+        """記錄每組碰撞配對的耗時（只在幀分析啟用時傳給碰撞系統）"""
+        frame_profiler.lap(f"update.collision.{source_layer}>{target_layer}")
 
-                knockback = self.player.right_fist.is_charged
-                stun = self.player.right_fist.is_charged  # 只有蓄力攻擊造成眩暈
+    def _on_fist_hit_enemy(self, fist, enemy):
+        """拳頭擊中敵人"""
+        if fist.returning:
+            return  # 這一拳已經擊中較前面的敵人
 
-                # 傳遞右拳位置作為攻擊源
-                enemy.take_damage(
-                    final_damage, knockback, stun, source_x=self.player.right_fist.x
-                )
+        # 計算傷害和效果
+        base_damage = CHARGE_DAMAGE_MULTIPLIER if fist.is_charged else 1
 
-                # 播放攻擊音效
-                try:
-                    from systems.sound_manager import sound_manager
+        # 應用連擊傷害倍數
+        damage_multiplier = self.player.get_combo_damage_multiplier()
+        final_damage = int(base_damage * damage_multiplier)
 
-                    sound_manager.play_hit_sound(
-                        is_charged=self.player.right_fist.is_charged
-                    )
-                except ImportError:
-                    pass
-
-                # 添加擊中特效
-                hit_x = enemy.x + enemy.width // 2
-                hit_y = enemy.y + enemy.height // 2
-                is_charged = self.player.right_fist.is_charged
-                particle_system.create_hit_effect(hit_x, hit_y, is_charged)
-
-                # 添加傷害數字特效
-                is_critical = damage_multiplier > 1.0 or final_damage > base_damage
-                particle_system.create_damage_text(
-                    hit_x, hit_y - 20, final_damage, is_critical
-                )
+        # 空中攻擊傷害加成
+        if fist.is_air_attack:
+            final_damage = int(final_damage * AIR_ATTACK_DAMAGE_MULTIPLIER)
+
+        knockback = fist.is_charged
+        stun = fist.is_charged  # 只有蓄力攻擊造成眩暈
+
+        # 傳遞拳頭位置作為攻擊源
+        enemy.take_damage(final_damage, knockback, stun, source_x=fist.x)
+
+        # 播放攻擊音效
+        sound_manager.play_hit_sound(is_charged=fist.is_charged)
+
+        # 添加擊中特效
+        hit_x = enemy.x + enemy.width // 2
+        hit_y = enemy.y + enemy.height // 2
+        particle_system.create_hit_effect(hit_x, hit_y, fist.is_charged)
+
+        # 添加傷害數字特效
+        is_critical = damage_multiplier > 1.0 or final_damage > base_damage
+        particle_system.create_damage_text(hit_x, hit_y - 20, final_damage, is_critical)
 
-                self.player.right_fist.returning = True  # 拳頭立即返回
-                hit_enemy = True
+        fist.returning = True  # 拳頭立即返回
+        self._fist_hit_enemy = True
 
-        # 更新連擊系統
-        self.player.update_combo_system(hit_enemy)
+    def _finish_fist_hits(self):
+        """拳頭攻擊結算後更新連擊系統"""
+        self.player.update_combo_system(self._fist_hit_enemy)
 
         # 如果擊中敵人且連擊數達到閾值，添加連擊特效
-        if hit_enemy and self.player.combo_count >= COMBO_EFFECT_THRESHOLD:
+        if self._fist_hit_enemy and self.player.combo_count >= COMBO_EFFECT_THRESHOLD:
             player_center_x = self.player.x + self.player.width // 2
             player_center_y = self.player.y + self.player.height // 2
             particle_system.create_combo_effect(
                 player_center_x, player_center_y, self.player.combo_count
             )
 
-    def _check_fist_bullet_collisions(self):
-        """檢查拳頭是否打掉追蹤子彈"""
-        for enemy in self.enemies:
-            if hasattr(enemy, "bullets") and isinstance(enemy, MageRobot):
-                for bullet in enemy.bullets[:]:
-                    # 檢查左拳碰撞
-                    if (
-                        self.player.left_fist.is_attacking
-                        and not self.player.left_fist.returning
-                        and self.player.left_fist.get_rect().colliderect(
-                            bullet.get_rect()
-                        )
-                    ):
-                        enemy.bullets.remove(bullet)
-                        # 拳頭打掉子彈不需要返回
-
-                    # 檢查右拳碰撞
-                    elif (
-                        self.player.right_fist.is_attacking
-                        and not self.player.right_fist.returning
-                        and self.player.right_fist.get_rect().colliderect(
-                            bullet.get_rect()
-                        )
-                    ):
-                        enemy.bullets.remove(bullet)
-                        # 拳頭打掉子彈不需要返回
+    def _on_fist_hit_projectile(self, fist, bullet):
+        """拳頭打掉可被擊落的子彈（法師機器人的追蹤子彈）"""
+        if fist.returning or not bullet.destructible or not bullet.alive:
+            return
 
-    def _check_bullet_collisions(self):
-        """檢查 BOSS 子彈與玩家的碰撞"""
-        for enemy in self.enemies:
-            if hasattr(enemy, "bullets"):  # 檢查敵人是否有子彈（主要是 BOSS）
-                for bullet in enemy.bullets[:]:
-                    if bullet.get_rect().colliderect(self.player.get_rect()):
-                        # 對於雷射光束等持續性攻擊，確保只觸發一次傷害
-                        if hasattr(bullet, "damage_dealt") and bullet.damage_dealt:
-                            continue  # 已經造成過傷害，跳過
-
-                        # 子彈擊中玩家
-                        if self.player.is_defending:
-                            # 玩家防禦成功，所有子彈攻擊都被格擋
-                            # 防禦可以完全格擋所有類型的攻擊，包括雷射光束
-                            pass  # 防禦成功，不造成任何傷害
-                        else:
-                            # 玩家受到傷害
-                            self.player.take_damage()
-
-                        # 標記雷射光束等持續性攻擊已處理
-                        if hasattr(bullet, "damage_dealt"):
-                            bullet.damage_dealt = True
-
-                        # 移除子彈（除了雷射光束等持續性攻擊）
-                        if not (hasattr(bullet, "width") and bullet.width > 10):
-                            enemy.bullets.remove(bullet)
-
-                    # 特殊處理：導彈的追蹤更新
-                    if hasattr(bullet, "tracking") and bullet.tracking:
-                        bullet.update(self.player)  # 傳入玩家以供追蹤
-
-    def _check_mage_bullet_collisions(self):
-        """檢查法師機器人追蹤子彈與玩家的碰撞"""
-        for enemy in self.enemies:
-            if hasattr(enemy, "bullets") and isinstance(enemy, MageRobot):
-                for bullet in enemy.bullets[:]:
-                    if bullet.get_rect().colliderect(self.player.get_rect()):
-                        # 子彈擊中玩家
-                        if self.player.is_defending:
-                            # 玩家防禦成功
-                            pass
-                        else:
-                            # 玩家受到傷害
-                            self.player.take_damage()
-
-                        # 移除子彈
-                        enemy.bullets.remove(bullet)
+        self.projectile_manager.despawn(bullet)
+        # 拳頭打掉子彈不需要返回
+
+    def _on_slide_hit_enemy(self, player, enemy):
+        """滑行攻擊擊中敵人"""
+        if player.is_sliding and enemy.alive:
+            player.apply_slide_hit(enemy)
+
+    def _on_projectile_hit_player(self, player, bullet):
+        """敵方子彈擊中玩家"""
+        if not bullet.alive:
+            return  # 已被拳頭打掉
+
+        # 對於雷射光束等持續性攻擊，確保只觸發一次傷害
+        if bullet.persistent and bullet.damage_dealt:
+            return
+
+        # 防禦可以完全格擋所有類型的攻擊，包括雷射光束
+        if not player.is_defending:
+            player.take_damage()
+
+        if bullet.persistent:
+            # 標記雷射光束等持續性攻擊已處理
+            bullet.damage_dealt = True
+        else:
+            # 移除子彈（雷射光束等持續性攻擊除外）
+            self.projectile_manager.despawn(bullet)
 
     def _execute_clear_screen_skill(self):
         """執行清屏技能效果"""
@@ -506,36 +586,22 @@ class GameLevel:
         particle_system.create_clear_screen_effect(player_center_x, player_center_y)
 
         # 清除所有類型的子彈（包括法師機器人的追蹤子彈）
-        for enemy in self.enemies:
-            if hasattr(enemy, "bullets"):
-                # 為被清除的每個子彈創建消散特效
-                for bullet in enemy.bullets:
-                    try:
-                        bullet_x = getattr(bullet, "x", player_center_x)
-                        bullet_y = getattr(bullet, "y", player_center_y)
-                        # 創建子彈消散特效
-                        for _ in range(8):
-                            angle = random.uniform(0, 2 * math.pi)
-                            speed = random.uniform(3, 8)
-                            vel_x = math.cos(angle) * speed
-                            vel_y = math.sin(angle) * speed
-                            from ..systems.particle_system import Particle
-
-                            particle = Particle(
-                                bullet_x,
-                                bullet_y,
-                                vel_x,
-                                vel_y,
-                                (255, 255, 255),
-                                3,
-                                30,
-                                gravity=0,
-                            )
-                            particle_system.add_particle(particle)
-                    except:
-                        pass  # 如果獲取子彈位置失敗就跳過特效
-
-                enemy.bullets.clear()
+        # 為被清除的每個子彈創建消散特效
+        rng = self.rng.effects
+        for bullet in self.projectile_manager:
+            bullet_x = bullet.x
+            bullet_y = bullet.y
+            # 創建子彈消散特效（子彈很多時依畫質減少粒子）
+            for _ in range(quality_governor.scale_count(8)):
+                angle = rng.uniform(0, 2 * math.pi)
+                speed = rng.uniform(3, 8)
+                vel_x = math.cos(angle) * speed
+                vel_y = math.sin(angle) * speed
+                particle_system.spawn_particle(
+                    bullet_x, bullet_y, vel_x, vel_y, (255, 255, 255), 3, 30, gravity=0
+                )
+
+        self.projectile_manager.clear()
 
         # 擊退所有在範圍內的敵人
         for enemy in self.enemies:
@@ -551,7 +617,7 @@ class GameLevel:
                 if distance <= CLEAR_SCREEN_RANGE:
                     # 應用強力擊退
                     enemy.knockback = True
-                    enemy.knockback_start_time = pygame.time.get_ticks()
+                    enemy.knockback_start_time = self.clock.get_ticks()
 
                     # 計算擊退方向（遠離玩家中心）
                     if distance > 0:
@@ -567,14 +633,20 @@ class GameLevel:
                         enemy.on_ground = False
                     else:
                         # 如果距離為0，隨機擊退方向
-                        enemy.knockback_vel_x = random.choice(
+                        enemy.knockback_vel_x = self.rng.gameplay.choice(
                             [-CLEAR_SCREEN_KNOCKBACK, CLEAR_SCREEN_KNOCKBACK]
                         )
                         enemy.vel_y = -8
                         enemy.on_ground = False
 
-    def draw(self, screen):
-        """繪製關卡"""
+    def draw(self, screen, blend=1.0):
+        """
+        繪製關卡
+
+        Args:
+            screen (pygame.Surface): 繪製目標
+            blend (float): 繪製插值係數，0.0 為上一個模擬步長、1.0 為目前的狀態
+        """
         # 繪製背景
         screen.fill(self.background_color)
 
@@ -582,26 +654,39 @@ class GameLevel:
         pygame.draw.rect(
             screen, BROWN, (0, GROUND_Y, WINDOW_WIDTH, WINDOW_HEIGHT - GROUND_Y)
         )
+        frame_profiler.lap("draw.background")
 
         # 繪製平台
         self.platform_system.draw(screen)
+        frame_profiler.lap("draw.platforms")
 
-        # 繪製玩家
-        self.player.draw(screen)
+        # 繪製會移動的實體（以前後兩步的位置插值）
+        with self.interpolator.interpolate(self._interpolated_entities(), blend):
+            # 繪製玩家
+            self.player.draw(screen)
+            frame_profiler.lap("draw.player")
 
-        # 繪製敵人
-        for enemy in self.enemies:
-            if enemy.alive:
-                enemy.draw(screen)
+            # 繪製敵人
+            for enemy in self.enemies:
+                if enemy.alive:
+                    enemy.draw(screen)
+            frame_profiler.lap("draw.enemies")
+
+            # 繪製敵人的投射物
+            self.projectile_manager.draw(screen)
+            frame_profiler.lap("draw.projectiles")
 
         # 繪製血量道具
         self.health_item_spawner.draw(screen)
+        frame_profiler.lap("draw.items")
 
         # 繪製粒子特效系統
-        particle_system.draw(screen)
+        self.particle_system.draw(screen, blend)
+        frame_profiler.lap("draw.particles")
 
         # 繪製UI
         self._draw_ui(screen)
+        frame_profiler.lap("draw.ui")
 
         # 繪製遊戲狀態提示
         if self.game_over:
@@ -646,7 +731,7 @@ class GameLevel:
                 screen.blit(multiplier_text, (10, 150))
 
         # 反擊系統顯示
-        current_time = pygame.time.get_ticks()
+        current_time = self.clock.get_ticks()
         if self.player.counter_attack_ready:
             remaining_time = (
                 self.player.counter_attack_window
@@ -664,12 +749,12 @@ class GameLevel:
             defense_text = self.font_small.render("防禦中", True, BLUE)
             screen.blit(defense_text, (10, 180))
         elif (
-            pygame.time.get_ticks() - self.player.defense_cooldown_start
+            self.clock.get_ticks() - self.player.defense_cooldown_start
             < DEFENSE_COOLDOWN
         ):
             cooldown_remaining = (
                 DEFENSE_COOLDOWN
-                - (pygame.time.get_ticks() - self.player.defense_cooldown_start)
+                - (self.clock.get_ticks() - self.player.defense_cooldown_start)
             ) / 1000
             cooldown_text = self.font_small.render(
                 f"防禦冷卻: {cooldown_remaining:.1f}s", True, GRAY
@@ -680,7 +765,7 @@ class GameLevel:
         if not self.player.clear_screen_available:
             clear_cooldown_remaining = (
                 CLEAR_SCREEN_COOLDOWN
-                - (pygame.time.get_ticks() - self.player.clear_screen_cooldown_start)
+                - (self.clock.get_ticks() - self.player.clear_screen_cooldown_start)
             ) / 1000
             clear_text = self.font_small.render(
                 f"清屏技能冷卻: {clear_cooldown_remaining:.1f}s", True, (255, 165, 0)
@@ -704,6 +789,8 @@ class GameLevel:
             "Shift: 蹲下/滑行",
             "ESC: 返回選單",
         ]
+        if self.rewind_buffer is not None:
+            controls.insert(-1, "Backspace: 時光倒流")
 
         for i, control in enumerate(controls):
             control_text = self.font_small.render(control, True, WHITE)
@@ -3,36 +3,79 @@
 """
 
 from constants import *
+from startup_profiler import startup_profiler
 from states.menu import MainMenu
 from states.game_level import GameLevel
 from states.instructions import InstructionsScreen
 from states.level_select import LevelSelectScreen
 from systems.sound_manager import sound_manager
+from systems.sim_clock import default_clock
+from systems.gc_policy import gc_policy
+from systems.memory_report import memory_report, CHECKPOINT_LEVEL_START, CHECKPOINT_MENU
 
 
 class GameStateManager:
-    def __init__(self):
+    def __init__(self, clock=None, input_source=None, seed=None):
+        self.clock = clock if clock is not None else default_clock  # 模擬時鐘
+        self.input_source = input_source  # 關卡玩家的輸入來源（None 表示即時輸入）
+        self.seed = seed  # 關卡亂數種子（None 表示每次開始關卡都使用新的種子）
         self.current_state = MENU_STATE
+        with startup_profiler.stage("MainMenu"):
+            main_menu = MainMenu(self)
+        with startup_profiler.stage("InstructionsScreen"):
+            instructions = InstructionsScreen(self)
+        with startup_profiler.stage("LevelSelectScreen"):
+            level_select = LevelSelectScreen(self)
         self.states = {
-            MENU_STATE: MainMenu(self),
-            INSTRUCTIONS_STATE: InstructionsScreen(self),
-            LEVEL_SELECT_STATE: LevelSelectScreen(self),
+            MENU_STATE: main_menu,
+            INSTRUCTIONS_STATE: instructions,
+            LEVEL_SELECT_STATE: level_select,
         }
         self.current_level = None
+        # 離開關卡時的回收與記憶體檢查點延到下一次 update() 執行：
+        # 切換狀態的呼叫者（關卡的 handle_event）在返回前仍持有關卡物件
+        self._leave_collect_pending = False
+        self._menu_checkpoint_pending = False
 
     def change_state(self, new_state):
         """切換遊戲狀態"""
+        if self.current_state == GAME_STATE and new_state != GAME_STATE:
+            self._leave_collect_pending = True  # 離開關卡回到選單畫面
         self.current_state = new_state
 
-    def start_level(self, level_number):
-        """開始指定關卡"""
+    def start_level(self, level_number, seed=None):
+        """
+        開始指定關卡
+
+        Args:
+            level_number: 關卡編號
+            seed: 亂數種子（None 表示使用管理器的種子）
+        """
         # 降低背景音樂音量以便聽到遊戲音效
         sound_manager.reduce_bgm_volume_for_gameplay()
 
-        self.current_level = GameLevel(self, level_number)
+        # 離開上一關後還沒執行的回收由關卡開始時的完整回收取代
+        self._leave_collect_pending = False
+        self._menu_checkpoint_pending = False
+
+        self.current_level = GameLevel(
+            self,
+            level_number,
+            self.clock,
+            self.input_source,
+            seed if seed is not None else self.seed,
+        )
         self.states[GAME_STATE] = self.current_level
         self.change_state(GAME_STATE)
 
+        # 關卡載入完成：完整回收後凍結關卡物件，遊玩中改用較高的回收門檻
+        gc_policy.on_level_start()
+        memory_report.checkpoint(
+            CHECKPOINT_LEVEL_START,
+            f"關卡 {level_number}",
+            collected=gc_policy.enabled,
+        )
+
     def return_to_menu(self):
         """返回主選單"""
         # 恢復背景音樂的原始音量
@@ -42,6 +85,17 @@ class GameStateManager:
         if GAME_STATE in self.states:
             del self.states[GAME_STATE]
         self.change_state(MENU_STATE)
+        self._menu_checkpoint_pending = True
+
+    def _after_leaving_level(self):
+        """離開關卡後的第一個步長：關卡物件已釋放，回收並恢復預設的回收設定"""
+        collected = False
+        if self._leave_collect_pending:
+            self._leave_collect_pending = False
+            collected = gc_policy.on_menu()
+        if self._menu_checkpoint_pending:
+            self._menu_checkpoint_pending = False
+            memory_report.checkpoint(CHECKPOINT_MENU, collected=collected)
 
     def handle_event(self, event):
         """處理事件"""
@@ -50,10 +104,20 @@ class GameStateManager:
 
     def update(self):
         """更新當前狀態"""
+        self._after_leaving_level()
         if self.current_state in self.states:
             self.states[self.current_state].update()
+        gc_policy.tick()
 
-    def draw(self, screen):
-        """繪製當前狀態"""
-        if self.current_state in self.states:
+    def draw(self, screen, blend=1.0):
+        """
+        繪製當前狀態
+
+        Args:
+            screen (pygame.Surface): 繪製目標
+            blend (float): 關卡繪製插值係數（1.0 表示直接繪製目前的模擬狀態）
+        """
+        if self.current_state == GAME_STATE and self.current_level is not None:
+            self.current_level.draw(screen, blend)
+        elif self.current_state in self.states:
             self.states[self.current_state].draw(screen)
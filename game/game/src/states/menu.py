@@ -66,8 +66,8 @@ class MainMenu:
         elif self.selected_option == 2:  # 音樂設定
             self.showing_music_menu = True
         elif self.selected_option == 3:  # 退出遊戲
-            pygame.quit()
-            exit()
+            # 交由主迴圈結束遊戲，離開前才能儲存重播並輸出報告
+            pygame.event.post(pygame.event.Event(pygame.QUIT))
 
     def _show_level_select(self):
         """顯示關卡選擇界面"""
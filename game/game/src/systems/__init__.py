@@ -2,6 +2,7 @@
 
 from .platform_system import PlatformSystem
 from .particle_system import particle_system
+from .sprite_cache import sprite_cache
 from .font_manager import get_font
 from .sound_manager import sound_manager
 from .save_system import save_system
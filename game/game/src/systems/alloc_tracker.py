@@ -0,0 +1,279 @@
+"""
+配置追蹤系統 - 統計每幀建立的 Surface、Rect 與 Python 類別實例，並歸屬到呼叫的模組與函式
+結束時輸出依每幀平均排序的報告，找出最值得快取或重複使用物件的程式碼
+"""
+
+import sys
+from collections import Counter
+
+import pygame
+
+from constants import *
+from systems.frame_profiler import frame_profiler
+
+# 配置的種類
+KIND_SURFACE = "surface"
+KIND_RECT = "rect"
+KIND_OBJECT = "object"
+
+# 會返回新 Surface 或 Rect 的 C 函式（以 __qualname__ 比對）
+C_CALL_KINDS = {
+    "Surface.copy": KIND_SURFACE,
+    "Surface.convert": KIND_SURFACE,
+    "Surface.convert_alpha": KIND_SURFACE,
+    "Surface.subsurface": KIND_SURFACE,
+    "Font.render": KIND_SURFACE,
+    "Surface.get_rect": KIND_RECT,
+    "Surface.get_bounding_rect": KIND_RECT,
+    "Surface.blit": KIND_RECT,
+    "Surface.fill": KIND_RECT,
+    "Rect.copy": KIND_RECT,
+    "Rect.move": KIND_RECT,
+    "Rect.inflate": KIND_RECT,
+    "Rect.clip": KIND_RECT,
+    "Rect.union": KIND_RECT,
+    "Rect.clamp": KIND_RECT,
+    "Rect.fit": KIND_RECT,
+}
+
+# 建立 Python 類別實例時由 type.__call__ 呼叫的方法（以 co_name 比對）
+CONSTRUCTOR_NAMES = frozenset(("__new__", "__init__"))
+
+# 整個模組的函式都返回新 Surface 或 Rect 的模組（以 __module__ 比對）
+C_MODULE_KINDS = {
+    "pygame.transform": KIND_SURFACE,
+    "pygame.draw": KIND_RECT,  # 每個繪製函式都返回受影響範圍的 Rect
+}
+
+
+def code_label(code, module):
+    """呼叫位置的名稱：模組:函式（Python 3.11 以前的程式碼物件沒有 co_qualname）"""
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{module.rsplit('.', 1)[-1]}:{name}"
+
+
+class AllocationTracker:
+    """
+    配置追蹤器
+
+    以 sys.setprofile() 監看主執行緒的每一次呼叫：呼叫上表的 C 函式時記錄一次
+    Surface 或 Rect 的建立；pygame.Surface() 與 pygame.Rect() 則在追蹤期間換成
+    會回報的子類別（型別本身的呼叫不會產生 c_call 事件）。Python 物件以
+    __init__ / __new__ 的 call 事件逐次計數並歸屬到建立實例的函式，因此短暫存在
+    的物件也會計入；只包含以 Python 定義建構方法的類別實例，串列、字典等內建
+    型別與沒有定義建構方法的類別不在其中。
+
+    每次呼叫都經過 Python 層的掛鉤，追蹤期間遊戲會明顯變慢，只適合用來比較各處
+    的配置數量，不適合量測耗時。
+    """
+
+    def __init__(self, top=ALLOC_REPORT_TOP):
+        """
+        初始化配置追蹤器
+
+        Args:
+            top (int): 報告中列出的呼叫位置數量
+        """
+        self.top = top
+        self.enabled = False
+
+        self.sites = Counter()  # (程式碼物件, 種類) -> 次數
+        self.modules = {}  # 程式碼物件 -> 模組名稱
+        self.frames = 0
+        self.totals = Counter()  # 種類 -> 總次數
+        self.max_per_frame = Counter()  # 種類 -> 單幀最多次數
+        self._frame_counts = Counter()  # 目前幀的 種類 -> 次數
+
+        # 上一次以 __new__ 計數的建立者（同一個實例的 __init__ 不再計數）
+        self._new_caller = None
+        self._original_types = None
+        # 配置歸屬到呼叫者的追蹤與計時程式碼
+        self._own_codes = {
+            self._on_frame.__code__,
+            self.record.__code__,
+            frame_profiler.begin_frame.__code__,
+            frame_profiler.lap.__code__,
+            frame_profiler.end_frame.__code__,
+        }
+
+    def start(self):
+        """開始追蹤（需在主迴圈所在的執行緒呼叫）"""
+        if self.enabled:
+            return
+        self.enabled = True
+        self._install_types()
+        frame_profiler.listeners.append(self._on_frame)
+        frame_profiler.require("alloc")
+        self._new_caller = None
+        sys.setprofile(self._profile)
+
+    def stop(self):
+        """停止追蹤（保留已累計的結果）"""
+        if not self.enabled:
+            return
+        sys.setprofile(None)
+        self.enabled = False
+        self._restore_types()
+        frame_profiler.release("alloc")
+        if self._on_frame in frame_profiler.listeners:
+            frame_profiler.listeners.remove(self._on_frame)
+
+    def _install_types(self):
+        """將 pygame.Surface 與 pygame.Rect 換成會回報建立位置的子類別"""
+        tracker = self
+        surface_type, rect_type = pygame.Surface, pygame.Rect
+
+        class TrackedSurface(surface_type):
+            def __init__(self, *args, **kwargs):
+                tracker.record(sys._getframe(1), KIND_SURFACE)
+                super().__init__(*args, **kwargs)
+
+        class TrackedRect(rect_type):
+            def __init__(self, *args, **kwargs):
+                tracker.record(sys._getframe(1), KIND_RECT)
+                super().__init__(*args, **kwargs)
+
+        self._own_codes.add(TrackedSurface.__init__.__code__)
+        self._own_codes.add(TrackedRect.__init__.__code__)
+        self._original_types = (surface_type, rect_type)
+        pygame.Surface = TrackedSurface
+        pygame.Rect = TrackedRect
+
+    def _restore_types(self):
+        """恢復原本的 pygame.Surface 與 pygame.Rect"""
+        if self._original_types is not None:
+            pygame.Surface, pygame.Rect = self._original_types
+            self._original_types = None
+
+    def record(self, frame, kind, count=1):
+        """
+        記錄一次配置
+
+        Args:
+            frame (frame): 進行配置的 Python 堆疊幀
+            kind (str): 配置的種類（KIND_* 常數）
+            count (int): 次數
+        """
+        code = frame.f_code
+        if code not in self.modules:
+            self.modules[code] = frame.f_globals.get("__name__", "?")
+        self.sites[code, kind] += count
+        self._frame_counts[kind] += count
+
+    def _profile(self, frame, event, arg):
+        """sys.setprofile 的掛鉤"""
+        if event == "call":
+            self._count_instance(frame)
+            return
+        if event != "c_call":
+            return
+        kind = C_CALL_KINDS.get(arg.__qualname__)
+        if kind is None:
+            kind = C_MODULE_KINDS.get(arg.__module__)
+            if kind is None:
+                return
+        self.record(frame, kind)
+
+    def _count_instance(self, frame):
+        """
+        建構方法被呼叫時記錄一個實例，歸屬到建立它的函式
+
+        Args:
+            frame (frame): 剛被呼叫的函式的堆疊幀
+        """
+        code = frame.f_code
+        name = code.co_name
+        if name not in CONSTRUCTOR_NAMES or code in self._own_codes:
+            return
+        owner = frame.f_back
+        if owner is None or owner.f_code.co_name in CONSTRUCTOR_NAMES:
+            return  # super().__init__() 等建構方法之間的呼叫屬於同一個實例
+        if name == "__new__":
+            self._new_caller = owner
+        elif self._new_caller is owner:
+            self._new_caller = None
+            return  # 同一個實例的 __new__ 已經計數
+        else:
+            self._new_caller = None
+        while owner is not None and owner.f_code in self._own_codes:
+            owner = owner.f_back
+        if owner is not None:
+            self.record(owner, KIND_OBJECT)
+
+    def _on_frame(self, frame_index, frame_ms, sections):
+        """幀分析器在每幀結束時呼叫"""
+        self.frames += 1
+        for kind, count in self._frame_counts.items():
+            self.totals[kind] += count
+            if count > self.max_per_frame[kind]:
+                self.max_per_frame[kind] = count
+        self._frame_counts.clear()
+
+    def ranking(self, kinds):
+        """
+        依指定種類的配置總數排序呼叫位置
+
+        Args:
+            kinds (tuple): 要加總的種類
+
+        Returns:
+            list: [(呼叫位置, {種類: 每幀平均}, 合計每幀平均), ...]
+        """
+        frames = self.frames or 1
+        per_site = {}
+        for (code, kind), count in self.sites.items():
+            if kind in kinds:
+                per_site.setdefault(code, Counter())[kind] += count
+
+        rows = []
+        for code, counts in per_site.items():
+            averages = {kind: counts[kind] / frames for kind in kinds}
+            rows.append(
+                (
+                    code_label(code, self.modules[code]),
+                    averages,
+                    sum(averages.values()),
+                )
+            )
+        rows.sort(key=lambda row: -row[2])
+        return rows[: self.top]
+
+    def get_stats(self):
+        """獲取每幀配置的統計資料"""
+        frames = self.frames or 1
+        return {
+            "frames": self.frames,
+            "per_frame": {
+                kind: self.totals[kind] / frames
+                for kind in (KIND_SURFACE, KIND_RECT, KIND_OBJECT)
+            },
+            "max_per_frame": {
+                kind: self.max_per_frame[kind]
+                for kind in (KIND_SURFACE, KIND_RECT, KIND_OBJECT)
+            },
+        }
+
+    def format_report(self):
+        """將追蹤結果轉成報告文字"""
+        stats = self.get_stats()
+        per_frame = stats["per_frame"]
+        peak = stats["max_per_frame"]
+        lines = [
+            f"配置追蹤：{stats['frames']} 幀，每幀平均 "
+            f"Surface {per_frame[KIND_SURFACE]:.1f}（最多 {peak[KIND_SURFACE]}）、"
+            f"Rect {per_frame[KIND_RECT]:.1f}（最多 {peak[KIND_RECT]}）、"
+            f"實例 {per_frame[KIND_OBJECT]:.1f}（最多 {peak[KIND_OBJECT]}）",
+            "  Surface / Rect 建立（每幀平均）：",
+        ]
+        for label, averages, _ in self.ranking((KIND_SURFACE, KIND_RECT)):
+            lines.append(
+                f"    {averages[KIND_SURFACE]:7.2f} {averages[KIND_RECT]:7.2f}  {label}"
+            )
+        lines.append("  Python 類別實例建立（每幀平均）：")
+        for label, _, total in self.ranking((KIND_OBJECT,)):
+            lines.append(f"    {total:9.1f}  {label}")
+        return "\n".join(lines)
+
+
+# 全域配置追蹤器實例
+alloc_tracker = AllocationTracker()
@@ -0,0 +1,137 @@
+"""
+碰撞系統 - 將戰鬥碰撞檢查整合為單一管線
+每幀依圖層收集碰撞框，以 Rect.collidelistall 找出候選配對後分派給處理函式
+"""
+
+# 碰撞圖層
+LAYER_PLAYER = "player"
+LAYER_FIST = "fist"
+LAYER_ENEMY = "enemy"
+LAYER_ENEMY_PROJECTILE = "enemy_projectile"
+
+
+class CollisionLayer:
+    """單一圖層的碰撞框與對應物件（依加入順序）"""
+
+    def __init__(self):
+        self.rects = []
+        self.owners = []
+
+    def add(self, owner, rect):
+        """加入一個碰撞框"""
+        self.owners.append(owner)
+        self.rects.append(rect)
+
+    def clear(self):
+        """清空圖層"""
+        self.rects.clear()
+        self.owners.clear()
+
+    def __len__(self):
+        return len(self.rects)
+
+
+class CollisionSystem:
+    """
+    分層碰撞管線
+
+    處理函式依註冊順序分派，每對圖層只做一次寬相位配對；
+    配對依 (目標圖層順序, 來源圖層順序) 排列，與原本的巢狀迴圈順序一致。
+    處理函式在分派時自行檢查物件狀態（例如拳頭已返回、子彈已被打掉）。
+    """
+
+    def __init__(self):
+        self.layers = {}
+        self.handlers = []  # (來源圖層, 目標圖層, 處理函式)，圖層為 None 表示收尾函式
+
+        # 統計資料（最近一幀）
+        self.pair_count = 0
+
+    def get_layer(self, name):
+        """獲取圖層，不存在時建立"""
+        layer = self.layers.get(name)
+        if layer is None:
+            layer = CollisionLayer()
+            self.layers[name] = layer
+        return layer
+
+    def add_handler(self, source_layer, target_layer, handler):
+        """
+        註冊碰撞處理函式
+
+        Args:
+            source_layer (str): 來源圖層（例如拳頭）
+            target_layer (str): 目標圖層（例如敵人）
+            handler (callable): handler(來源物件, 目標物件)
+        """
+        self.get_layer(source_layer)
+        self.get_layer(target_layer)
+        self.handlers.append((source_layer, target_layer, handler))
+
+    def add_stage(self, callback):
+        """註冊在前後兩組配對之間執行的收尾函式 callback()"""
+        self.handlers.append((None, None, callback))
+
+    def begin_frame(self):
+        """開始新的一幀，清空所有圖層"""
+        for layer in self.layers.values():
+            layer.clear()
+        self.pair_count = 0
+
+    def add(self, layer_name, owner, rect):
+        """將碰撞框加入指定圖層"""
+        self.layers[layer_name].add(owner, rect)
+
+    def find_pairs(self, source_layer, target_layer):
+        """
+        找出兩個圖層之間所有重疊的配對
+
+        以數量較少的圖層逐一對另一圖層呼叫 collidelistall，避免 Python 層的巢狀迴圈
+
+        Returns:
+            list: [(來源物件, 目標物件), ...]，依目標順序再依來源順序排列
+        """
+        source = self.layers[source_layer]
+        target = self.layers[target_layer]
+        if not source.rects or not target.rects:
+            return []
+
+        if len(source) <= len(target):
+            indices = []
+            for source_index, rect in enumerate(source.rects):
+                for target_index in rect.collidelistall(target.rects):
+                    indices.append((target_index, source_index))
+            indices.sort()
+        else:
+            indices = [
+                (target_index, source_index)
+                for target_index, rect in enumerate(target.rects)
+                for source_index in rect.collidelistall(source.rects)
+            ]
+
+        return [
+            (source.owners[source_index], target.owners[target_index])
+            for target_index, source_index in indices
+        ]
+
+    def dispatch(self, on_pass=None):
+        """
+        依註冊順序找出配對並呼叫處理函式
+
+        Args:
+            on_pass (callable): 每組配對（連同其後的收尾函式）處理完後呼叫
+                on_pass(來源圖層, 目標圖層)，用於分別計時
+        """
+        last_pass = None
+        for source_layer, target_layer, handler in self.handlers:
+            if source_layer is None:
+                handler()
+            else:
+                pairs = self.find_pairs(source_layer, target_layer)
+                self.pair_count += len(pairs)
+                for source, target in pairs:
+                    handler(source, target)
+                last_pass = (source_layer, target_layer)
+
+            if on_pass is not None and last_pass is not None:
+                on_pass(*last_pass)
@@ -5,13 +5,16 @@
 import pygame
 import os
 
+from startup_profiler import startup_profiler
+
 
 class FontManager:
     """字體管理器，提供支援繁體中文的字體"""
 
     def __init__(self):
         self.fonts = {}
-        self._init_fonts()
+        with startup_profiler.stage("FontManager._init_fonts"):
+            self._init_fonts()
 
     def _init_fonts(self):
         """初始化字體，優先使用系統中文字體"""
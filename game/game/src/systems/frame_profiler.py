@@ -0,0 +1,249 @@
+"""
+幀分析系統 - 記錄每幀各階段的耗時，提供滾動平均、畫面浮層與 JSON 輸出
+主迴圈與關卡在每個階段結束時呼叫 lap()；沒有任何使用者時 lap() 幾乎沒有成本
+"""
+
+import json
+import time
+from collections import deque
+
+import pygame
+
+from constants import *
+from systems.font_manager import get_font
+
+
+class FrameProfiler:
+    """
+    逐幀階段計時器
+
+    每幀以 begin_frame() 開始、end_frame() 結束，中間每個階段結束時呼叫
+    lap(名稱)，記錄自上一次 lap() 以來的耗時（同一幀內同名的階段會累加，
+    例如補跑多個模擬步長）。最近 window 幀的耗時以累計值維護滾動平均。
+    浮層、卡頓偵測與輸出分析資料等使用者以 require()/release() 啟用計時。
+    """
+
+    def __init__(self, window=PROFILER_WINDOW_FRAMES):
+        """
+        初始化幀分析器
+
+        Args:
+            window (int): 計算滾動平均的幀數
+        """
+        self.window = window
+        self.users = set()  # 需要計時的使用者名稱
+        self.listeners = []  # 每幀結束時呼叫 listener(幀編號, 幀耗時, 各階段耗時)
+        self.count_source = None  # 返回實體數量字典的函式
+
+        self.sections = {}  # 目前幀的階段名稱 -> 毫秒
+        self.frame_index = 0
+        self.frame_start = None  # 目前幀開始的時間（None 表示不在幀內）
+        self._lap_start = 0.0
+
+        # 滾動平均
+        self._history = deque()  # (幀耗時, 各階段耗時)
+        self._totals = {}  # 階段名稱 -> 視窗內的累計毫秒（依第一次出現的順序）
+        self._frame_total = 0.0
+
+        # 浮層
+        self.overlay_visible = False
+        self._overlay_surface = None
+        self._overlay_age = 0
+
+    @property
+    def active(self):
+        """是否有使用者需要計時"""
+        return bool(self.users)
+
+    def require(self, user):
+        """啟用計時（user 為使用者名稱）"""
+        self.users.add(user)
+
+    def release(self, user):
+        """使用者不再需要計時"""
+        self.users.discard(user)
+        if not self.users:
+            self.frame_start = None
+
+    def toggle_overlay(self):
+        """切換畫面浮層"""
+        self.overlay_visible = not self.overlay_visible
+        if self.overlay_visible:
+            self.require("overlay")
+            self._overlay_surface = None
+        else:
+            self.release("overlay")
+
+    def reset(self):
+        """清除滾動平均"""
+        self._history.clear()
+        self._totals = {}
+        self._frame_total = 0.0
+        self._overlay_surface = None
+
+    def begin_frame(self):
+        """開始記錄新的一幀"""
+        if not self.users:
+            return
+        self.frame_index += 1
+        self.sections = {}
+        now = time.perf_counter()
+        self._lap_start = now
+        self.frame_start = now
+
+    def lap(self, name):
+        """
+        結束一個階段，記錄自上一次 lap() 以來的耗時
+
+        Args:
+            name (str): 階段名稱（例如 "update.enemies"、"draw.particles"）
+        """
+        if self.frame_start is None:
+            return
+        now = time.perf_counter()
+        sections = self.sections
+        sections[name] = sections.get(name, 0.0) + (now - self._lap_start) * 1000.0
+        self._lap_start = now
+
+    def end_frame(self):
+        """
+        結束目前的幀並更新滾動平均
+
+        Returns:
+            float: 這一幀的耗時（毫秒），未計時時返回 None
+        """
+        if self.frame_start is None:
+            return None
+
+        frame_ms = (time.perf_counter() - self.frame_start) * 1000.0
+        self.frame_start = None
+        sections = self.sections
+
+        history = self._history
+        totals = self._totals
+        if len(history) >= self.window:
+            old_ms, old_sections = history.popleft()
+            self._frame_total -= old_ms
+            for name, ms in old_sections.items():
+                totals[name] -= ms
+        history.append((frame_ms, sections))
+        self._frame_total += frame_ms
+        for name, ms in sections.items():
+            totals[name] = totals.get(name, 0.0) + ms
+
+        for listener in self.listeners:
+            listener(self.frame_index, frame_ms, sections)
+        return frame_ms
+
+    def averages(self):
+        """
+        最近 window 幀每個階段的平均耗時
+
+        Returns:
+            dict: 階段名稱 -> 平均每幀毫秒（沒有執行該階段的幀以 0 計算）
+        """
+        frames = len(self._history)
+        if not frames:
+            return {}
+        return {name: total / frames for name, total in self._totals.items()}
+
+    def get_counts(self):
+        """目前的實體數量"""
+        if self.count_source is None:
+            return {}
+        return self.count_source()
+
+    def get_stats(self):
+        """獲取滾動平均與實體數量（可序列化為 JSON）"""
+        frames = len(self._history)
+        frame_values = [frame_ms for frame_ms, _ in self._history]
+        return {
+            "frames": frames,
+            "window": self.window,
+            "frame_ms": self._frame_total / frames if frames else 0.0,
+            "max_frame_ms": max(frame_values) if frame_values else 0.0,
+            "sections_ms": self.averages(),
+            "counts": self.get_counts(),
+        }
+
+    def dump(self, path=PROFILER_DUMP_PATH):
+        """
+        將目前的分析資料寫入 JSON 檔
+
+        Returns:
+            dict: 寫入的資料
+        """
+        data = {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "frame_index": self.frame_index,
+        }
+        data.update(self.get_stats())
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        return data
+
+    def draw_overlay(self, screen):
+        """在畫面右下角繪製浮層（每隔數幀才重新繪製文字）"""
+        if not self.overlay_visible:
+            return
+
+        self._overlay_age += 1
+        if (
+            self._overlay_surface is None
+            or self._overlay_age >= PROFILER_OVERLAY_REFRESH_FRAMES
+        ):
+            self._overlay_surface = self._render_overlay()
+            self._overlay_age = 0
+
+        surface = self._overlay_surface
+        screen.blit(
+            surface,
+            (
+                WINDOW_WIDTH - surface.get_width() - 10,
+                WINDOW_HEIGHT - surface.get_height() - 10,
+            ),
+        )
+
+    def _render_overlay(self):
+        """繪製浮層內容（左欄為名稱，右欄為數值）"""
+        font = get_font("tiny")
+        stats = self.get_stats()
+
+        rows = [
+            (
+                f"frame ({stats['frames']} frames, max {stats['max_frame_ms']:.2f})",
+                f"{stats['frame_ms']:.3f}",
+                WHITE,
+            )
+        ]
+        for name, ms in stats["sections_ms"].items():
+            color = RED if ms >= 2.0 else (YELLOW if ms >= 0.5 else WHITE)
+            rows.append((name, f"{ms:.3f}", color))
+        for name, value in stats["counts"].items():
+            if isinstance(value, dict):
+                value = ", ".join(f"{k} {v}" for k, v in value.items()) or "-"
+            rows.append((f"{name}: {value}", "", GREEN))
+
+        rendered = [
+            (font.render(label, True, color), font.render(value, True, color))
+            for label, value, color in rows
+        ]
+        label_width = max(label.get_width() for label, value in rendered if value)
+        value_width = max(value.get_width() for _, value in rendered)
+        width = max(
+            label_width + 16 + value_width,
+            max(label.get_width() for label, _ in rendered),
+        )
+
+        line_height = font.get_linesize()
+        surface = pygame.Surface((width + 12, line_height * len(rendered) + 8))
+        surface.set_alpha(PROFILER_OVERLAY_ALPHA)
+        for i, (label, value) in enumerate(rendered):
+            y = 4 + i * line_height
+            surface.blit(label, (6, y))
+            surface.blit(value, (6 + width - value.get_width(), y))
+        return surface
+
+
+# 全域幀分析器實例
+frame_profiler = FrameProfiler()
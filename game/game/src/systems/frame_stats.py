@@ -0,0 +1,221 @@
+"""
+幀時間報告系統 - 記錄每個關卡遊玩過程中每幀的更新與繪製耗時
+關卡完成或離開關卡時輸出百分位摘要與分布（JSON），並在 CSV 中追加一列摘要
+"""
+
+import csv
+import json
+import os
+import subprocess
+import time
+from array import array
+
+from constants import *
+from systems.frame_profiler import frame_profiler
+from systems.perf_stats import summarize_ms, histogram
+
+# 結束原因
+OUTCOME_COMPLETE = "complete"
+OUTCOME_LEFT = "left"  # 回到選單或進入其他關卡
+OUTCOME_QUIT = "quit"  # 關閉遊戲
+
+CSV_FILENAME = "frame_stats.csv"
+
+
+def get_build_id():
+    """
+    目前程式碼的版本識別（git commit），無法取得時返回 "unknown"
+    """
+    try:
+        result = subprocess.run(
+            ["git", "describe", "--always", "--dirty"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True,
+            text=True,
+            timeout=5,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return "unknown"
+    return result.stdout.strip() if result.returncode == 0 else "unknown"
+
+
+class LevelSession:
+    """單一關卡遊玩過程的幀耗時記錄"""
+
+    def __init__(self, level):
+        self.level = level
+        self.level_number = level.level_number
+        self.seed = level.seed
+        self.started_at = time.time()
+        self.update_ms = array("d")
+        self.draw_ms = array("d")
+        self.frame_ms = array("d")
+
+    def add(self, update_ms, draw_ms, frame_ms):
+        """記錄一幀"""
+        self.update_ms.append(update_ms)
+        self.draw_ms.append(draw_ms)
+        self.frame_ms.append(frame_ms)
+
+    def __len__(self):
+        return len(self.frame_ms)
+
+
+class FrameStatsRecorder:
+    """
+    幀時間報告記錄器
+
+    向幀分析器註冊為每幀的監聽者，以各階段耗時加總出更新（update.*）與繪製
+    （draw.*）耗時。每幀檢查目前的關卡：關卡物件改變時結束前一段記錄並開始新的，
+    關卡完成時立即輸出；遊戲結束後原地重新開始關卡（R）仍屬於同一段記錄，
+    完成後重新開始則是新的一段記錄。
+    """
+
+    def __init__(self, state_manager, output_dir=FRAME_STATS_DIR):
+        """
+        初始化幀時間報告記錄器
+
+        Args:
+            state_manager (GameStateManager): 遊戲狀態管理器
+            output_dir (str): 報告輸出目錄
+        """
+        self.state_manager = state_manager
+        self.output_dir = output_dir
+        self.build_id = get_build_id()
+        self.session = None
+        self._finished_level = None  # 已完成並輸出的關卡（重新開始或離開前不再記錄）
+        self.written = []  # 已輸出的報告路徑
+
+    def start(self):
+        """開始記錄（需在單執行緒的主迴圈中使用）"""
+        frame_profiler.listeners.append(self._on_frame)
+        frame_profiler.require("frame_stats")
+
+    def stop(self):
+        """結束記錄並輸出尚未完成的關卡"""
+        self.finish(OUTCOME_QUIT)
+        frame_profiler.release("frame_stats")
+        if self._on_frame in frame_profiler.listeners:
+            frame_profiler.listeners.remove(self._on_frame)
+
+    def _current_level(self):
+        """目前正在遊玩的關卡（不在關卡中時返回 None）"""
+        manager = self.state_manager
+        if manager.current_state != GAME_STATE:
+            return None
+        return manager.current_level
+
+    def _on_frame(self, frame_index, frame_ms, sections):
+        """幀分析器在每幀結束時呼叫"""
+        level = self._current_level()
+        session = self.session
+
+        if session is not None and session.level is not level:
+            self.finish(OUTCOME_LEFT)
+            session = None
+        if level is not None and level is self._finished_level:
+            if level.level_complete:
+                return
+            # 完成後按 R 原地重新開始（同一個關卡物件），開始新的記錄
+            self._finished_level = None
+        if level is None:
+            return
+        if session is None:
+            session = self.session = LevelSession(level)
+            self._finished_level = None
+
+        update_ms = 0.0
+        draw_ms = 0.0
+        for name, ms in sections.items():
+            if name.startswith("update."):
+                update_ms += ms
+            elif name.startswith("draw."):
+                draw_ms += ms
+        session.add(update_ms, draw_ms, frame_ms)
+
+        if level.level_complete:
+            self.finish(OUTCOME_COMPLETE)
+            self._finished_level = level
+
+    def finish(self, outcome):
+        """
+        結束目前的記錄並輸出報告
+
+        Returns:
+            dict: 報告內容（沒有記錄時返回 None）
+        """
+        session = self.session
+        self.session = None
+        if session is None or not len(session):
+            return None
+
+        report = self.build_report(session, outcome)
+        self.write_report(report)
+        return report
+
+    def build_report(self, session, outcome):
+        """建立一段記錄的報告"""
+        level = session.level
+        frame_ms = list(session.frame_ms)
+        return {
+            "game_version": GAME_VERSION,
+            "build": self.build_id,
+            "level": session.level_number,
+            "seed": session.seed,
+            "outcome": outcome,
+            "game_over": level.game_over,
+            "started_at": time.strftime(
+                "%Y-%m-%dT%H:%M:%S", time.localtime(session.started_at)
+            ),
+            "duration_seconds": time.time() - session.started_at,
+            "frames": len(session),
+            "update": summarize_ms(list(session.update_ms), FRAME_STATS_PERCENTILES),
+            "draw": summarize_ms(list(session.draw_ms), FRAME_STATS_PERCENTILES),
+            "frame": summarize_ms(frame_ms, FRAME_STATS_PERCENTILES),
+            "histogram": {
+                "edges_ms": list(FRAME_STATS_HISTOGRAM_EDGES_MS),
+                "counts": histogram(frame_ms, FRAME_STATS_HISTOGRAM_EDGES_MS),
+            },
+        }
+
+    def write_report(self, report):
+        """將報告寫成 JSON，並在 CSV 中追加一列摘要"""
+        version_dir = os.path.join(self.output_dir, report["game_version"])
+        os.makedirs(version_dir, exist_ok=True)
+
+        stamp = report["started_at"].replace(":", "").replace("-", "")
+        name = f"level_{report['level']}_{stamp}_{report['outcome']}"
+        json_path = os.path.join(version_dir, name + ".json")
+        attempt = 1
+        # 同一秒內開始的多次遊玩（例如完成後立即重新開始）
+        while os.path.exists(json_path):
+            attempt += 1
+            json_path = os.path.join(version_dir, f"{name}_{attempt}.json")
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        self.written.append(json_path)
+
+        row = {
+            key: report[key]
+            for key in (
+                "game_version",
+                "build",
+                "level",
+                "seed",
+                "outcome",
+                "started_at",
+                "frames",
+            )
+        }
+        for stage in ("update", "draw", "frame"):
+            for key in ["mean", "max"] + [f"p{p}" for p in FRAME_STATS_PERCENTILES]:
+                row[f"{stage}_{key}"] = round(report[stage][key], 3)
+
+        csv_path = os.path.join(self.output_dir, CSV_FILENAME)
+        new_file = not os.path.exists(csv_path)
+        with open(csv_path, "a", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(row))
+            if new_file:
+                writer.writeheader()
+            writer.writerow(row)
+        return json_path
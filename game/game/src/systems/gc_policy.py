@@ -0,0 +1,200 @@
+"""
+垃圾回收策略系統 - 把耗時的完整回收移到關卡載入與暫停時執行
+遊玩中提高分代門檻（或停用自動回收），避免第二代回收在戰鬥中造成卡頓
+"""
+
+import gc
+import time
+
+from constants import *
+
+# 暫停回收的時機
+PAUSE_LEVEL_START = "level_start"
+PAUSE_LEVEL_COMPLETE = "level_complete"
+PAUSE_GAME_OVER = "game_over"
+PAUSE_MENU = "menu"
+
+
+class GCPolicy:
+    """
+    垃圾回收策略管理器
+
+    關卡載入後完整回收一次並以 gc.freeze() 把關卡的長期物件移到永久代，
+    之後的回收不再掃描它們；遊玩中使用較高的門檻（或停用自動回收、定期只回收
+    最年輕的一代）；關卡完成、遊戲結束與回到選單等自然的暫停時才完整回收。
+    所有回收（自動與手動）的暫停時間都由 gc.callbacks 記錄，這是唯一的回收計時點，
+    卡頓偵測也從這裡讀取每幀的暫停時間。
+    """
+
+    def __init__(
+        self,
+        enabled=GC_POLICY_ENABLED,
+        play_mode=GC_PLAY_MODE,
+        play_thresholds=GC_PLAY_THRESHOLDS,
+        defer_interval=GC_DEFER_COLLECT_INTERVAL,
+    ):
+        """
+        初始化垃圾回收策略
+
+        Args:
+            enabled (bool): 是否套用策略（停用時只記錄回收的暫停時間）
+            play_mode (str): 遊玩中的策略（"thresholds" 或 "defer"）
+            play_thresholds (tuple): "thresholds" 模式下的分代門檻
+            defer_interval (int): "defer" 模式下回收最年輕一代的間隔（模擬步數）
+        """
+        self.enabled = enabled
+        self.play_mode = play_mode
+        self.play_thresholds = play_thresholds
+        self.defer_interval = defer_interval
+        self.default_thresholds = gc.get_threshold()
+        self.playing = False  # 是否套用遊玩中的回收策略
+        self.in_level = False  # 是否在關卡中（統計暫停時間用，與策略是否啟用無關）
+        self._collecting = False  # 是否正在執行暫停時機的手動回收
+        self._ticks_since_collect = 0
+
+        # 回收暫停的統計（由 gc.callbacks 記錄）
+        self._gc_start = None
+        self._installed = False
+        # 啟動以來的累計回收次數與暫停時間（不受 reset_stats 影響，供卡頓偵測計算每幀差值）
+        self.total_collections = 0
+        self.total_pause_ms = 0.0
+        self.reset_stats()
+
+    def reset_stats(self):
+        """清除回收暫停的統計"""
+        self.collections = {"play": [0, 0, 0], "pause": [0, 0, 0]}  # 各代的回收次數
+        self.pause_ms = {"play": 0.0, "pause": 0.0}
+        self.max_pause_ms = {"play": 0.0, "pause": 0.0}
+        self.collected = 0  # 回收的物件數量
+        self.explicit = {}  # 暫停時機 -> (次數, 累計毫秒)
+
+    def install(self):
+        """開始記錄回收的暫停時間"""
+        if not self._installed:
+            gc.callbacks.append(self._on_gc)
+            self._installed = True
+
+    def uninstall(self):
+        """停止記錄並恢復預設的回收設定"""
+        if self._installed:
+            gc.callbacks.remove(self._on_gc)
+            self._installed = False
+        self._leave_play()
+        gc.unfreeze()
+
+    def on_level_start(self):
+        """關卡載入完成：完整回收、凍結關卡物件並切換到遊玩策略"""
+        self.install()
+        self.in_level = True
+        if not self.enabled:
+            return
+
+        gc.unfreeze()  # 上一關凍結的物件已不再使用，讓這次回收可以釋放它們
+        self._collect(PAUSE_LEVEL_START)
+        gc.freeze()
+        self._enter_play()
+
+    def at_pause(self, reason):
+        """
+        自然的暫停（關卡完成、遊戲結束）：完整回收遊玩中累積的物件
+
+        Args:
+            reason (str): 暫停時機（PAUSE_* 常數）
+        """
+        if not self.enabled:
+            return
+        self._collect(reason)
+
+    def on_menu(self):
+        """
+        回到選單：釋放關卡物件並恢復預設的回收設定（已離開遊玩時不重複回收）
+
+        Returns:
+            bool: 是否執行了完整回收
+        """
+        self.in_level = False
+        if not self.enabled or not self.playing:
+            return False
+        self._leave_play()
+        gc.unfreeze()
+        self._collect(PAUSE_MENU)
+        return True
+
+    def tick(self):
+        """每個模擬步長呼叫一次（"defer" 模式下定期回收最年輕的一代）"""
+        if not self.playing or self.play_mode != "defer":
+            return
+        self._ticks_since_collect += 1
+        if self._ticks_since_collect >= self.defer_interval:
+            self._ticks_since_collect = 0
+            gc.collect(0)
+
+    def _enter_play(self):
+        """切換到遊玩中的回收策略"""
+        self.playing = True
+        self._ticks_since_collect = 0
+        if self.play_mode == "defer":
+            gc.disable()
+        else:
+            gc.set_threshold(*self.play_thresholds)
+
+    def _leave_play(self):
+        """恢復預設的回收策略"""
+        if not self.playing:
+            return
+        self.playing = False
+        gc.set_threshold(*self.default_thresholds)
+        gc.enable()
+
+    def _collect(self, reason):
+        """在暫停時機執行完整回收"""
+        self._collecting = True  # 手動回收計入暫停，不計入遊玩
+        start = time.perf_counter()
+        gc.collect()
+        elapsed_ms = (time.perf_counter() - start) * 1000.0
+        self._collecting = False
+
+        count, total_ms = self.explicit.get(reason, (0, 0.0))
+        self.explicit[reason] = (count + 1, total_ms + elapsed_ms)
+
+    def _on_gc(self, phase, info):
+        """記錄每次回收的暫停時間"""
+        if phase == "start":
+            self._gc_start = time.perf_counter()
+            return
+        if self._gc_start is None:
+            return
+
+        elapsed_ms = (time.perf_counter() - self._gc_start) * 1000.0
+        self._gc_start = None
+        bucket = "play" if self.in_level and not self._collecting else "pause"
+        self.collections[bucket][info["generation"]] += 1
+        self.pause_ms[bucket] += elapsed_ms
+        self.max_pause_ms[bucket] = max(self.max_pause_ms[bucket], elapsed_ms)
+        self.collected += info["collected"]
+        self.total_collections += 1
+        self.total_pause_ms += elapsed_ms
+
+    def get_stats(self):
+        """獲取回收策略與暫停時間的統計資料"""
+        return {
+            "enabled": self.enabled,
+            "play_mode": self.play_mode,
+            "playing": self.playing,
+            "thresholds": gc.get_threshold(),
+            "frozen_objects": gc.get_freeze_count(),
+            "collections": {
+                bucket: list(counts) for bucket, counts in self.collections.items()
+            },
+            "pause_ms": dict(self.pause_ms),
+            "max_pause_ms": dict(self.max_pause_ms),
+            "collected": self.collected,
+            "explicit": {
+                reason: {"count": count, "total_ms": total_ms}
+                for reason, (count, total_ms) in self.explicit.items()
+            },
+        }
+
+
+# 全域垃圾回收策略實例
+gc_policy = GCPolicy()
@@ -0,0 +1,225 @@
+"""
+卡頓偵測系統 - 找出耗時超過門檻的幀，記錄各階段耗時與當下的 Python 堆疊
+預設關閉；各階段的耗時由幀分析器（frame_profiler）記錄
+"""
+
+import logging
+import sys
+import threading
+import time
+import traceback
+from logging.handlers import RotatingFileHandler
+
+from constants import *
+from systems.frame_profiler import frame_profiler
+from systems.gc_policy import gc_policy
+
+
+class HitchDetector:
+    """
+    幀卡頓偵測器
+
+    啟用後向幀分析器註冊，每幀結束時檢查幀耗時。監視執行緒定期檢查目前幀
+    已執行的時間，一旦超過門檻就擷取主執行緒當下的堆疊，因此記錄到的是卡頓
+    發生時正在執行的程式碼。超過門檻的幀連同各階段耗時、GC 暫停與堆疊寫入
+    輪替的記錄檔。
+    """
+
+    def __init__(
+        self,
+        threshold_ms=HITCH_THRESHOLD_MS,
+        sample_interval_ms=HITCH_SAMPLE_INTERVAL_MS,
+        stack_depth=HITCH_STACK_DEPTH,
+    ):
+        """
+        初始化卡頓偵測器
+
+        Args:
+            threshold_ms (float): 單幀耗時超過此值視為卡頓
+            sample_interval_ms (float): 監視執行緒的檢查間隔
+            stack_depth (int): 記錄的堆疊深度
+        """
+        self.threshold_ms = threshold_ms
+        self.sample_interval_ms = sample_interval_ms
+        self.stack_depth = stack_depth
+        self.enabled = False
+        self.log_path = None
+        self.describe = None  # 返回目前遊戲狀態說明的函式（只在卡頓時呼叫）
+
+        # 上一幀結束時垃圾回收策略的累計回收次數與暫停時間（用來計算每幀的差值）
+        self._gc_collections_seen = 0
+        self._gc_ms_seen = 0.0
+
+        # 監視執行緒擷取的堆疊：(幀編號, 擷取時已執行毫秒, 堆疊)
+        self._sample = None
+        self._sample_lock = threading.Lock()
+        self._main_thread_id = None
+        self._watchdog = None
+        self._stop_event = threading.Event()
+
+        self._logger = None
+        self._handler = None
+
+        # 統計資料
+        self.frames = 0
+        self.hitches = 0
+        self.worst_ms = 0.0
+        self.section_hitches = {}  # 階段名稱 -> 成為卡頓幀最慢階段的次數
+
+    def start(self, log_path=HITCH_LOG_PATH, describe=None):
+        """
+        啟用卡頓偵測（需在主迴圈所在的執行緒呼叫）
+
+        Args:
+            log_path (str): 記錄檔路徑
+            describe (callable): 返回目前遊戲狀態說明字串的函式
+        """
+        if self.enabled:
+            return
+
+        self.log_path = log_path
+        self.describe = describe
+        self._handler = RotatingFileHandler(
+            log_path,
+            maxBytes=HITCH_LOG_MAX_BYTES,
+            backupCount=HITCH_LOG_BACKUP_COUNT,
+            encoding="utf-8",
+        )
+        self._handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+        self._logger = logging.getLogger("hitch")
+        self._logger.setLevel(logging.INFO)
+        self._logger.propagate = False
+        self._logger.addHandler(self._handler)
+
+        self._main_thread_id = threading.get_ident()
+        self._stop_event.clear()
+        self._watchdog = threading.Thread(
+            target=self._watch, name="hitch-watchdog", daemon=True
+        )
+        self._watchdog.start()
+        gc_policy.install()  # GC 暫停由垃圾回收策略統一記錄
+        self._gc_collections_seen = gc_policy.total_collections
+        self._gc_ms_seen = gc_policy.total_pause_ms
+        frame_profiler.listeners.append(self._on_frame)
+        frame_profiler.require("hitch")
+        self.enabled = True
+
+    def stop(self):
+        """停用卡頓偵測並關閉記錄檔"""
+        if not self.enabled:
+            return
+
+        self.enabled = False
+        frame_profiler.release("hitch")
+        frame_profiler.listeners.remove(self._on_frame)
+        self._stop_event.set()
+        self._watchdog.join()
+        self._watchdog = None
+        self._logger.removeHandler(self._handler)
+        self._handler.close()
+        self._handler = None
+
+    def _on_frame(self, frame_index, frame_ms, sections):
+        """
+        幀分析器在每幀結束時呼叫，超過門檻時寫入記錄
+
+        Returns:
+            dict: 卡頓記錄（沒有卡頓時返回 None）
+        """
+        gc_collections = gc_policy.total_collections - self._gc_collections_seen
+        gc_ms = gc_policy.total_pause_ms - self._gc_ms_seen
+        self._gc_collections_seen = gc_policy.total_collections
+        self._gc_ms_seen = gc_policy.total_pause_ms
+        self.frames += 1
+        if frame_ms <= self.threshold_ms:
+            return None
+
+        with self._sample_lock:
+            sample = self._sample
+            self._sample = None
+        if sample is not None and sample[0] != frame_index:
+            sample = None  # 上一幀留下的取樣
+
+        slowest = max(sections, key=sections.get, default=None)
+        record = {
+            "frame": frame_index,
+            "frame_ms": frame_ms,
+            "slowest": slowest,
+            "sections": dict(sections),
+            "gc_ms": gc_ms,
+            "gc_collections": gc_collections,
+            "context": self.describe() if self.describe is not None else "",
+            "stack_at_ms": sample[1] if sample is not None else None,
+            "stack": sample[2] if sample is not None else None,
+        }
+
+        self.hitches += 1
+        self.worst_ms = max(self.worst_ms, frame_ms)
+        if slowest is not None:
+            self.section_hitches[slowest] = self.section_hitches.get(slowest, 0) + 1
+        self._logger.info(self.format_record(record))
+        return record
+
+    def format_record(self, record):
+        """將卡頓記錄轉成記錄檔的文字"""
+        lines = [
+            f"卡頓：第 {record['frame']} 幀 {record['frame_ms']:.1f} ms"
+            f"（門檻 {self.threshold_ms:.0f} ms） {record['context']}"
+        ]
+        if record["slowest"] is not None:
+            lines.append(
+                f"  最慢階段：{record['slowest']} "
+                f"{record['sections'][record['slowest']]:.1f} ms"
+            )
+        ordered = sorted(record["sections"].items(), key=lambda item: -item[1])
+        lines.append(
+            "  各階段："
+            + "，".join(f"{name} {ms:.2f}" for name, ms in ordered if ms >= 0.01)
+        )
+        if record["gc_collections"]:
+            lines.append(
+                f"  GC：{record['gc_collections']} 次，共 {record['gc_ms']:.1f} ms"
+            )
+        if record["stack"] is not None:
+            lines.append(f"  堆疊（幀執行 {record['stack_at_ms']:.1f} ms 時擷取）：")
+            for entry in traceback.format_list(record["stack"]):
+                lines.extend("    " + line for line in entry.rstrip().splitlines())
+        return "\n".join(lines)
+
+    def get_stats(self):
+        """獲取卡頓偵測的統計資料"""
+        return {
+            "frames": self.frames,
+            "hitches": self.hitches,
+            "worst_ms": self.worst_ms,
+            "threshold_ms": self.threshold_ms,
+            "section_hitches": dict(self.section_hitches),
+            "log_path": self.log_path,
+        }
+
+    def _watch(self):
+        """監視執行緒：目前幀執行超過門檻時擷取主執行緒的堆疊"""
+        interval = self.sample_interval_ms / 1000.0
+        sampled_frame = None
+        while not self._stop_event.wait(interval):
+            frame_start = frame_profiler.frame_start
+            frame_index = frame_profiler.frame_index
+            if frame_start is None or frame_index == sampled_frame:
+                continue
+
+            elapsed_ms = (time.perf_counter() - frame_start) * 1000.0
+            if elapsed_ms <= self.threshold_ms:
+                continue
+
+            frame = sys._current_frames().get(self._main_thread_id)
+            if frame is None:
+                continue
+            stack = traceback.extract_stack(frame, limit=self.stack_depth)
+            del frame
+            sampled_frame = frame_index
+            with self._sample_lock:
+                self._sample = (frame_index, elapsed_ms, stack)
+
+
+# 全域卡頓偵測器實例
+hitch_detector = HitchDetector()
@@ -0,0 +1,138 @@
+"""
+輸入來源系統 - 將玩家讀取的輸入狀態抽象化
+即時遊戲從 pygame 讀取，自動化測試與效能測試則可改用腳本輸入
+"""
+
+import pygame
+
+
+class InputSnapshot:
+    """單一模擬步長的輸入快照"""
+
+    __slots__ = ("keys", "mouse_buttons", "mouse_pos")
+
+    def __init__(self, keys, mouse_buttons, mouse_pos):
+        self.keys = keys  # 可用 pygame 按鍵常數索引的按鍵狀態
+        self.mouse_buttons = mouse_buttons  # (左鍵, 中鍵, 右鍵)
+        self.mouse_pos = mouse_pos  # (x, y)
+
+
+class PressedKeys:
+    """以按鍵集合模擬 pygame.key.get_pressed() 的回傳值"""
+
+    __slots__ = ("pressed",)
+
+    def __init__(self, pressed=()):
+        self.pressed = frozenset(pressed)
+
+    def __getitem__(self, key):
+        return key in self.pressed
+
+
+class InputSource:
+    """
+    輸入來源基類
+
+    poll() 每個模擬步長由玩家呼叫一次；get_events() 由非即時的驅動迴圈在每個步長前呼叫，
+    取得要送給狀態管理器的按鍵事件
+    """
+
+    def poll(self):
+        """讀取本步長的輸入快照"""
+        raise NotImplementedError
+
+    def get_events(self):
+        """取得本步長開始前要送出的按鍵事件"""
+        return []
+
+    def observe_event(self, event):
+        """關卡收到事件時的通知（供錄製使用）"""
+        pass
+
+    def on_level_start(self, level_number, seed):
+        """關卡開始（或重新開始）時的通知"""
+        pass
+
+
+class LiveInput(InputSource):
+    """即時輸入 - 直接讀取 pygame 的鍵盤與滑鼠狀態"""
+
+    def poll(self):
+        """讀取目前的輸入快照"""
+        return InputSnapshot(
+            pygame.key.get_pressed(), pygame.mouse.get_pressed(), pygame.mouse.get_pos()
+        )
+
+    def get_events(self):
+        """即時輸入的離散事件由主迴圈的事件佇列處理"""
+        return []
+
+
+class ScriptedInput(InputSource):
+    """
+    腳本輸入 - 依照固定的步驟序列產生輸入，結果可重現
+
+    每個步驟為 (持續步數, 按住的按鍵, 滑鼠按鍵, 滑鼠位置, 步驟開始時的按鍵事件)
+    腳本播完後會從頭循環
+    """
+
+    def __init__(self, steps):
+        self.steps = [
+            (duration, PressedKeys(keys), tuple(buttons), tuple(pos), tuple(events))
+            for duration, keys, buttons, pos, events in steps
+        ]
+        self.step_index = 0
+        self.step_tick = 0
+
+    def _current_step(self):
+        return self.steps[self.step_index]
+
+    def get_events(self):
+        """取得本步長開始前要送出的按鍵事件"""
+        if self.step_tick != 0:
+            return []
+        return [
+            pygame.event.Event(pygame.KEYDOWN, key=key, mod=0, unicode="", scancode=0)
+            for key in self._current_step()[4]
+        ]
+
+    def poll(self):
+        """讀取本步長的輸入快照並推進腳本"""
+        duration, keys, buttons, pos, _ = self._current_step()
+        snapshot = InputSnapshot(keys, buttons, pos)
+
+        self.step_tick += 1
+        if self.step_tick >= duration:
+            self.step_tick = 0
+            self.step_index = (self.step_index + 1) % len(self.steps)
+
+        return snapshot
+
+    def reset(self):
+        """從腳本開頭重新播放"""
+        self.step_index = 0
+        self.step_tick = 0
+
+
+class QueuedInput(InputSource):
+    """
+    轉交輸入 - 模擬執行緒使用的輸入來源
+
+    pygame 的鍵盤與滑鼠狀態只能在主執行緒讀取：主執行緒每幀讀取快照並轉交，
+    poll() 返回最近收到的快照（在收到第一份之前為沒有任何輸入）
+    """
+
+    def __init__(self):
+        self.latest = InputSnapshot(PressedKeys(), (False, False, False), (0, 0))
+
+    def set_snapshot(self, snapshot):
+        """更新最近的輸入快照（在模擬執行緒中呼叫）"""
+        self.latest = snapshot
+
+    def poll(self):
+        """讀取最近收到的輸入快照"""
+        return self.latest
+
+
+# 預設的即時輸入實例
+live_input = LiveInput()
@@ -0,0 +1,237 @@
+"""
+記憶體報告系統 - 在關卡開始、重新開始與回到選單時以 tracemalloc 擷取堆積快照
+與上一次同類的檢查點比較，持續增加時記錄增加最多的配置位置，用來找出長時間執行的記憶體洩漏
+"""
+
+import gc
+import linecache
+import logging
+import tracemalloc
+from logging.handlers import RotatingFileHandler
+
+from constants import *
+from systems.particle_system import particle_system
+from systems.sound_manager import sound_manager
+from systems.sprite_cache import sprite_cache
+
+# 檢查點種類
+CHECKPOINT_LEVEL_START = "level_start"
+CHECKPOINT_LEVEL_RESTART = "level_restart"
+CHECKPOINT_MENU = "menu"
+
+# 快照中排除的配置（分析與報告本身的資料，例如格式化堆疊時讀入的原始碼）
+SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__, all_frames=True),
+    tracemalloc.Filter(False, linecache.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+)
+
+
+def format_kb(size):
+    """將位元組數轉成 KB 文字（含正負號）"""
+    return f"{size / 1024:+.1f} KB"
+
+
+class MemoryReport:
+    """
+    記憶體報告
+
+    每個檢查點先完整回收（垃圾回收策略已在同一時機回收時略過），再擷取快照並與
+    同種類的檢查點比較：同樣回到選單或開始同一關卡時，堆積大小應該維持不變，
+    持續增加通常代表跨關卡存活的單例（粒子系統、音效管理器、快取）累積了物件或
+    參考。pygame Surface 的像素資料不經過 Python 的配置器，以特效圖像快取的
+    像素數另外記錄。
+    """
+
+    def __init__(
+        self,
+        trace_frames=MEMORY_TRACE_FRAMES,
+        growth_threshold_kb=MEMORY_GROWTH_THRESHOLD_KB,
+        top=MEMORY_REPORT_TOP,
+    ):
+        """
+        初始化記憶體報告
+
+        Args:
+            trace_frames (int): tracemalloc 為每個配置記錄的堆疊深度
+            growth_threshold_kb (float): 增加超過此值（KB）時標記為可疑
+            top (int): 標記時列出的配置位置數量
+        """
+        self.trace_frames = trace_frames
+        self.growth_threshold_kb = growth_threshold_kb
+        self.top = top
+        self.enabled = False
+        self.log_path = None
+
+        self.checkpoints = []  # 每個檢查點的摘要
+        self.flagged = 0  # 標記為可疑的檢查點數量
+        self._previous = {}  # (檢查點種類, 附加說明) -> 上一次的堆積大小
+        self._baselines = {}  # (檢查點種類, 附加說明) -> (基準快照, 堆積大小)
+
+        self._logger = None
+        self._handler = None
+
+    def start(self, log_path=MEMORY_LOG_PATH):
+        """
+        開始追蹤配置（越早呼叫，越多配置能追溯到來源）
+
+        Args:
+            log_path (str): 記錄檔路徑
+        """
+        if self.enabled:
+            return
+
+        self.log_path = log_path
+        self._handler = RotatingFileHandler(
+            log_path,
+            maxBytes=MEMORY_LOG_MAX_BYTES,
+            backupCount=MEMORY_LOG_BACKUP_COUNT,
+            encoding="utf-8",
+        )
+        self._handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+        self._logger = logging.getLogger("memory")
+        self._logger.setLevel(logging.INFO)
+        self._logger.propagate = False
+        self._logger.addHandler(self._handler)
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.trace_frames)
+        self.enabled = True
+
+    def stop(self):
+        """停止追蹤並關閉記錄檔"""
+        if not self.enabled:
+            return
+
+        self.enabled = False
+        self._previous.clear()
+        self._baselines.clear()
+        tracemalloc.stop()
+        self._logger.removeHandler(self._handler)
+        self._handler.close()
+        self._handler = None
+
+    def singleton_counts(self):
+        """跨關卡存活的單例目前持有的物件數量"""
+        cache = sprite_cache.get_stats()
+        return {
+            "effects": particle_system.get_effect_count(),
+            "particles": particle_system.get_particle_count(),
+            "sounds": len(sound_manager.sounds),
+            "sprite_cache_entries": cache["entries"],
+            "sprite_cache_pixels": cache["pixels"],
+        }
+
+    def checkpoint(self, kind, detail="", collected=False):
+        """
+        擷取快照並與同種類、同說明的檢查點比較
+
+        與基準快照相比累積增加超過門檻時標記為可疑、記錄增加最多的配置位置，
+        並以目前的快照作為新的基準
+
+        Args:
+            kind (str): 檢查點種類（CHECKPOINT_* 常數）
+            detail (str): 附加說明（例如關卡編號）
+            collected (bool): 呼叫前是否剛完成完整回收
+
+        Returns:
+            dict: 檢查點摘要（未啟用時返回 None）
+        """
+        if not self.enabled:
+            return None
+
+        if not collected:
+            gc.collect()
+        snapshot = tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+        size = sum(trace.size for trace in snapshot.traces)
+
+        key = (kind, detail)  # 只與同一關卡的同類檢查點比較
+        previous_size = self._previous.get(key)
+        self._previous[key] = size
+        summary = {
+            "kind": kind,
+            "detail": detail,
+            "size": size,
+            "growth": size - previous_size if previous_size is not None else None,
+            "baseline_growth": None,
+            "objects": len(gc.get_objects()) + gc.get_freeze_count(),
+            "counts": self.singleton_counts(),
+            "flagged": False,
+        }
+        self.checkpoints.append(summary)
+
+        # 緩慢的洩漏每次只增加一點，因此與基準快照比較累積的增加量
+        top_stats = []
+        baseline = self._baselines.get(key)
+        if baseline is None:
+            self._baselines[key] = (snapshot, size)
+        else:
+            baseline_snapshot, baseline_size = baseline
+            summary["baseline_growth"] = size - baseline_size
+            if summary["baseline_growth"] > self.growth_threshold_kb * 1024:
+                summary["flagged"] = True
+                self.flagged += 1
+                top_stats = [
+                    stat
+                    for stat in snapshot.compare_to(baseline_snapshot, "traceback")
+                    if stat.size_diff > 0
+                ][: self.top]
+                self._baselines[key] = (snapshot, size)
+
+        self._logger.info(self.format_checkpoint(summary, top_stats))
+        return summary
+
+    def format_checkpoint(self, summary, top_stats=()):
+        """將檢查點轉成記錄檔的文字"""
+        growth = summary["growth"]
+        if growth is None:
+            compared = "第一次"
+        else:
+            compared = (
+                f"與上一次相比 {format_kb(growth)}，"
+                f"與基準相比 {format_kb(summary['baseline_growth'])}"
+            )
+        counts = "，".join(
+            f"{name} {value}" for name, value in summary["counts"].items()
+        )
+        lines = [
+            f"{'可疑增加 ' if summary['flagged'] else ''}檢查點 "
+            f"{' '.join(filter(None, (summary['kind'], summary['detail'])))}：堆積 {summary['size'] / 1024:.1f} KB（{compared}），"
+            f"物件 {summary['objects']}，{counts}"
+        ]
+        for stat in top_stats:
+            lines.append(
+                f"  {format_kb(stat.size_diff)}（{stat.count_diff:+d} 個配置）"
+            )
+            lines.extend("    " + line for line in stat.traceback.format())
+        return "\n".join(lines)
+
+    def get_stats(self):
+        """
+        獲取各種檢查點第一次與最後一次的堆積大小
+
+        Returns:
+            dict: 包含 checkpoints、flagged、log_path 與 kinds（種類 ->
+                {count, first, last, growth}）
+        """
+        kinds = {}
+        for summary in self.checkpoints:
+            entry = kinds.setdefault(
+                summary["kind"], {"count": 0, "first": summary["size"], "last": 0}
+            )
+            entry["count"] += 1
+            entry["last"] = summary["size"]
+        for entry in kinds.values():
+            entry["growth"] = entry["last"] - entry["first"]
+        return {
+            "checkpoints": len(self.checkpoints),
+            "flagged": self.flagged,
+            "log_path": self.log_path,
+            "kinds": kinds,
+        }
+
+
+# 全域記憶體報告實例
+memory_report = MemoryReport()
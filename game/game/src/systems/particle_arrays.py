@@ -0,0 +1,147 @@
+"""
+向量化粒子引擎 - 以 NumPy 結構陣列（struct-of-arrays）儲存與更新粒子
+位置、速度、重力、生命值、大小與顏色各自存放於預先配置的陣列中，每幀以陣列運算一次更新
+"""
+
+try:
+    import numpy as np
+except ImportError:  # 沒有安裝 NumPy 時由 ParticleSystem 退回逐顆粒子的實作
+    np = None
+
+NUMPY_AVAILABLE = np is not None
+
+
+class ParticleArrays:
+    """以 NumPy 陣列儲存的粒子集合"""
+
+    def __init__(self, capacity):
+        self.capacity = max(1, int(capacity))
+        self.count = 0  # 目前存活的粒子數量（資料緊密存放在 [0, count)）
+
+        self.position = np.zeros((self.capacity, 2), dtype=np.float64)
+        self.velocity = np.zeros((self.capacity, 2), dtype=np.float64)
+        self.gravity = np.zeros(self.capacity, dtype=np.float64)
+        self.lifetime = np.zeros(self.capacity, dtype=np.int32)
+        self.max_lifetime = np.ones(self.capacity, dtype=np.int32)
+        self.size = np.zeros(self.capacity, dtype=np.int32)
+        self.color = np.zeros((self.capacity, 3), dtype=np.uint8)
+
+    def _grow(self):
+        """容量不足時加倍擴充陣列"""
+        new_capacity = self.capacity * 2
+        for name in (
+            "position",
+            "velocity",
+            "gravity",
+            "lifetime",
+            "max_lifetime",
+            "size",
+            "color",
+        ):
+            old = getattr(self, name)
+            new = np.zeros((new_capacity,) + old.shape[1:], dtype=old.dtype)
+            new[: self.count] = old[: self.count]
+            setattr(self, name, new)
+        self.capacity = new_capacity
+
+    def add(
+        self, x, y, vel_x, vel_y, color, size, lifetime, gravity=0, max_lifetime=None
+    ):
+        """添加一顆粒子"""
+        if lifetime <= 0:
+            return
+        if self.count >= self.capacity:
+            self._grow()
+
+        i = self.count
+        self.position[i] = (x, y)
+        self.velocity[i] = (vel_x, vel_y)
+        self.gravity[i] = gravity
+        self.lifetime[i] = lifetime
+        self.max_lifetime[i] = max_lifetime if max_lifetime else lifetime
+        self.size[i] = size
+        self.color[i] = color
+        self.count += 1
+
+    def update(self):
+        """以陣列運算更新所有粒子，並移除生命值耗盡的粒子"""
+        n = self.count
+        if n == 0:
+            return
+
+        self.position[:n] += self.velocity[:n]
+        self.velocity[:n, 1] += self.gravity[:n]
+        self.lifetime[:n] -= 1
+
+        alive = self.lifetime[:n] > 0
+        alive_count = int(np.count_nonzero(alive))
+        if alive_count == n:
+            return
+
+        # 將存活的粒子壓縮到陣列前段
+        for array in (
+            self.position,
+            self.velocity,
+            self.gravity,
+            self.lifetime,
+            self.max_lifetime,
+            self.size,
+            self.color,
+        ):
+            array[:alive_count] = array[:n][alive]
+        self.count = alive_count
+
+    def get_alpha(self):
+        """根據剩餘生命值計算每顆粒子的透明度"""
+        n = self.count
+        alpha = 255.0 * self.lifetime[:n] / self.max_lifetime[:n]
+        return np.clip(alpha.astype(np.int32), 0, 255)
+
+    def iter_draw_data(self, blend=1.0):
+        """
+        產生繪製所需的資料
+
+        Args:
+            blend (float): 繪製插值係數，小於 1.0 時往上一步的位置回推
+
+        Yields:
+            tuple: (x, y, color, size, alpha)
+        """
+        n = self.count
+        if n == 0:
+            return
+
+        if blend < 1.0:
+            # 上一步的位置 = 目前位置 - 本步的位移（剛生成的粒子還沒移動過）
+            step = self.velocity[:n].copy()
+            step[:, 1] -= self.gravity[:n]
+            step[self.lifetime[:n] >= self.max_lifetime[:n]] = 0.0
+            positions = (self.position[:n] - step * (1.0 - blend)).tolist()
+        else:
+            positions = self.position[:n].tolist()
+        colors = [tuple(c) for c in self.color[:n].tolist()]
+        sizes = self.size[:n].tolist()
+        alphas = self.get_alpha().tolist()
+        for (x, y), color, size, alpha in zip(positions, colors, sizes, alphas):
+            yield x, y, color, size, alpha
+
+    def copy(self):
+        """複製目前存活的粒子（供繪製快照使用，不受之後的更新影響）"""
+        clone = ParticleArrays.__new__(ParticleArrays)
+        clone.count = self.count
+        clone.capacity = max(1, self.count)
+        for name in (
+            "position",
+            "velocity",
+            "gravity",
+            "lifetime",
+            "max_lifetime",
+            "size",
+            "color",
+        ):
+            setattr(clone, name, getattr(self, name)[: clone.capacity].copy())
+        return clone
+
+    def clear(self):
+        """清除所有粒子"""
+        self.count = 0
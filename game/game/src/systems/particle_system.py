@@ -4,14 +4,24 @@
 """
 
 import pygame
+import copy
 import math
-import random
 import sys
 import os
 
 # 添加 src 目錄到 path 以便導入 constants
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from constants import *
+from systems.particle_arrays import ParticleArrays, NUMPY_AVAILABLE
+from systems.sprite_cache import sprite_cache
+from systems.rng import default_rng
+from systems.quality_governor import quality_governor
+
+
+def draw_particle(screen, x, y, color, size, alpha):
+    """繪製單顆帶透明度的粒子（使用預繪圖像快取）"""
+    particle_surface = sprite_cache.get_circle(color, size, alpha)
+    screen.blit(particle_surface, (x - size, y - size))
 
 
 class Particle:
@@ -44,8 +54,13 @@ class Particle:
         if self.lifetime <= 0:
             self.alive = False
 
-    def draw(self, screen):
-        """繪製粒子"""
+    def draw(self, screen, blend=1.0):
+        """
+        繪製粒子
+
+        Args:
+            blend (float): 繪製插值係數，小於 1.0 時往上一步的位置回推
+        """
         if not self.alive:
             return
 
@@ -53,17 +68,14 @@ class Particle:
         alpha = int(255 * (self.lifetime / self.max_lifetime))
         alpha = max(0, min(255, alpha))
 
-        # 創建帶透明度的表面
-        particle_surface = pygame.Surface((self.size * 2, self.size * 2))
-        particle_surface.set_alpha(alpha)
-        particle_surface.set_colorkey(BLACK)
-
-        # 繪製粒子
-        pygame.draw.circle(
-            particle_surface, self.color, (self.size, self.size), self.size
-        )
+        x, y = self.x, self.y
+        if blend < 1.0 and self.lifetime < self.max_lifetime:
+            # 上一步的位置 = 目前位置 - 本步的位移（剛生成的粒子還沒移動過）
+            back = 1.0 - blend
+            x -= self.vel_x * back
+            y -= (self.vel_y - self.gravity) * back
 
-        screen.blit(particle_surface, (self.x - self.size, self.y - self.size))
+        draw_particle(screen, x, y, self.color, self.size, alpha)
 
 
 class EffectRing:
@@ -89,9 +101,10 @@ class EffectRing:
         # 光環擴張
         self.radius = (1 - self.lifetime / self.max_lifetime) * self.max_radius
 
-        # 脈衝效果
+        # 脈衝效果（以光環自己的存活步數計算，相同種子的重播會得到相同的畫面）
         if self.pulse:
-            pulse_factor = 1 + 0.3 * math.sin(pygame.time.get_ticks() * 0.01)
+            age_ms = (self.max_lifetime - self.lifetime) * 1000.0 / SIM_TICK_RATE
+            pulse_factor = 1 + 0.3 * math.sin(age_ms * 0.01)
             self.radius *= pulse_factor
 
         # 更新生命值
@@ -108,18 +121,17 @@ class EffectRing:
         alpha = int(255 * (self.lifetime / self.max_lifetime))
         alpha = max(0, min(255, alpha))
 
-        # 創建帶透明度的表面
-        ring_size = int(self.radius * 2 + self.width * 2)
+        # 光環每幀大小都不同，直接繪製（不經過特效圖像快取，以免淘汰粒子圖像）
+        radius = int(self.radius)
+        ring_size = radius * 2 + self.width * 2
         ring_surface = pygame.Surface((ring_size, ring_size))
         ring_surface.set_alpha(alpha)
         ring_surface.set_colorkey(BLACK)
-
-        # 繪製光環
         pygame.draw.circle(
             ring_surface,
             self.color,
             (ring_size // 2, ring_size // 2),
-            int(self.radius),
+            radius,
             self.width,
         )
 
@@ -186,14 +198,47 @@ class TextEffect:
 class ParticleSystem:
     """粒子特效系統管理器"""
 
-    def __init__(self):
+    def __init__(self, use_numpy=True, rng=None, quality=None):
+        self.rng = rng if rng is not None else default_rng  # 使用其中的特效串流
+        # 依畫質縮放特效的粒子與光環數量
+        self.quality = quality if quality is not None else quality_governor
+        # 有 NumPy 時使用向量化粒子引擎，否則退回逐顆粒子物件
+        if use_numpy and NUMPY_AVAILABLE:
+            self.particle_arrays = ParticleArrays(PARTICLE_MAX_COUNT)
+        else:
+            self.particle_arrays = None
         self.particles = []
         self.rings = []
         self.text_effects = []
 
+    def spawn_particle(self, x, y, vel_x, vel_y, color, size, lifetime, gravity=0):
+        """生成粒子（向量化引擎下不會建立 Particle 物件）"""
+        if self.particle_arrays is not None:
+            self.particle_arrays.add(
+                x, y, vel_x, vel_y, color, size, lifetime, gravity=gravity
+            )
+        else:
+            self.particles.append(
+                Particle(x, y, vel_x, vel_y, color, size, lifetime, gravity)
+            )
+
     def add_particle(self, particle):
         """添加粒子"""
-        self.particles.append(particle)
+        if self.particle_arrays is not None:
+            if particle.alive:
+                self.particle_arrays.add(
+                    particle.x,
+                    particle.y,
+                    particle.vel_x,
+                    particle.vel_y,
+                    particle.color,
+                    particle.size,
+                    particle.lifetime,
+                    gravity=particle.gravity,
+                    max_lifetime=particle.max_lifetime,
+                )
+        else:
+            self.particles.append(particle)
 
     def add_ring(self, ring):
         """添加光環特效"""
@@ -205,16 +250,16 @@ class ParticleSystem:
 
     def create_explosion(self, x, y, color=YELLOW, particle_count=15):
         """創建爆炸特效"""
-        for _ in range(particle_count):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(2, 8)
+        rng = self.rng.effects
+        for _ in range(self.quality.scale_count(particle_count)):
+            angle = rng.uniform(0, 2 * math.pi)
+            speed = rng.uniform(2, 8)
             vel_x = math.cos(angle) * speed
             vel_y = math.sin(angle) * speed
-            size = random.randint(2, 5)
-            lifetime = random.randint(30, 60)
+            size = rng.randint(2, 5)
+            lifetime = rng.randint(30, 60)
 
-            particle = Particle(x, y, vel_x, vel_y, color, size, lifetime, gravity=0.1)
-            self.add_particle(particle)
+            self.spawn_particle(x, y, vel_x, vel_y, color, size, lifetime, gravity=0.1)
 
     def create_hit_effect(self, x, y, is_charged=False):
         """創建擊中特效"""
@@ -251,6 +296,7 @@ class ParticleSystem:
 
     def create_heal_effect(self, x, y, heal_amount):
         """創建治療特效"""
+        rng = self.rng.effects
         # 治療數字
         text_effect = TextEffect(x, y, f"+{heal_amount}", GREEN, vel_y=-1)
         self.add_text_effect(text_effect)
@@ -261,121 +307,118 @@ class ParticleSystem:
 
         # 治療粒子
         for _ in range(8):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(1, 3)
+            angle = rng.uniform(0, 2 * math.pi)
+            speed = rng.uniform(1, 3)
             vel_x = math.cos(angle) * speed
             vel_y = math.sin(angle) * speed - 1  # 向上飄散
 
-            particle = Particle(x, y, vel_x, vel_y, GREEN, 3, 45, gravity=-0.02)
-            self.add_particle(particle)
+            self.spawn_particle(x, y, vel_x, vel_y, GREEN, 3, 45, gravity=-0.02)
 
     def create_defense_effect(self, x, y):
         """創建防禦特效"""
+        rng = self.rng.effects
         # 防禦光環
         ring = EffectRing(x, y, 50, BLUE, 3, 60, pulse=True)
         self.add_ring(ring)
 
         # 防禦粒子
         for _ in range(6):
-            angle = random.uniform(0, 2 * math.pi)
+            angle = rng.uniform(0, 2 * math.pi)
             orbit_radius = 40
             orbit_x = x + math.cos(angle) * orbit_radius
             orbit_y = y + math.sin(angle) * orbit_radius
 
-            particle = Particle(orbit_x, orbit_y, 0, 0, BLUE, 4, 30)
-            self.add_particle(particle)
+            self.spawn_particle(orbit_x, orbit_y, 0, 0, BLUE, 4, 30)
 
     def create_clear_screen_effect(self, x, y):
         """創建清屏技能特效 - 從玩家中心向外擴散的強大衝擊波"""
+        rng = self.rng.effects
+        quality = self.quality
         # 第一階段：快速的內層光環（從玩家身邊開始）
-        for i in range(3):
+        for i in range(quality.scale_count(3, "ring_scale")):
             max_radius = 80 + i * 60  # 較小但快速的光環
             lifetime = 40 - i * 5  # 快速擴散
             ring = EffectRing(x, y, max_radius, (255, 255, 255), 8, lifetime)
             self.add_ring(ring)
 
         # 第二階段：大範圍衝擊波光環
-        for i in range(4):
+        for i in range(quality.scale_count(4, "ring_scale")):
             max_radius = 120 + i * 80  # 更大的範圍
             lifetime = 80 - i * 8  # 稍慢的擴散
             ring = EffectRing(x, y, max_radius, (200, 255, 255), 6 + i * 2, lifetime)
             self.add_ring(ring)
 
         # 第三階段：能量脈衝光環（最外層）
-        for i in range(2):
+        for i in range(quality.scale_count(2, "ring_scale")):
             max_radius = 200 + i * 100  # 最大範圍
             lifetime = 100 - i * 10  # 最慢但範圍最大
             ring = EffectRing(x, y, max_radius, (255, 255, 150), 4 + i * 3, lifetime)
             self.add_ring(ring)
 
         # 從玩家中心向各個方向發射的能量粒子（第一波：快速擴散）
-        for _ in range(60):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(12, 25)  # 更快的初始擴散速度
+        for _ in range(quality.scale_count(60)):
+            angle = rng.uniform(0, 2 * math.pi)
+            speed = rng.uniform(12, 25)  # 更快的初始擴散速度
             vel_x = math.cos(angle) * speed
             vel_y = math.sin(angle) * speed
 
             # 明亮的白色和黃色粒子
-            color = random.choice([(255, 255, 255), (255, 255, 150), (255, 255, 200)])
-            size = random.randint(4, 8)
-            lifetime = random.randint(60, 120)
+            color = rng.choice([(255, 255, 255), (255, 255, 150), (255, 255, 200)])
+            size = rng.randint(4, 8)
+            lifetime = rng.randint(60, 120)
 
-            particle = Particle(x, y, vel_x, vel_y, color, size, lifetime, gravity=0.05)
-            self.add_particle(particle)
+            self.spawn_particle(x, y, vel_x, vel_y, color, size, lifetime, gravity=0.05)
 
         # 第二波：較慢但持久的能量粒子
-        for _ in range(40):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(6, 15)  # 較慢的速度
+        for _ in range(quality.scale_count(40)):
+            angle = rng.uniform(0, 2 * math.pi)
+            speed = rng.uniform(6, 15)  # 較慢的速度
             vel_x = math.cos(angle) * speed
             vel_y = math.sin(angle) * speed
 
             # 彩色的能量粒子
-            color = random.choice([(200, 255, 255), (255, 200, 255), (255, 255, 100)])
-            size = random.randint(3, 6)
-            lifetime = random.randint(100, 180)
+            color = rng.choice([(200, 255, 255), (255, 200, 255), (255, 255, 100)])
+            size = rng.randint(3, 6)
+            lifetime = rng.randint(100, 180)
 
-            particle = Particle(x, y, vel_x, vel_y, color, size, lifetime, gravity=0.02)
-            self.add_particle(particle)
+            self.spawn_particle(x, y, vel_x, vel_y, color, size, lifetime, gravity=0.02)
 
         # 玩家周圍的內層強化粒子（表現能量聚集和爆發）
-        for _ in range(25):
-            angle = random.uniform(0, 2 * math.pi)
-            distance = random.uniform(10, 40)  # 在玩家附近生成
+        for _ in range(quality.scale_count(25)):
+            angle = rng.uniform(0, 2 * math.pi)
+            distance = rng.uniform(10, 40)  # 在玩家附近生成
             start_x = x + math.cos(angle) * distance
             start_y = y + math.sin(angle) * distance
 
             # 向外爆發的速度
-            speed = random.uniform(8, 18)
+            speed = rng.uniform(8, 18)
             vel_x = math.cos(angle) * speed
             vel_y = math.sin(angle) * speed
 
-            color = random.choice([(255, 255, 255), (255, 255, 0), (255, 200, 100)])
-            size = random.randint(6, 12)
-            lifetime = random.randint(80, 140)
+            color = rng.choice([(255, 255, 255), (255, 255, 0), (255, 200, 100)])
+            size = rng.randint(6, 12)
+            lifetime = rng.randint(80, 140)
 
-            particle = Particle(
+            self.spawn_particle(
                 start_x, start_y, vel_x, vel_y, color, size, lifetime, gravity=0.1
             )
-            self.add_particle(particle)
-            angle = random.uniform(0, 2 * math.pi)
-            radius = random.uniform(5, 25)  # 在玩家周圍小範圍
+            angle = rng.uniform(0, 2 * math.pi)
+            radius = rng.uniform(5, 25)  # 在玩家周圍小範圍
             start_x = x + math.cos(angle) * radius
             start_y = y + math.sin(angle) * radius
 
             # 向外擴散的速度
-            speed = random.uniform(12, 25)
+            speed = rng.uniform(12, 25)
             vel_x = math.cos(angle) * speed
             vel_y = math.sin(angle) * speed
 
             color = (255, 255, 255)  # 純白色內層粒子
-            size = random.randint(6, 12)
-            lifetime = random.randint(60, 100)
+            size = rng.randint(6, 12)
+            lifetime = rng.randint(60, 100)
 
-            particle = Particle(
+            self.spawn_particle(
                 start_x, start_y, vel_x, vel_y, color, size, lifetime, gravity=0
             )
-            self.add_particle(particle)
 
         # 清屏文字特效增強
         text_effect = TextEffect(
@@ -391,44 +434,47 @@ class ParticleSystem:
 
     def create_level_complete_effect(self, x, y):
         """創建關卡完成特效"""
+        rng = self.rng.effects
         # 勝利文字
         text_effect = TextEffect(x, y, "關卡完成!", YELLOW, vel_y=0, lifetime=180)
         self.add_text_effect(text_effect)
 
         # 慶祝粒子
         for _ in range(30):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(3, 10)
+            angle = rng.uniform(0, 2 * math.pi)
+            speed = rng.uniform(3, 10)
             vel_x = math.cos(angle) * speed
             vel_y = math.sin(angle) * speed - 5  # 向上噴射
-            color = random.choice([YELLOW, GREEN, BLUE, RED])
-            size = random.randint(2, 6)
+            color = rng.choice([YELLOW, GREEN, BLUE, RED])
+            size = rng.randint(2, 6)
 
-            particle = Particle(x, y, vel_x, vel_y, color, size, 90, gravity=0.2)
-            self.add_particle(particle)
+            self.spawn_particle(x, y, vel_x, vel_y, color, size, 90, gravity=0.2)
 
     def create_teleport_effect(self, x, y):
         """創建瞬移特效（法師機器人用）"""
+        rng = self.rng.effects
         # 瞬移光環
         ring = EffectRing(x, y, 60, (150, 0, 255), 4, 30)
         self.add_ring(ring)
 
         # 瞬移粒子
         for _ in range(12):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(2, 6)
+            angle = rng.uniform(0, 2 * math.pi)
+            speed = rng.uniform(2, 6)
             vel_x = math.cos(angle) * speed
             vel_y = math.sin(angle) * speed
 
-            particle = Particle(x, y, vel_x, vel_y, (255, 100, 255), 4, 40, gravity=0)
-            self.add_particle(particle)
+            self.spawn_particle(x, y, vel_x, vel_y, (255, 100, 255), 4, 40, gravity=0)
 
     def update(self):
         """更新所有特效"""
         # 更新粒子
-        self.particles = [p for p in self.particles if p.alive]
-        for particle in self.particles:
-            particle.update()
+        if self.particle_arrays is not None:
+            self.particle_arrays.update()
+        else:
+            self.particles = [p for p in self.particles if p.alive]
+            for particle in self.particles:
+                particle.update()
 
         # 更新光環
         self.rings = [r for r in self.rings if r.alive]
@@ -440,29 +486,69 @@ class ParticleSystem:
         for text_effect in self.text_effects:
             text_effect.update()
 
-    def draw(self, screen):
-        """繪製所有特效"""
+    def draw(self, screen, blend=1.0):
+        """
+        繪製所有特效
+
+        Args:
+            blend (float): 粒子的繪製插值係數（1.0 表示繪製目前的模擬狀態）
+        """
         # 先繪製光環（背景層）
         for ring in self.rings:
             ring.draw(screen)
 
         # 繪製粒子（中間層）
-        for particle in self.particles:
-            particle.draw(screen)
+        if self.particle_arrays is not None:
+            # 快取查表後以 blits 一次送出所有粒子
+            screen.blits(
+                [
+                    (sprite_cache.get_circle(color, size, alpha), (x - size, y - size))
+                    for x, y, color, size, alpha in self.particle_arrays.iter_draw_data(
+                        blend
+                    )
+                ],
+                False,
+            )
+        else:
+            for particle in self.particles:
+                particle.draw(screen, blend)
 
         # 繪製文字特效（前景層）
         for text_effect in self.text_effects:
             text_effect.draw(screen)
 
+    def snapshot(self):
+        """
+        建立只供繪製的副本（繪製快照使用，模擬執行緒之後的更新不會影響副本）
+
+        Returns:
+            ParticleSystem: 粒子、光環與文字特效的副本
+        """
+        clone = copy.copy(self)
+        if self.particle_arrays is not None:
+            clone.particle_arrays = self.particle_arrays.copy()
+        clone.particles = [copy.copy(p) for p in self.particles]
+        clone.rings = [copy.copy(r) for r in self.rings]
+        clone.text_effects = [copy.copy(t) for t in self.text_effects]
+        return clone
+
     def clear_all(self):
         """清除所有特效"""
+        if self.particle_arrays is not None:
+            self.particle_arrays.clear()
         self.particles.clear()
         self.rings.clear()
         self.text_effects.clear()
 
     def get_effect_count(self):
         """獲取當前特效總數"""
-        return len(self.particles) + len(self.rings) + len(self.text_effects)
+        return self.get_particle_count() + len(self.rings) + len(self.text_effects)
+
+    def get_particle_count(self):
+        """獲取當前粒子數量"""
+        if self.particle_arrays is not None:
+            return self.particle_arrays.count
+        return len(self.particles)
 
 
 # 全域粒子系統實例
@@ -0,0 +1,68 @@
+"""
+效能統計工具 - 計算幀時間的百分位數、摘要與分布
+"""
+
+from bisect import bisect_left
+
+
+def percentile(sorted_values, percent):
+    """
+    以線性內插計算百分位數
+
+    Args:
+        sorted_values (list): 已排序的數值
+        percent (float): 百分位（0 - 100）
+
+    Returns:
+        float: 百分位數值，沒有資料時回傳 0.0
+    """
+    if not sorted_values:
+        return 0.0
+
+    position = (len(sorted_values) - 1) * percent / 100.0
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    fraction = position - lower
+    return (
+        sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * fraction
+    )
+
+
+def summarize_ms(samples, percents=(50, 95, 99)):
+    """
+    彙整毫秒取樣
+
+    Args:
+        samples (list): 每幀耗時（毫秒）
+        percents (tuple): 要計算的百分位
+
+    Returns:
+        dict: 包含 count、mean、max 與各百分位（p50、p95...）的摘要
+    """
+    ordered = sorted(samples)
+    count = len(ordered)
+    summary = {
+        "count": count,
+        "mean": sum(ordered) / count if count else 0.0,
+        "max": ordered[-1] if count else 0.0,
+    }
+    for percent in percents:
+        summary[f"p{percent}"] = percentile(ordered, percent)
+    return summary
+
+
+def histogram(samples, edges):
+    """
+    計算毫秒取樣的分布
+
+    Args:
+        samples (list): 每幀耗時（毫秒）
+        edges (tuple): 由小到大的區間上限，最後另有一個超過最大上限的區間
+
+    Returns:
+        list: 各區間的數量（長度為 len(edges) + 1）
+    """
+    counts = [0] * (len(edges) + 1)
+    for value in samples:
+        counts[bisect_left(edges, value)] += 1
+    return counts
@@ -29,27 +29,105 @@ class Platform:
 
 
 class PlatformSystem:
-    """平台系統管理器"""
+    """
+    平台系統管理器
+
+    添加平台時同時建立均勻網格索引，平台數量多時查詢只檢查附近格子內的平台。
+    查詢結果維持平台的添加順序，與線性掃描的結果完全一致。
+    """
+
+    def __init__(
+        self,
+        cell_size=PLATFORM_GRID_CELL_SIZE,
+        min_index_count=PLATFORM_INDEX_MIN_COUNT,
+    ):
+        """
+        初始化平台系統
 
-    def __init__(self):
+        Args:
+            cell_size (int): 網格索引的格子大小，None 表示停用索引
+            min_index_count (int): 平台數量達到此值才使用索引
+        """
         self.platforms = []
+        self.cell_size = cell_size
+        self.min_index_count = min_index_count
+        self.grid = {}  # (格子x, 格子y) -> 平台索引列表（依添加順序）
+        self.bounds = None  # 所有平台的外框矩形
 
     def add_platform(self, x, y, width, height):
         """添加新平台"""
         platform = Platform(x, y, width, height)
+        index = len(self.platforms)
         self.platforms.append(platform)
+
+        if self.cell_size is not None:
+            for cell in self._cells_for_rect(platform.rect):
+                self.grid.setdefault(cell, []).append(index)
+
+        if self.bounds is None:
+            self.bounds = platform.rect.copy()
+        else:
+            self.bounds.union_ip(platform.rect)
         return platform
 
     def clear_platforms(self):
         """清除所有平台"""
         self.platforms.clear()
+        self.grid.clear()
+        self.bounds = None
+
+    def _cells_for_rect(self, rect):
+        """列出矩形覆蓋的所有格子"""
+        size = self.cell_size
+        min_cx = rect.left // size
+        max_cx = (rect.right - 1) // size
+        min_cy = rect.top // size
+        max_cy = (rect.bottom - 1) // size
+        return [
+            (cx, cy)
+            for cx in range(min_cx, max_cx + 1)
+            for cy in range(min_cy, max_cy + 1)
+        ]
+
+    def query_rect(self, rect):
+        """
+        獲取可能與矩形重疊的候選平台（依添加順序）
+
+        平台數量少或停用索引時直接返回全部平台，呼叫端仍需做精確判斷
+        """
+        if self.cell_size is None or len(self.platforms) < self.min_index_count:
+            return self.platforms
+
+        grid = self.grid
+        cells = self._cells_for_rect(rect)
+        if len(cells) == 1:
+            indices = grid.get(cells[0], ())
+        else:
+            found = set()
+            for cell in cells:
+                found.update(grid.get(cell, ()))
+            indices = sorted(found)
+
+        platforms = self.platforms
+        return [platforms[i] for i in indices]
+
+    def query_x_range(self, left, right):
+        """獲取水平範圍 [left, right] 內可能重疊的候選平台（依添加順序）"""
+        if self.bounds is None:
+            return []
+        return self.query_rect(
+            pygame.Rect(left, self.bounds.top, right - left + 1, self.bounds.height)
+        )
 
     def check_collision(self, entity_rect, vel_y):
         """
         檢查實體與平台的碰撞
         返回 (碰撞的平台, 新的y位置) 或 (None, None)
         """
-        for platform in self.platforms:
+        if vel_y < 0:
+            return None, None
+
+        for platform in self.query_rect(entity_rect):
             platform_rect = platform.get_rect()
 
             # 只在實體向下移動且從上方接觸平台時才處理碰撞
@@ -72,7 +150,7 @@ class PlatformSystem:
             entity_rect.x, entity_rect.bottom, entity_rect.width, 5
         )
 
-        for platform in self.platforms:
+        for platform in self.query_rect(check_rect):
             if check_rect.colliderect(platform.get_rect()):
                 return True
         return False
@@ -85,7 +163,14 @@ class PlatformSystem:
         nearest_platform = None
         min_distance = float("inf")
 
-        for platform in self.platforms:
+        # 只查詢上方 max_distance 範圍內的格子（多留 1 像素避免座標取整誤差）
+        search_rect = pygame.Rect(
+            x - max_distance - 1,
+            y - max_distance - 1,
+            max_distance * 2 + 2,
+            max_distance + 2,
+        )
+        for platform in self.query_rect(search_rect):
             platform_rect = platform.get_rect()
 
             # 檢查平台是否在上方且在合理的水平範圍內
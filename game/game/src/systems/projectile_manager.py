@@ -0,0 +1,157 @@
+"""
+投射物管理系統 - 關卡共用的子彈物件池
+所有敵人的子彈都由同一個管理器生成、更新與回收，移除為 O(1)，並有數量上限
+"""
+
+from constants import *
+
+
+class ProjectileManager:
+    """
+    帶物件池的投射物管理器
+
+    活躍的投射物存放在連續列表中，移除時與最後一個交換位置（O(1)）；
+    回收的物件依類型放回物件池，下次生成同類型時以 reset() 重新初始化，不再配置新物件。
+    """
+
+    def __init__(self, max_projectiles=PROJECTILE_MAX_COUNT):
+        """
+        初始化投射物管理器
+
+        Args:
+            max_projectiles (int): 同時存在的投射物上限，超過時新的投射物不會生成
+        """
+        self.max_projectiles = max_projectiles
+        self.active = []  # 活躍中的投射物
+        self.pools = {}  # 類型 -> 可重複使用的投射物列表
+
+        # 統計資料
+        self.allocated = 0  # 實際建立過的物件數量
+        self.reused = 0  # 從物件池取出重複使用的次數
+        self.dropped = 0  # 因達到上限而未生成的數量
+
+    def spawn(self, projectile_type, owner, *args, **kwargs):
+        """
+        生成投射物（優先從物件池取出）
+
+        Args:
+            projectile_type (type): 投射物類型，需提供 reset() 方法
+            owner: 發射者（敵人死亡時用來回收其投射物）
+            *args, **kwargs: 傳給建構子或 reset() 的參數
+
+        Returns:
+            投射物物件，達到上限時返回 None
+        """
+        if len(self.active) >= self.max_projectiles:
+            self.dropped += 1
+            return None
+
+        pool = self.pools.get(projectile_type)
+        if pool:
+            projectile = pool.pop()
+            projectile.reset(*args, **kwargs)
+            self.reused += 1
+        else:
+            projectile = projectile_type(*args, **kwargs)
+            self.allocated += 1
+
+        projectile.owner = owner
+        projectile.slot = len(self.active)
+        self.active.append(projectile)
+        return projectile
+
+    def restore(self, projectile_type, owner):
+        """
+        取出一個投射物放回活躍列表，不呼叫 reset()（由快照還原屬性時使用）
+
+        Returns:
+            投射物物件（屬性需由呼叫者填入），達到上限時返回 None
+        """
+        if len(self.active) >= self.max_projectiles:
+            self.dropped += 1
+            return None
+
+        pool = self.pools.get(projectile_type)
+        if pool:
+            projectile = pool.pop()
+            self.reused += 1
+        else:
+            projectile = projectile_type.__new__(projectile_type)
+            self.allocated += 1
+
+        projectile.owner = owner
+        projectile.slot = len(self.active)
+        self.active.append(projectile)
+        return projectile
+
+    def despawn(self, projectile):
+        """移除投射物並放回物件池（與最後一個交換位置，O(1)）"""
+        slot = projectile.slot
+        if slot < 0:
+            return  # 已經回收過
+
+        last = self.active.pop()
+        if last is not projectile:
+            self.active[slot] = last
+            last.slot = slot
+
+        projectile.slot = -1
+        projectile.alive = False
+        projectile.owner = None
+        self.pools.setdefault(type(projectile), []).append(projectile)
+
+    def despawn_owner(self, owner):
+        """回收指定發射者的所有投射物"""
+        # 由後往前走訪，交換移除只會把已檢查過的投射物移到目前位置
+        active = self.active
+        for index in range(len(active) - 1, -1, -1):
+            if active[index].owner is owner:
+                self.despawn(active[index])
+
+    def clear(self):
+        """回收所有投射物"""
+        while self.active:
+            self.despawn(self.active[-1])
+
+    def update(self):
+        """更新所有投射物，回收已失效的投射物"""
+        active = self.active
+        for index in range(len(active) - 1, -1, -1):
+            projectile = active[index]
+            projectile.update()
+            if not projectile.alive:
+                self.despawn(projectile)
+
+    def draw(self, screen):
+        """繪製所有投射物"""
+        for projectile in self.active:
+            projectile.draw(screen)
+
+    def iter_type(self, *projectile_types):
+        """依類型迭代活躍中的投射物（不含子類別）"""
+        for projectile in self.active[:]:
+            if type(projectile) in projectile_types:
+                yield projectile
+
+    def iter_owner(self, owner):
+        """迭代指定發射者的活躍投射物"""
+        for projectile in self.active[:]:
+            if projectile.owner is owner:
+                yield projectile
+
+    def __iter__(self):
+        """迭代所有活躍中的投射物（迭代期間可以安全地回收投射物）"""
+        return iter(self.active[:])
+
+    def __len__(self):
+        return len(self.active)
+
+    def get_stats(self):
+        """獲取物件池統計"""
+        return {
+            "active": len(self.active),
+            "pooled": sum(len(pool) for pool in self.pools.values()),
+            "allocated": self.allocated,
+            "reused": self.reused,
+            "dropped": self.dropped,
+        }
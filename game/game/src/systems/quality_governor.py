@@ -0,0 +1,206 @@
+"""
+畫質調節系統 - 依實際量測的幀耗時自動調整特效品質
+幀耗時超出預算時降低粒子、光環等特效的數量與細節，有餘裕時再逐級恢復
+"""
+
+import time
+from collections import deque
+
+from constants import *
+
+# 恢復畫質後很快又需要降低時，恢復所需的幀數加倍（最多為基本值的倍數）
+_MAX_UPGRADE_BACKOFF = 8
+
+
+class QualityGovernor:
+    """
+    特效畫質調節器
+
+    主迴圈每幀回報繪製與更新的耗時（不含等待下一幀的時間）。
+    最近一段時間的平均耗時超過預算時降低一級畫質；平均耗時連續一段時間
+    明顯低於預算時恢復一級。調整只影響特效的繪製與粒子數量，不影響遊戲結果。
+    """
+
+    def __init__(
+        self,
+        budget_ms=QUALITY_FRAME_BUDGET_MS,
+        window=QUALITY_WINDOW_FRAMES,
+        downgrade_ratio=QUALITY_DOWNGRADE_RATIO,
+        upgrade_ratio=QUALITY_UPGRADE_RATIO,
+        upgrade_frames=QUALITY_UPGRADE_FRAMES,
+        enabled=QUALITY_GOVERNOR_ENABLED,
+    ):
+        """
+        初始化畫質調節器
+
+        Args:
+            budget_ms (float): 每幀的耗時預算（毫秒）
+            window (int): 計算平均耗時的幀數
+            downgrade_ratio (float): 平均耗時超過預算的此比例時降低畫質
+            upgrade_ratio (float): 平均耗時低於預算的此比例時累計餘裕幀數
+            upgrade_frames (int): 恢復一級畫質需要的連續餘裕幀數
+            enabled (bool): 是否自動調整（停用時維持目前的畫質）
+        """
+        self.budget_ms = budget_ms
+        self.window = window
+        self.downgrade_ratio = downgrade_ratio
+        self.upgrade_ratio = upgrade_ratio
+        self.upgrade_frames = upgrade_frames
+        self.enabled = enabled
+        self.reset()
+
+    def reset(self, level=QUALITY_HIGH):
+        """重設畫質與統計資料"""
+        self.level = level
+        self.settings = QUALITY_SETTINGS[level]
+        self._samples = deque(maxlen=self.window)
+        self._sample_total = 0.0
+        self._headroom_frames = 0
+        self._backoff = 1
+        self._frames_since_upgrade = None
+
+        # 統計資料
+        self.frames = 0
+        self.started_at = None  # 第一次回報幀耗時的時間
+        self.downgrades = 0
+        self.upgrades = 0
+        self.level_frames = {quality: 0 for quality in QUALITY_SETTINGS}
+        # 最近的畫質調整：(幀, 原畫質, 新畫質, 平均毫秒)
+        self.history = deque(maxlen=QUALITY_HISTORY_SIZE)
+
+    @property
+    def changes(self):
+        """畫質調整的總次數"""
+        return self.downgrades + self.upgrades
+
+    @property
+    def average_ms(self):
+        """最近一段時間的平均幀耗時"""
+        if not self._samples:
+            return 0.0
+        return self._sample_total / len(self._samples)
+
+    def set_level(self, level):
+        """
+        設定畫質等級（手動指定或自動調整時使用）
+
+        Returns:
+            bool: 畫質是否有改變
+        """
+        level = max(QUALITY_LOW, min(QUALITY_HIGH, level))
+        if level == self.level:
+            return False
+
+        self.history.append((self.frames, self.level, level, self.average_ms))
+        self.level = level
+        self.settings = QUALITY_SETTINGS[level]
+
+        # 以新的畫質重新累積平均耗時，調整後不會立即再次調整
+        self._samples.clear()
+        self._sample_total = 0.0
+        self._headroom_frames = 0
+        return True
+
+    def record_frame(self, frame_ms):
+        """
+        回報一幀的耗時並視需要調整畫質
+
+        Args:
+            frame_ms (float): 這一幀更新與繪製的耗時（毫秒）
+        """
+        if self.started_at is None:
+            self.started_at = time.perf_counter()
+        self.frames += 1
+        self.level_frames[self.level] += 1
+        if self._frames_since_upgrade is not None:
+            self._frames_since_upgrade += 1
+
+        if not self.enabled:
+            return
+
+        samples = self._samples
+        if len(samples) == samples.maxlen:
+            self._sample_total -= samples[0]
+        samples.append(frame_ms)
+        self._sample_total += frame_ms
+        if len(samples) < samples.maxlen:
+            return
+
+        average = self._sample_total / len(samples)
+        if average > self.budget_ms * self.downgrade_ratio:
+            self._downgrade()
+        elif average < self.budget_ms * self.upgrade_ratio:
+            self._headroom_frames += 1
+            if self._headroom_frames >= self.upgrade_frames * self._backoff:
+                self._upgrade()
+        else:
+            self._headroom_frames = 0
+
+    def _downgrade(self):
+        """降低一級畫質"""
+        if self.level == QUALITY_LOW:
+            return
+
+        # 剛恢復畫質又超出預算，代表這一級負擔不了：延長下次恢復前的等待
+        if (
+            self._frames_since_upgrade is not None
+            and self._frames_since_upgrade < self.upgrade_frames
+        ):
+            self._backoff = min(self._backoff * 2, _MAX_UPGRADE_BACKOFF)
+        self._frames_since_upgrade = None
+
+        self.set_level(self.level - 1)
+        self.downgrades += 1
+
+    def _upgrade(self):
+        """恢復一級畫質"""
+        if self.level == QUALITY_HIGH:
+            self._headroom_frames = 0
+            return
+
+        self.set_level(self.level + 1)
+        self.upgrades += 1
+        self._frames_since_upgrade = 0
+
+    def scale_count(self, count, key="particle_scale"):
+        """
+        依目前畫質縮放特效數量
+
+        Args:
+            count (int): 最高畫質下的數量
+            key (str): 使用的比例設定（particle_scale 或 ring_scale）
+
+        Returns:
+            int: 縮放後的數量（原本大於零時至少為 1）
+        """
+        if count <= 0:
+            return 0
+        return max(1, int(count * self.settings[key] + 0.5))
+
+    def get_stats(self):
+        """獲取畫質調節的統計資料"""
+        elapsed = 0.0
+        if self.started_at is not None:
+            elapsed = time.perf_counter() - self.started_at
+        return {
+            "level": self.level,
+            "level_name": QUALITY_NAMES[self.level],
+            "enabled": self.enabled,
+            "average_ms": self.average_ms,
+            "budget_ms": self.budget_ms,
+            "frames": self.frames,
+            "changes": self.changes,
+            "downgrades": self.downgrades,
+            "upgrades": self.upgrades,
+            "elapsed_seconds": elapsed,
+            "changes_per_minute": self.changes * 60.0 / elapsed if elapsed else 0.0,
+            "level_frames": {
+                QUALITY_NAMES[quality]: frames
+                for quality, frames in self.level_frames.items()
+            },
+            "history": list(self.history),
+        }
+
+
+# 全域畫質調節器實例
+quality_governor = QualityGovernor()
@@ -0,0 +1,137 @@
+"""
+繪製快照系統 - 在模擬執行緒中把關卡複製成只供繪製的副本
+主執行緒繪製副本時，模擬執行緒可以繼續更新真正的關卡而不互相干擾
+"""
+
+import copy
+import time
+
+from constants import *
+from systems.interpolation import RenderInterpolator
+from systems.world_snapshot import copy_plain, NOT_PLAIN
+
+
+class Freezer:
+    """
+    物件凍結器 - 建立淺複製的副本，並把指向已凍結物件的參照換成對應的副本
+
+    列表與字典屬性會一併複製（模擬執行緒之後修改原本的容器不會影響副本）
+    """
+
+    def __init__(self):
+        self.clones = {}  # id(原物件) -> 副本
+
+    def get(self, original):
+        """獲取原物件的副本（尚未凍結時返回 None）"""
+        return self.clones.get(id(original))
+
+    def freeze(self, obj):
+        """凍結單一物件"""
+        clone = copy.copy(obj)
+        self.clones[id(obj)] = clone
+
+        clones = self.clones
+        for name, value in vars(obj).items():
+            mapped = clones.get(id(value))
+            if mapped is not None:
+                setattr(clone, name, mapped)
+            elif type(value) is list or type(value) is dict:
+                copied = copy_plain(value)
+                setattr(
+                    clone, name, copied if copied is not NOT_PLAIN else copy.copy(value)
+                )
+        return clone
+
+
+def freeze_level(level):
+    """
+    建立關卡的繪製副本
+
+    副本包含玩家、拳頭、敵人、投射物、血量道具、粒子特效與模擬時鐘的複製，
+    以及換成副本的插值記錄；平台、字體等繪製時不會改變的物件直接共用。
+
+    Returns:
+        GameLevel: 只能用來呼叫 draw() 的關卡副本
+    """
+    freezer = Freezer()
+    freezer.freeze(level.clock)  # 繪製時讀取的時間固定在快照當下
+
+    player = level.player
+    player_clone = freezer.freeze(player)
+    player_clone.left_fist = freezer.freeze(player.left_fist)
+    player_clone.right_fist = freezer.freeze(player.right_fist)
+
+    enemies = [freezer.freeze(enemy) for enemy in level.enemies]
+
+    manager = copy.copy(level.projectile_manager)
+    manager.active = [freezer.freeze(p) for p in level.projectile_manager.active]
+
+    spawner = copy.copy(level.health_item_spawner)
+    spawner.items = [freezer.freeze(item) for item in level.health_item_spawner.items]
+
+    # 插值記錄改以副本為鍵
+    interpolator = RenderInterpolator(level.interpolator.max_jump)
+    for entity, prev_x, prev_y in level.interpolator.previous.values():
+        clone = freezer.get(entity)
+        if clone is not None:
+            interpolator.previous[id(clone)] = (clone, prev_x, prev_y)
+
+    level_clone = copy.copy(level)
+    level_clone.clock = freezer.get(level.clock)
+    level_clone.player = player_clone
+    level_clone.enemies = enemies
+    level_clone.projectile_manager = manager
+    level_clone.health_item_spawner = spawner
+    level_clone.interpolator = interpolator
+    level_clone.particle_system = level.particle_system.snapshot()
+    return level_clone
+
+
+class RenderFrame:
+    """
+    一幀可繪製的內容
+
+    關卡畫面與選單等其他狀態都是凍結的副本，模擬執行緒之後修改原物件不會影響這一幀
+    """
+
+    def __init__(self, state, tick, tick_ms, is_level=False):
+        self.state = state
+        self.tick = tick  # 發布時的模擬步數
+        self.tick_ms = tick_ms
+        self.is_level = is_level
+        self.published_at = time.perf_counter()
+
+    def get_blend(self):
+        """依發布後經過的時間計算繪製插值係數"""
+        elapsed_ms = (time.perf_counter() - self.published_at) * 1000.0
+        return min(1.0, elapsed_ms / self.tick_ms)
+
+    def draw(self, screen, blend=1.0):
+        """繪製這一幀"""
+        if self.is_level:
+            self.state.draw(screen, blend)
+        else:
+            self.state.draw(screen)
+
+
+def build_render_frame(state_manager):
+    """
+    依狀態管理器目前的狀態建立繪製幀（需在模擬執行緒的兩個步長之間呼叫）
+
+    Returns:
+        RenderFrame: 目前狀態沒有可繪製的物件時返回 None
+    """
+    clock = state_manager.clock
+    if state_manager.current_state == GAME_STATE and state_manager.current_level:
+        return RenderFrame(
+            freeze_level(state_manager.current_level),
+            clock.tick_count,
+            clock.tick_ms,
+            is_level=True,
+        )
+
+    state = state_manager.states.get(state_manager.current_state)
+    if state is None:
+        return None
+    # 選單類畫面只有少量基本型別的欄位（選項、動畫計數、關卡列表），淺複製即可
+    return RenderFrame(Freezer().freeze(state), clock.tick_count, clock.tick_ms)
@@ -0,0 +1,277 @@
+"""
+重播系統 - 錄製每個模擬步長的玩家輸入，並可在關卡中重新播放
+重播檔為精簡的二進位格式，搭配關卡亂數種子可完整重現一次遊玩過程
+"""
+
+import struct
+import zlib
+
+import pygame
+
+from constants import *
+from systems.input_source import InputSource, InputSnapshot, PressedKeys
+
+REPLAY_MAGIC = b"RPLY"
+REPLAY_VERSION = 1
+
+# 檔頭：魔術字、版本、關卡編號、亂數種子、模擬頻率、起始步數、步長數
+REPLAY_HEADER = struct.Struct("<4sHfqHII")
+# 每個步長：按鍵位元遮罩、滑鼠按鍵位元遮罩、滑鼠 x、滑鼠 y、按鍵事件數量
+REPLAY_FRAME = struct.Struct("<HBhhB")
+REPLAY_EVENT = struct.Struct("<I")  # 按鍵事件的 pygame 按鍵代碼
+
+# 錄製的按鍵（順序即位元位置，只能在最後面新增）
+RECORDED_KEYS = (
+    pygame.K_a,
+    pygame.K_d,
+    pygame.K_LEFT,
+    pygame.K_RIGHT,
+    pygame.K_s,
+    pygame.K_DOWN,
+    pygame.K_w,
+    pygame.K_UP,
+    pygame.K_SPACE,
+    pygame.K_q,
+    pygame.K_LSHIFT,
+    pygame.K_RSHIFT,
+)
+
+
+def encode_keys(keys):
+    """將按鍵狀態編碼為位元遮罩"""
+    mask = 0
+    for bit, key in enumerate(RECORDED_KEYS):
+        if keys[key]:
+            mask |= 1 << bit
+    return mask
+
+
+def decode_keys(mask):
+    """將位元遮罩還原為按鍵狀態"""
+    return PressedKeys(
+        key for bit, key in enumerate(RECORDED_KEYS) if mask & (1 << bit)
+    )
+
+
+def encode_buttons(buttons):
+    """將滑鼠按鍵 (左, 中, 右) 編碼為位元遮罩"""
+    return sum(1 << i for i, pressed in enumerate(buttons[:3]) if pressed)
+
+
+def decode_buttons(mask):
+    """將位元遮罩還原為滑鼠按鍵 (左, 中, 右)"""
+    return tuple(bool(mask & (1 << i)) for i in range(3))
+
+
+def _clamp_short(value):
+    """將座標限制在 int16 範圍內"""
+    return max(-32768, min(32767, int(value)))
+
+
+class Replay:
+    """
+    一段錄製的輸入，frames[i] 對應關卡開始後的第 i 個模擬步長
+
+    遊戲中的冷卻時間以模擬時鐘的絕對時間計算，重播前需將時鐘重置到 start_tick
+    """
+
+    def __init__(
+        self, level_number, seed, tick_rate=SIM_TICK_RATE, start_tick=0, frames=None
+    ):
+        self.level_number = level_number
+        self.seed = seed
+        self.tick_rate = tick_rate
+        self.start_tick = start_tick  # 錄製開始時的模擬步數
+        # 每個步長為 [按鍵遮罩, 滑鼠按鍵遮罩, 滑鼠 x, 滑鼠 y, 按鍵事件列表]
+        self.frames = frames if frames is not None else []
+
+    def __len__(self):
+        return len(self.frames)
+
+    def save(self, path):
+        """將重播寫入二進位檔"""
+        body = bytearray()
+        for key_mask, button_mask, mouse_x, mouse_y, events in self.frames:
+            body += REPLAY_FRAME.pack(
+                key_mask, button_mask, mouse_x, mouse_y, len(events)
+            )
+            for key in events:
+                body += REPLAY_EVENT.pack(key)
+
+        header = REPLAY_HEADER.pack(
+            REPLAY_MAGIC,
+            REPLAY_VERSION,
+            float(self.level_number),
+            self.seed,
+            self.tick_rate,
+            self.start_tick,
+            len(self.frames),
+        )
+        with open(path, "wb") as f:
+            f.write(header)
+            f.write(zlib.compress(bytes(body)))
+
+    @classmethod
+    def load(cls, path):
+        """
+        從二進位檔讀取重播
+
+        Raises:
+            ValueError: 檔案不是重播檔或版本不支援
+        """
+        with open(path, "rb") as f:
+            data = f.read()
+
+        if len(data) < REPLAY_HEADER.size:
+            raise ValueError(f"重播檔過短：{path}")
+        magic, version, level, seed, tick_rate, start_tick, frame_count = (
+            REPLAY_HEADER.unpack_from(data)
+        )
+        if magic != REPLAY_MAGIC:
+            raise ValueError(f"不是重播檔：{path}")
+        if version != REPLAY_VERSION:
+            raise ValueError(f"不支援的重播檔版本：{version}")
+
+        body = zlib.decompress(data[REPLAY_HEADER.size :])
+        frames = []
+        offset = 0
+        for _ in range(frame_count):
+            key_mask, button_mask, mouse_x, mouse_y, event_count = (
+                REPLAY_FRAME.unpack_from(body, offset)
+            )
+            offset += REPLAY_FRAME.size
+            events = []
+            for _ in range(event_count):
+                events.append(REPLAY_EVENT.unpack_from(body, offset)[0])
+                offset += REPLAY_EVENT.size
+            frames.append([key_mask, button_mask, mouse_x, mouse_y, events])
+
+        level_number = int(level) if float(level).is_integer() else level
+        return cls(level_number, seed, tick_rate, start_tick, frames)
+
+
+class InputRecorder(InputSource):
+    """
+    輸入錄製器 - 包裝另一個輸入來源，記錄每個模擬步長讀到的輸入與送達關卡的按鍵事件
+
+    從第一次開始關卡時開始錄製；之後重新開始或進入下一關都會繼續錄在同一段重播中
+    """
+
+    def __init__(self, source, clock):
+        self.source = source
+        self.clock = clock
+        self.replay = None
+        self.start_tick = None
+
+    @property
+    def recording(self):
+        return self.replay is not None
+
+    def _fill(self, length):
+        """補齊步長記錄（沒有讀取輸入的步長沿用上一步的狀態）"""
+        frames = self.replay.frames
+        while len(frames) < length:
+            if frames:
+                frames.append(frames[-1][:4] + [[]])
+            else:
+                frames.append([0, 0, 0, 0, []])
+
+    def _frame(self):
+        """獲取目前步長的記錄"""
+        index = self.clock.tick_count - self.start_tick
+        self._fill(index + 1)
+        return self.replay.frames[index]
+
+    def on_level_start(self, level_number, seed):
+        """第一次開始關卡時建立新的重播"""
+        if self.replay is None:
+            self.start_tick = self.clock.tick_count
+            self.replay = Replay(
+                level_number, seed, self.clock.tick_rate, self.start_tick
+            )
+        self.source.on_level_start(level_number, seed)
+
+    def observe_event(self, event):
+        """記錄送達關卡的按鍵事件"""
+        if self.replay is not None and event.type == pygame.KEYDOWN:
+            self._frame()[4].append(event.key)
+        self.source.observe_event(event)
+
+    def get_events(self):
+        return self.source.get_events()
+
+    def poll(self):
+        """讀取並記錄本步長的輸入快照"""
+        snapshot = self.source.poll()
+        if self.replay is not None:
+            frame = self._frame()
+            frame[0] = encode_keys(snapshot.keys)
+            frame[1] = encode_buttons(snapshot.mouse_buttons)
+            frame[2] = _clamp_short(snapshot.mouse_pos[0])
+            frame[3] = _clamp_short(snapshot.mouse_pos[1])
+        return snapshot
+
+    def save(self, path):
+        """
+        將錄製內容寫入重播檔
+
+        Returns:
+            bool: 是否有內容可寫入
+        """
+        if self.replay is None:
+            return False
+        self._fill(self.clock.tick_count - self.start_tick)  # 補齊到最後執行的步長
+        self.replay.save(path)
+        return True
+
+
+class ReplayInput(InputSource):
+    """重播輸入 - 依模擬步長送出錄製的輸入快照與按鍵事件"""
+
+    def __init__(self, replay, clock):
+        if replay.tick_rate != clock.tick_rate:
+            raise ValueError(
+                f"重播的模擬頻率 {replay.tick_rate} 與時鐘 {clock.tick_rate} 不同"
+            )
+        self.replay = replay
+        self.clock = clock
+        self.start_tick = None
+        self._keys_cache = {}  # 按鍵遮罩 -> PressedKeys
+
+    def on_level_start(self, level_number, seed):
+        if self.start_tick is None:
+            self.start_tick = self.clock.tick_count
+
+    def _index(self):
+        if self.start_tick is None:
+            return 0
+        return self.clock.tick_count - self.start_tick
+
+    @property
+    def finished(self):
+        """錄製的步長是否已全部播完"""
+        return self._index() >= len(self.replay.frames)
+
+    def get_events(self):
+        """取得本步長開始前錄製到的按鍵事件"""
+        index = self._index()
+        if index >= len(self.replay.frames):
+            return []
+        return [
+            pygame.event.Event(pygame.KEYDOWN, key=key, mod=0, unicode="", scancode=0)
+            for key in self.replay.frames[index][4]
+        ]
+
+    def poll(self):
+        """讀取本步長錄製的輸入快照（播完後為沒有任何輸入）"""
+        index = self._index()
+        if index >= len(self.replay.frames):
+            key_mask, button_mask, mouse_x, mouse_y = 0, 0, 0, 0
+        else:
+            key_mask, button_mask, mouse_x, mouse_y, _ = self.replay.frames[index]
+
+        keys = self._keys_cache.get(key_mask)
+        if keys is None:
+            keys = decode_keys(key_mask)
+            self._keys_cache[key_mask] = keys
+        return InputSnapshot(keys, decode_buttons(button_mask), (mouse_x, mouse_y))
@@ -0,0 +1,236 @@
+"""
+時光倒流緩衝區 - 以固定容量的環狀緩衝區保存壓縮後的世界快照
+每隔數個快照存一次完整快照，其餘只存與上一個快照的差異；
+超過數量或記憶體上限時丟棄最舊的快照
+"""
+
+import pickle
+import zlib
+from collections import deque
+
+from constants import *
+
+# 快照種類
+SNAPSHOT_KEYFRAME = 0  # 完整快照
+SNAPSHOT_DELTA = 1  # 與上一個快照的差異
+
+_MISSING = object()
+
+
+def diff_states(previous, current):
+    """
+    計算兩個扁平快照的差異
+
+    Returns:
+        tuple: (變更或新增的 {鍵: 值}, 被移除的鍵列表)
+    """
+    changed = {
+        key: value
+        for key, value in current.items()
+        if previous.get(key, _MISSING) != value
+    }
+    removed = [key for key in previous if key not in current]
+    return changed, removed
+
+
+def apply_diff(state, diff):
+    """將差異套用到快照上（直接修改 state）"""
+    changed, removed = diff
+    state.update(changed)
+    for key in removed:
+        state.pop(key, None)
+    return state
+
+
+class RewindBuffer:
+    """
+    記憶體有上限的快照環狀緩衝區
+
+    每筆記錄為 (遊戲時間步數, 快照種類, 壓縮資料)。丟棄最舊的完整快照時，
+    會把緊接在後的差異快照改存為完整快照，確保剩下的記錄都能解碼。
+    """
+
+    def __init__(
+        self,
+        max_bytes=REWIND_MAX_BYTES,
+        max_snapshots=REWIND_MAX_SNAPSHOTS,
+        keyframe_interval=REWIND_KEYFRAME_INTERVAL,
+        use_delta=REWIND_USE_DELTA,
+        compress_level=1,
+    ):
+        """
+        初始化時光倒流緩衝區
+
+        Args:
+            max_bytes (int): 壓縮資料的總大小上限（至少保留最新的一個快照）
+            max_snapshots (int): 快照數量上限
+            keyframe_interval (int): 每隔多少個快照存一次完整快照
+            use_delta (bool): 是否以差異編碼儲存快照
+            compress_level (int): zlib 壓縮等級（越高越省記憶體、越耗時）
+        """
+        self.max_bytes = max_bytes
+        self.max_snapshots = max_snapshots
+        self.keyframe_interval = max(1, keyframe_interval)
+        self.use_delta = use_delta
+        self.compress_level = compress_level
+
+        self.entries = deque()
+        self.total_bytes = 0
+        self._last_state = None  # 最新快照的完整狀態（差異編碼的基準）
+        self._deltas_since_keyframe = 0
+        self._keyframe_bytes = 0  # 最近一個完整快照的大小（估計重建完整快照的成本）
+
+        # 統計資料
+        self.pushed = 0
+        self.evicted = 0
+        self.peak_bytes = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    @property
+    def latest_tick(self):
+        """最新快照的遊戲時間步數，沒有快照時為 None"""
+        return self.entries[-1][0] if self.entries else None
+
+    def _encode(self, payload):
+        return zlib.compress(
+            pickle.dumps(payload, pickle.HIGHEST_PROTOCOL), self.compress_level
+        )
+
+    def _decode(self, data):
+        return pickle.loads(zlib.decompress(data))
+
+    def push(self, tick, state):
+        """
+        存入一個快照
+
+        Args:
+            tick (int): 快照的遊戲時間步數（需比最新快照晚，否則忽略）
+            state (dict): 扁平的快照字典，存入後不可再修改
+
+        Returns:
+            bool: 是否存入
+        """
+        if self.entries and tick <= self.entries[-1][0]:
+            return False
+
+        keyframe = (
+            not self.use_delta
+            or self._last_state is None
+            or self._deltas_since_keyframe + 1 >= self.keyframe_interval
+        )
+        if keyframe:
+            data = self._encode(state)
+            self._deltas_since_keyframe = 0
+            self._keyframe_bytes = len(data)
+        else:
+            data = self._encode(diff_states(self._last_state, state))
+            self._deltas_since_keyframe += 1
+
+        kind = SNAPSHOT_KEYFRAME if keyframe else SNAPSHOT_DELTA
+        self.entries.append((tick, kind, data))
+        self.total_bytes += len(data)
+        self._last_state = state
+        self.pushed += 1
+
+        self.peak_bytes = max(self.peak_bytes, self.total_bytes)
+        self._enforce_limits()
+        return True
+
+    def _enforce_limits(self):
+        """丟棄最舊的快照直到符合數量與記憶體上限（至少保留最新的一個快照）"""
+        while len(self.entries) > 1 and (
+            len(self.entries) > self.max_snapshots or self.total_bytes > self.max_bytes
+        ):
+            # 先算出需要丟棄的數量再一次丟棄；若保留的第一個快照需要重建為完整快照，
+            # 一併計入它增加的大小，避免丟棄後又超過上限而反覆重建
+            entries = self.entries
+            count = max(0, len(entries) - self.max_snapshots)
+            freed = sum(len(entries[i][2]) for i in range(count))
+            while len(entries) - count > 1:
+                rebuild = (
+                    self._keyframe_bytes if entries[count][1] == SNAPSHOT_DELTA else 0
+                )
+                if self.total_bytes - freed + rebuild <= self.max_bytes:
+                    break
+                freed += len(entries[count][2])
+                count += 1
+            self._evict_oldest(max(count, 1))
+
+    def _evict_oldest(self, count):
+        """丟棄最舊的 count 個快照"""
+        next_tick, next_kind, next_data = self.entries[count]
+        if next_kind == SNAPSHOT_DELTA:
+            # 保留下來的第一個快照失去差異基準，改存為完整快照
+            _, state = self.state_at(count)
+            new_data = self._encode(state)
+            self.entries[count] = (next_tick, SNAPSHOT_KEYFRAME, new_data)
+            self.total_bytes += len(new_data) - len(next_data)
+
+        for _ in range(count):
+            self.total_bytes -= len(self.entries.popleft()[2])
+        self.evicted += count
+
+    def state_at(self, index):
+        """
+        解碼指定位置的快照
+
+        Returns:
+            tuple: (遊戲時間步數, 完整快照字典)
+        """
+        keyframe_index = index
+        while self.entries[keyframe_index][1] != SNAPSHOT_KEYFRAME:
+            keyframe_index -= 1
+
+        state = self._decode(self.entries[keyframe_index][2])
+        for i in range(keyframe_index + 1, index + 1):
+            apply_diff(state, self._decode(self.entries[i][2]))
+        return self.entries[index][0], state
+
+    def rewind(self, steps=1):
+        """
+        退回到最新快照之前第 steps 個快照，並丟棄比它新的快照
+
+        Returns:
+            tuple: (遊戲時間步數, 完整快照字典)，沒有快照時返回 None
+        """
+        if not self.entries:
+            return None
+
+        index = max(0, len(self.entries) - 1 - steps)
+        tick, state = self.state_at(index)
+
+        while len(self.entries) > index + 1:
+            self.total_bytes -= len(self.entries.pop()[2])
+
+        # 之後的差異快照以還原點為基準
+        self._last_state = state
+        self._deltas_since_keyframe = 0
+        for _, kind, _ in reversed(self.entries):
+            if kind == SNAPSHOT_KEYFRAME:
+                break
+            self._deltas_since_keyframe += 1
+
+        return tick, state
+
+    def clear(self):
+        """清空所有快照"""
+        self.entries.clear()
+        self.total_bytes = 0
+        self._last_state = None
+        self._deltas_since_keyframe = 0
+
+    def get_stats(self):
+        """獲取緩衝區統計"""
+        keyframes = sum(1 for _, kind, _ in self.entries if kind == SNAPSHOT_KEYFRAME)
+        span = self.entries[-1][0] - self.entries[0][0] if self.entries else 0
+        return {
+            "snapshots": len(self.entries),
+            "keyframes": keyframes,
+            "bytes": self.total_bytes,
+            "peak_bytes": self.peak_bytes,
+            "span_ticks": span,
+            "pushed": self.pushed,
+            "evicted": self.evicted,
+        }
@@ -0,0 +1,86 @@
+"""
+亂數串流系統 - 依用途分開的可重現亂數產生器
+每個關卡開始時以同一個種子重新設定所有串流，相同種子的模擬結果完全相同；
+特效與繪製使用獨立串流，調整特效品質不會改變遊戲結果
+"""
+
+import random
+
+# 亂數串流名稱
+STREAM_GAMEPLAY = "gameplay"  # 影響遊戲結果的判定（例如擊退方向）
+STREAM_EFFECTS = "effects"  # 粒子等視覺特效
+STREAM_SPAWNS = "spawns"  # 道具生成
+STREAM_RENDER = "render"  # 只在繪製時使用的抖動（繪製頻率不影響其他串流）
+
+RNG_STREAM_NAMES = (
+    STREAM_GAMEPLAY,
+    STREAM_EFFECTS,
+    STREAM_SPAWNS,
+    STREAM_RENDER,
+)
+
+
+def new_seed():
+    """產生新的隨機種子（未指定種子時使用）"""
+    return random.SystemRandom().randrange(2**31)
+
+
+class RandomStreams:
+    """依用途分開的亂數串流集合"""
+
+    def __init__(self, seed=None):
+        self.streams = {name: random.Random() for name in RNG_STREAM_NAMES}
+        self.current_seed = None
+        self.seed(seed)
+
+    def seed(self, seed=None):
+        """
+        以同一個種子重新設定所有串流
+
+        每個串流以 "種子:串流名稱" 導出各自的種子，彼此互不影響
+
+        Args:
+            seed: 種子（None 表示產生新的隨機種子）
+
+        Returns:
+            實際使用的種子
+        """
+        if seed is None:
+            seed = new_seed()
+        self.current_seed = seed
+        for name, stream in self.streams.items():
+            stream.seed(f"{seed}:{name}")
+        return seed
+
+    def get(self, name):
+        """獲取指定名稱的串流"""
+        return self.streams[name]
+
+    @property
+    def gameplay(self):
+        return self.streams[STREAM_GAMEPLAY]
+
+    @property
+    def effects(self):
+        return self.streams[STREAM_EFFECTS]
+
+    @property
+    def spawns(self):
+        return self.streams[STREAM_SPAWNS]
+
+    @property
+    def render(self):
+        return self.streams[STREAM_RENDER]
+
+    def get_state(self):
+        """獲取所有串流的內部狀態（可用於快照還原）"""
+        return {name: stream.getstate() for name, stream in self.streams.items()}
+
+    def set_state(self, state):
+        """還原所有串流的內部狀態"""
+        for name, stream_state in state.items():
+            self.streams[name].setstate(stream_state)
+
+
+# 全域亂數串流實例（每個關卡開始時重新設定種子）
+default_rng = RandomStreams()
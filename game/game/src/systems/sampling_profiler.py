@@ -0,0 +1,218 @@
+"""
+取樣分析系統 - 由背景執行緒定期擷取主執行緒的堆疊，輸出 folded stack 格式
+輸出可直接交給 flamegraph.pl、speedscope、inferno 等火焰圖工具
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+from constants import *
+
+# 堆疊超過最大深度時，取代被捨棄的外層的根節點
+TRUNCATED = "[truncated]"
+
+
+def frame_label(code):
+    """堆疊中一層的名稱：函式 (檔名:行號)"""
+    if code is TRUNCATED:
+        return TRUNCATED
+    return (
+        f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+    )
+
+
+class SamplingProfiler:
+    """
+    取樣分析器
+
+    與 cProfile 不同，被分析的程式碼不需要任何掛鉤：背景執行緒每隔固定時間
+    以 sys._current_frames() 讀取目標執行緒的堆疊，只記錄程式碼物件的組合並累計
+    次數，輸出時才轉成文字。取樣期間暫時縮短直譯器的執行緒切換間隔，
+    讓取樣執行緒能準時拿到 GIL。目標執行緒結束時取樣執行緒會自行停止。
+    """
+
+    def __init__(self, interval_ms=SAMPLING_INTERVAL_MS, max_depth=SAMPLING_MAX_DEPTH):
+        """
+        初始化取樣分析器
+
+        Args:
+            interval_ms (float): 取樣間隔（毫秒）
+            max_depth (int): 每次取樣記錄的最大堆疊深度（超過時保留最內層，
+                外層以 [truncated] 根節點代替）
+        """
+        self.interval_ms = interval_ms
+        self.max_depth = max_depth
+        # (程式碼物件, ...)（由外到內，過深時以 TRUNCATED 開頭） -> 次數
+        self.stacks = Counter()
+        self.samples = 0
+        self.target_thread_id = None
+        self.started_at = None
+        self.elapsed = 0.0  # 已取樣的總時間（秒）
+
+        self._thread = None
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()  # 保護 stop() 與取樣執行緒自行停止
+        self._switch_interval = None
+
+    @property
+    def running(self):
+        return self._thread is not None
+
+    def start(self, thread_id=None):
+        """
+        開始取樣
+
+        Args:
+            thread_id (int): 要取樣的執行緒（None 表示呼叫者所在的執行緒）
+        """
+        if self.running:
+            return
+        self.target_thread_id = (
+            thread_id if thread_id is not None else threading.get_ident()
+        )
+        self.started_at = time.perf_counter()
+
+        interval = self.interval_ms / 1000.0
+        self._switch_interval = sys.getswitchinterval()
+        if interval < self._switch_interval:
+            sys.setswitchinterval(interval)
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="sampling-profiler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """停止取樣（保留已累計的結果）"""
+        with self._lock:
+            thread = self._thread
+            if thread is None:
+                return
+            self._thread = None
+            self._stop_event.set()
+            self._finish()
+        thread.join()
+
+    def _finish(self):
+        """累計取樣時間並還原執行緒切換間隔（持有 _lock 時呼叫）"""
+        self.elapsed += time.perf_counter() - self.started_at
+        sys.setswitchinterval(self._switch_interval)
+
+    def toggle(self):
+        """
+        切換取樣狀態
+
+        Returns:
+            bool: 切換後是否正在取樣
+        """
+        if self.running:
+            self.stop()
+        else:
+            self.start()
+        return self.running
+
+    def reset(self):
+        """清除累計的結果"""
+        self.stacks.clear()
+        self.samples = 0
+        self.elapsed = 0.0
+
+    def _run(self):
+        """取樣執行緒"""
+        interval = self.interval_ms / 1000.0
+        target = self.target_thread_id
+        max_depth = self.max_depth
+        stacks = self.stacks
+        while not self._stop_event.wait(interval):
+            frame = sys._current_frames().get(target)
+            if frame is None:
+                # 目標執行緒已結束：自行停止，讓 running 變回 False
+                with self._lock:
+                    if self._thread is threading.current_thread():
+                        self._thread = None
+                        self._finish()
+                return
+
+            codes = []
+            while frame is not None:
+                codes.append(frame.f_code)
+                frame = frame.f_back
+            del frame
+            if len(codes) > max_depth:
+                codes = codes[:max_depth]  # 由內到外，保留最內層（自身耗時所在）
+                codes.append(TRUNCATED)
+            codes.reverse()
+            stacks[tuple(codes)] += 1
+            self.samples += 1
+
+    def folded_lines(self):
+        """
+        轉成 folded stack 格式的文字列
+
+        Returns:
+            list: 每列為「外層;...;內層 次數」，依次數由多到少排列
+        """
+        labels = {}
+        merged = Counter()
+        for codes, count in self.stacks.items():
+            names = []
+            for code in codes:
+                label = labels.get(code)
+                if label is None:
+                    label = labels[code] = frame_label(code).replace(";", ":")
+                names.append(label)
+            merged[";".join(names)] += count
+        return [f"{stack} {count}" for stack, count in merged.most_common()]
+
+    def write_folded(self, path):
+        """
+        將結果寫成 folded stack 檔
+
+        Returns:
+            str: 寫入的路徑
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            for line in self.folded_lines():
+                f.write(line + "\n")
+        return path
+
+    def top_functions(self, limit=10):
+        """
+        最常出現在堆疊最內層（自身耗時）的函式
+
+        Returns:
+            list: [(名稱, 次數, 佔比), ...]
+        """
+        own = Counter()
+        for codes, count in self.stacks.items():
+            own[codes[-1]] += count
+        total = self.samples or 1
+        return [
+            (frame_label(code), count, count / total)
+            for code, count in own.most_common(limit)
+        ]
+
+    def get_stats(self):
+        """獲取取樣統計資料"""
+        elapsed = self.elapsed
+        if self.running:
+            elapsed += time.perf_counter() - self.started_at
+        return {
+            "running": self.running,
+            "samples": self.samples,
+            "unique_stacks": len(self.stacks),
+            "elapsed_seconds": elapsed,
+            "samples_per_second": self.samples / elapsed if elapsed else 0.0,
+            "interval_ms": self.interval_ms,
+        }
+
+
+# 全域取樣分析器實例
+sampling_profiler = SamplingProfiler()
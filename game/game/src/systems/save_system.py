@@ -11,6 +11,7 @@ from constants import *
 class SaveSystem:
     def __init__(self):
         self.save_file = "game_save.json"
+        self.persistent = True  # 無視窗批次模擬時關閉，避免寫入玩家存檔
         self.default_save_data = {
             "unlocked_levels": [LEVEL_1],  # 預設解鎖第一關
             "completed_levels": [],
@@ -48,6 +49,9 @@ class SaveSystem:
 
     def _save_data(self):
         """保存存檔資料"""
+        if not self.persistent:
+            return
+
         try:
             with open(self.save_file, "w", encoding="utf-8") as f:
                 json.dump(self.save_data, f, ensure_ascii=False, indent=2)
@@ -123,9 +127,9 @@ class SaveSystem:
         self.save_data = self.default_save_data.copy()
         self._save_data()
 
-    def add_enemy_defeat(self):
+    def add_enemy_defeat(self, count=1):
         """增加擊敗敵人計數"""
-        self.save_data["player_stats"]["total_enemies_defeated"] += 1
+        self.save_data["player_stats"]["total_enemies_defeated"] += count
         # 不每次都保存，只在關卡結束時保存
 
     def add_playtime(self, time_ms):
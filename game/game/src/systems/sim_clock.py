@@ -0,0 +1,78 @@
+"""
+模擬時鐘系統 - 以固定步長推進遊戲時間
+取代各處直接讀取 pygame.time.get_ticks()，讓模擬可以比真實時間更快或補跑落後的步數
+"""
+
+from constants import SIM_TICK_RATE, SIM_MAX_CATCH_UP_STEPS
+
+
+class SimulationClock:
+    """固定步長的模擬時鐘"""
+
+    def __init__(
+        self, tick_rate=SIM_TICK_RATE, max_catch_up_steps=SIM_MAX_CATCH_UP_STEPS
+    ):
+        self.tick_rate = tick_rate
+        self.tick_ms = 1000.0 / tick_rate  # 每個模擬步長的毫秒數
+        self.max_catch_up_steps = max_catch_up_steps
+        self.tick_count = 0  # 已推進的模擬步數（只增不減，錄製與重播以此對齊）
+        self.time_offset = 0  # 時光倒流退回的步數（遊戲時間 = 步數 - 偏移）
+        self.accumulator = 0.0  # 尚未消化的真實經過時間（毫秒）
+
+    @property
+    def sim_tick(self):
+        """目前的遊戲時間（步數），時光倒流後會比 tick_count 小"""
+        return self.tick_count - self.time_offset
+
+    def get_ticks(self):
+        """獲取目前模擬時間（毫秒），介面與 pygame.time.get_ticks() 相同"""
+        return int((self.tick_count - self.time_offset) * self.tick_ms)
+
+    def rewind_to(self, sim_tick):
+        """將遊戲時間退回到指定步數（tick_count 不變，錄製與重播不受影響）"""
+        self.time_offset = self.tick_count - sim_tick
+
+    def get_blend(self):
+        """
+        目前幀在上一個與下一個模擬步長之間的位置，用於繪製插值
+
+        Returns:
+            float: 0.0（剛完成一步）到 1.0 之間
+        """
+        return min(1.0, self.accumulator / self.tick_ms)
+
+    def step(self, steps=1):
+        """推進指定的模擬步數"""
+        self.tick_count += steps
+
+    def accumulate(self, elapsed_ms):
+        """
+        累積真實經過時間，回傳本幀應執行的模擬步數
+
+        Args:
+            elapsed_ms (float): 上一幀經過的真實時間（毫秒）
+
+        Returns:
+            int: 需要執行的固定步數
+        """
+        self.accumulator += elapsed_ms
+        steps = int(self.accumulator // self.tick_ms)
+
+        if steps > self.max_catch_up_steps:
+            # 落後太多時丟棄多餘的積壓，避免越補越慢
+            steps = self.max_catch_up_steps
+            self.accumulator = 0.0
+        else:
+            self.accumulator -= steps * self.tick_ms
+
+        return steps
+
+    def reset(self, tick_count=0):
+        """重置模擬時鐘（可指定起始步數，例如重播時對齊錄製的時間）"""
+        self.tick_count = tick_count
+        self.time_offset = 0
+        self.accumulator = 0.0
+
+
+# 未注入時鐘時使用的預設實例
+default_clock = SimulationClock()
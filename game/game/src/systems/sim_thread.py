@@ -0,0 +1,139 @@
+"""
+模擬執行緒 - 在背景執行緒以固定步長更新遊戲，並發布可繪製的快照
+主執行緒只負責處理視窗事件與繪製最新的快照，繪製變慢不會拖慢輸入處理與模擬
+"""
+
+import queue
+import threading
+import time
+
+from systems.input_source import InputSnapshot, QueuedInput
+from systems.render_snapshot import build_render_frame
+
+
+class SimulationThread(threading.Thread):
+    """
+    背景模擬執行緒
+
+    所有遊戲狀態只由這個執行緒修改：主執行緒收到的事件與讀取的輸入快照放進同一個佇列，
+    在兩個步長之間交給狀態管理器與 input 處理。每次更新後建立一份凍結的繪製幀，
+    以雙緩衝的方式替換目前發布的幀，主執行緒隨時都能拿到完整的一幀。
+    """
+
+    def __init__(self, state_manager, clock, realtime=True, max_ticks=None):
+        """
+        初始化模擬執行緒
+
+        Args:
+            state_manager (GameStateManager): 遊戲狀態管理器
+            clock (SimulationClock): 模擬時鐘
+            realtime (bool): 是否依真實時間推進（否則不限速地連續更新，用於效能測試）
+            max_ticks (int): 最多執行的步數（None 表示直到 stop()）
+        """
+        super().__init__(name="simulation", daemon=True)
+        self.state_manager = state_manager
+        self.clock = clock
+        self.realtime = realtime
+        self.max_ticks = max_ticks
+
+        self.events = queue.SimpleQueue()  # 主執行緒轉交的事件與輸入快照
+        self.input = QueuedInput()  # 玩家讀取的輸入（由主執行緒轉交的快照更新）
+        self.event_source = None  # 每個步長前額外讀取事件的輸入來源（例如腳本或重播）
+        self._frame = None  # 目前發布的繪製幀
+        self._frame_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self.error = None  # 執行緒中發生的例外（由主執行緒重新拋出）
+
+        # 統計資料
+        self.ticks = 0
+        self.frames_published = 0
+        self.publish_ms = 0.0  # 建立繪製幀的累計耗時
+
+    def post_event(self, event):
+        """由主執行緒轉交事件"""
+        self.events.put(event)
+
+    def post_input(self, snapshot):
+        """由主執行緒轉交本幀讀取的輸入快照"""
+        self.events.put(snapshot)
+
+    def latest_frame(self):
+        """獲取最新發布的繪製幀"""
+        with self._frame_lock:
+            return self._frame
+
+    def stop(self):
+        """要求執行緒停止（在目前的步長結束後）"""
+        self._stop_event.set()
+
+    @property
+    def stopped(self):
+        return self._stop_event.is_set()
+
+    def _publish(self):
+        """建立並發布新的繪製幀"""
+        start = time.perf_counter()
+        frame = build_render_frame(self.state_manager)
+        self.publish_ms += (time.perf_counter() - start) * 1000.0
+        with self._frame_lock:
+            self._frame = frame
+        self.frames_published += 1
+
+    def _handle_events(self):
+        """處理主執行緒轉交與輸入來源提供的事件"""
+        handled = False
+        while True:
+            try:
+                event = self.events.get_nowait()
+            except queue.Empty:
+                break
+            if type(event) is InputSnapshot:
+                self.input.set_snapshot(event)
+                continue
+            self.state_manager.handle_event(event)
+            handled = True
+
+        if self.event_source is not None:
+            for event in self.event_source.get_events():
+                self.state_manager.handle_event(event)
+                handled = True
+        return handled
+
+    def _step(self):
+        """執行一個模擬步長"""
+        self.state_manager.update()
+        self.clock.step()
+        self.ticks += 1
+        if self.max_ticks is not None and self.ticks >= self.max_ticks:
+            self._stop_event.set()
+
+    def run(self):
+        try:
+            self._publish()
+            last = time.perf_counter()
+            while not self._stop_event.is_set():
+                if not self.realtime:
+                    self._handle_events()
+                    self._step()
+                    self._publish()
+                    continue
+
+                now = time.perf_counter()
+                steps = self.clock.accumulate((now - last) * 1000.0)
+                last = now
+
+                handled = self._handle_events()
+                for _ in range(steps):
+                    self._step()
+                    if self._stop_event.is_set():
+                        break
+
+                if steps or handled:
+                    self._publish()
+                else:
+                    # 距離下一個步長還有時間，讓出 CPU 給繪製
+                    remaining_ms = self.clock.tick_ms - self.clock.accumulator
+                    time.sleep(max(0.0, remaining_ms / 1000.0))
+        except BaseException as error:  # 由主執行緒重新拋出（pygame 只由主執行緒關閉）
+            self.error = error
+            self._stop_event.set()
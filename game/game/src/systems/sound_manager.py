@@ -5,6 +5,8 @@
 import pygame
 import os
 
+from startup_profiler import startup_profiler
+
 
 class SoundManager:
     """音效管理器 - 單例模式"""
@@ -25,12 +27,42 @@ class SoundManager:
             self.bgm_volume = 0.3  # 背景音樂音量
             self.original_bgm_volume = 0.3  # 原始背景音樂音量（用於恢復）
             self.bgm_playing = False  # 背景音樂播放狀態
+            self.deferred = None  # 不為 None 時 mixer 呼叫排入此佇列，由主執行緒執行
             SoundManager._initialized = True
 
+    def defer(self, commands):
+        """
+        之後的播放與音量呼叫改為排入佇列（模擬在背景執行緒時使用）
+
+        Args:
+            commands (queue.SimpleQueue): 佇列（None 表示恢復直接呼叫 mixer）
+        """
+        self.deferred = commands
+
+    def run_deferred(self):
+        """在主執行緒執行排入佇列的 mixer 呼叫"""
+        commands = self.deferred
+        if commands is None:
+            return
+        while not commands.empty():
+            func, args = commands.get_nowait()
+            try:
+                func(*args)
+            except pygame.error as e:
+                print(f"播放音效失敗: {e}")
+
+    def _mixer(self, func, *args):
+        """呼叫 mixer（啟用佇列時改為排入佇列）"""
+        if self.deferred is not None:
+            self.deferred.put((func, args))
+        else:
+            func(*args)
+
     def ensure_loaded(self):
         """確保音效已載入（延遲載入）"""
         if not self.sounds:
-            self._load_sounds()
+            with startup_profiler.stage("SoundManager._load_sounds"):
+                self._load_sounds()
 
     def _load_sounds(self):
         """載入所有音效檔案"""
@@ -59,8 +91,9 @@ class SoundManager:
                 file_path = os.path.join(base_path, filename)
                 if os.path.exists(file_path):
                     try:
-                        sound = pygame.mixer.Sound(file_path)
-                        sound.set_volume(self.volume)
+                        with startup_profiler.stage(f"pygame.mixer.Sound({filename})"):
+                            sound = pygame.mixer.Sound(file_path)
+                        self._mixer(sound.set_volume, self.volume)
                         self.sounds[sound_name] = sound
                         print(f"成功載入音效: {sound_name} ({filename})")
                     except pygame.error as e:
@@ -84,7 +117,7 @@ class SoundManager:
 
         if sound_name in self.sounds:
             try:
-                self.sounds[sound_name].play()
+                self._mixer(self.sounds[sound_name].play)
             except pygame.error as e:
                 print(f"播放音效失敗: {sound_name} - {e}")
         else:
@@ -129,7 +162,7 @@ class SoundManager:
         self.volume = max(0.0, min(1.0, volume))
         self.ensure_loaded()
         for sound in self.sounds.values():
-            sound.set_volume(self.volume)
+            self._mixer(sound.set_volume, self.volume)
 
     def set_enabled(self, enabled):
         """啟用/禁用音效"""
@@ -137,7 +170,7 @@ class SoundManager:
 
     def stop_all_sounds(self):
         """停止所有音效"""
-        pygame.mixer.stop()
+        self._mixer(pygame.mixer.stop)
 
     def get_available_sounds(self):
         """取得已載入的音效列表"""
@@ -159,7 +192,8 @@ class SoundManager:
             file_path = os.path.join(base_path, filename)
             if os.path.exists(file_path):
                 try:
-                    pygame.mixer.music.load(file_path)
+                    with startup_profiler.stage("pygame.mixer.music.load"):
+                        pygame.mixer.music.load(file_path)
                     pygame.mixer.music.set_volume(self.bgm_volume)
                     print(f"成功載入背景音樂: {filename}")
                     return
@@ -174,7 +208,7 @@ class SoundManager:
             return
 
         try:
-            pygame.mixer.music.play(loops)
+            self._mixer(pygame.mixer.music.play, loops)
             self.bgm_playing = True
             print("開始播放背景音樂")
         except pygame.error as e:
@@ -182,28 +216,30 @@ class SoundManager:
 
     def stop_background_music(self):
         """停止背景音樂"""
-        pygame.mixer.music.stop()
+        self._mixer(pygame.mixer.music.stop)
         self.bgm_playing = False
         print("停止背景音樂")
 
     def pause_background_music(self):
         """暫停背景音樂"""
-        pygame.mixer.music.pause()
+        self._mixer(pygame.mixer.music.pause)
         print("暫停背景音樂")
 
     def resume_background_music(self):
         """恢復背景音樂"""
-        pygame.mixer.music.unpause()
+        self._mixer(pygame.mixer.music.unpause)
         print("恢復背景音樂")
 
     def is_bgm_playing(self):
         """檢查背景音樂是否正在播放"""
+        if self.deferred is not None:
+            return self.bgm_playing  # 播放呼叫可能還在佇列中，不讀取 mixer 的狀態
         return self.bgm_playing and pygame.mixer.music.get_busy()
 
     def set_bgm_volume(self, volume):
         """設定背景音樂音量 (0.0 - 1.0)"""
         self.bgm_volume = max(0.0, min(1.0, volume))
-        pygame.mixer.music.set_volume(self.bgm_volume)
+        self._mixer(pygame.mixer.music.set_volume, self.bgm_volume)
 
     def reduce_bgm_volume_for_gameplay(self):
         """進入關卡時將背景音樂音量減少50%"""
@@ -0,0 +1,112 @@
+"""
+特效圖像快取 - 預先繪製帶透明度的粒子圖像
+以 (形狀, 顏色, 大小, 透明度分級) 為鍵，使用 LRU 淘汰，繪製時只需查表加一次 blit
+擴張中的光環每幀大小都不同、圖像又大，放進快取只會淘汰粒子圖像，因此不經過快取
+"""
+
+import pygame
+from collections import OrderedDict
+from constants import *
+
+
+class SpriteCache:
+    """帶 LRU 淘汰的預繪圖像快取"""
+
+    def __init__(
+        self,
+        max_entries=SPRITE_CACHE_MAX_ENTRIES,
+        max_pixels=SPRITE_CACHE_MAX_PIXELS,
+        alpha_step=SPRITE_CACHE_ALPHA_STEP,
+    ):
+        self.max_entries = max_entries
+        self.max_pixels = max_pixels
+        self.alpha_step = alpha_step
+
+        self.sprites = OrderedDict()  # 鍵 -> pygame.Surface，最近使用的放在最後
+        self.pixel_count = 0
+
+        # 統計資料
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _alpha_bucket(self, alpha):
+        """將透明度量化為分級值"""
+        alpha = max(0, min(255, int(alpha)))
+        return min(
+            255, (alpha + self.alpha_step // 2) // self.alpha_step * self.alpha_step
+        )
+
+    def _lookup(self, key, factory):
+        """查詢快取，未命中時以 factory 建立圖像並加入快取"""
+        sprite = self.sprites.get(key)
+        if sprite is not None:
+            self.hits += 1
+            self.sprites.move_to_end(key)
+            return sprite
+
+        self.misses += 1
+        sprite = factory()
+        self.sprites[key] = sprite
+        self.pixel_count += sprite.get_width() * sprite.get_height()
+
+        # 超過數量或像素上限時淘汰最久未使用的圖像
+        while len(self.sprites) > 1 and (
+            len(self.sprites) > self.max_entries or self.pixel_count > self.max_pixels
+        ):
+            _, evicted = self.sprites.popitem(last=False)
+            self.pixel_count -= evicted.get_width() * evicted.get_height()
+            self.evictions += 1
+
+        return sprite
+
+    def get_circle(self, color, size, alpha):
+        """
+        獲取實心圓形粒子圖像
+
+        Args:
+            color (tuple): 顏色 (R, G, B)
+            size (int): 半徑
+            alpha (int): 透明度 (0 - 255)
+
+        Returns:
+            pygame.Surface: 大小為 (size * 2, size * 2) 的圖像
+        """
+        alpha = self._alpha_bucket(alpha)
+        key = ("circle", color, size, alpha)
+
+        def factory():
+            surface = pygame.Surface((size * 2, size * 2))
+            surface.set_alpha(alpha)
+            surface.set_colorkey(BLACK)
+            pygame.draw.circle(surface, color, (size, size), size)
+            return surface
+
+        return self._lookup(key, factory)
+
+    def get_stats(self):
+        """獲取快取命中統計"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self.sprites),
+            "pixels": self.pixel_count,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def reset_stats(self):
+        """重置統計資料"""
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def clear(self):
+        """清空快取"""
+        self.sprites.clear()
+        self.pixel_count = 0
+
+
+# 全域特效圖像快取實例
+sprite_cache = SpriteCache()
@@ -0,0 +1,172 @@
+"""
+世界快照系統 - 擷取與還原關卡的模擬狀態
+快照只保存基本型別的屬性（數值、字串、布林與由它們組成的容器），
+以扁平的 {(區段, ..., 屬性): 值} 字典表示，方便比較前後差異與序列化
+"""
+
+from systems.rng import STREAM_GAMEPLAY, STREAM_SPAWNS
+
+# 影響遊戲結果、需要隨快照還原的亂數串流（特效與繪製串流不影響模擬）
+SNAPSHOT_RNG_STREAMS = (STREAM_GAMEPLAY, STREAM_SPAWNS)
+
+_SCALAR_TYPES = (bool, int, float, str, type(None))
+NOT_PLAIN = object()  # copy_plain() 遇到非基本型別時的返回值
+
+
+def copy_plain(value):
+    """
+    複製由基本型別組成的值
+
+    Returns:
+        複製後的值；含有其他物件（例如 Rect、實體、系統）時返回 NOT_PLAIN
+    """
+    value_type = type(value)
+    if value_type in _SCALAR_TYPES:
+        return value
+
+    if value_type is list or value_type is tuple:
+        items = []
+        for item in value:
+            item = copy_plain(item)
+            if item is NOT_PLAIN:
+                return NOT_PLAIN
+            items.append(item)
+        return items if value_type is list else tuple(items)
+
+    if value_type is dict:
+        result = {}
+        for key, item in value.items():
+            item = copy_plain(item)
+            if item is NOT_PLAIN or type(key) not in _SCALAR_TYPES:
+                return NOT_PLAIN
+            result[key] = item
+        return result
+
+    return NOT_PLAIN
+
+
+def capture_attrs(obj):
+    """擷取物件所有基本型別的屬性"""
+    attrs = {}
+    for name, value in vars(obj).items():
+        value = copy_plain(value)
+        if value is not NOT_PLAIN:
+            attrs[name] = value
+    return attrs
+
+
+class WorldSnapshotter:
+    """
+    關卡世界的快照擷取與還原
+
+    敵人以關卡設定完成時的順序編號，已移除的敵人在還原時重新放回關卡；
+    投射物與血量道具會重新建立（不呼叫建構子），並接回玩家與時鐘等共用物件。
+    快照中的時間為遊戲時間步數，還原時將時鐘退回該時間，冷卻與計時器因此保持一致。
+    """
+
+    def __init__(self, level):
+        self.level = level
+        self.enemy_roster = list(level.enemies)  # 關卡開始時的所有敵人
+        self._enemy_index = {id(enemy): i for i, enemy in enumerate(self.enemy_roster)}
+
+        # 重建物件時可以接回的共用物件
+        self._refs = {"player": level.player, "clock": level.clock}
+        self._ref_names = {id(obj): name for name, obj in self._refs.items()}
+
+    def _sections(self):
+        """以屬性方式保存的單一物件（區段名稱 -> 物件）"""
+        level = self.level
+        return {
+            "level": level,
+            "player": level.player,
+            "left_fist": level.player.left_fist,
+            "right_fist": level.player.right_fist,
+            "spawner": level.health_item_spawner,
+        }
+
+    def _capture_object(self, obj):
+        """擷取會重新建立的物件：(類型, 基本屬性, 共用物件參照)"""
+        refs = {
+            name: self._ref_names[id(value)]
+            for name, value in vars(obj).items()
+            if id(value) in self._ref_names
+        }
+        return (type(obj), capture_attrs(obj), refs)
+
+    def _rebuild_object(self, obj_type, attrs, refs, obj=None):
+        """依擷取內容重建物件（不呼叫建構子）"""
+        if obj is None:
+            obj = obj_type.__new__(obj_type)
+        obj.__dict__.update(copy_plain(attrs))
+        for name, ref in refs.items():
+            setattr(obj, name, self._refs[ref])
+        return obj
+
+    def capture(self):
+        """
+        擷取目前的世界狀態
+
+        Returns:
+            dict: 扁平的快照字典
+        """
+        level = self.level
+        state = {("clock",): level.clock.sim_tick}
+
+        for section, obj in self._sections().items():
+            for name, value in capture_attrs(obj).items():
+                state[(section, name)] = value
+
+        enemy_index = self._enemy_index
+        state[("enemies",)] = tuple(enemy_index[id(enemy)] for enemy in level.enemies)
+        for enemy in level.enemies:
+            index = enemy_index[id(enemy)]
+            for name, value in capture_attrs(enemy).items():
+                state[("enemy", index, name)] = value
+
+        state[("projectiles",)] = tuple(
+            (enemy_index.get(id(projectile.owner)),) + self._capture_object(projectile)
+            for projectile in level.projectile_manager.active
+        )
+        state[("health_items",)] = tuple(
+            self._capture_object(item) for item in level.health_item_spawner.items
+        )
+
+        for name in SNAPSHOT_RNG_STREAMS:
+            state[("rng", name)] = level.rng.get(name).getstate()
+
+        return state
+
+    def restore(self, state):
+        """將世界還原到快照的狀態"""
+        level = self.level
+        sections = self._sections()
+        roster = self.enemy_roster
+
+        for key, value in state.items():
+            section = key[0]
+            if section == "enemy":
+                setattr(roster[key[1]], key[2], copy_plain(value))
+            elif section == "rng":
+                level.rng.get(key[1]).setstate(value)
+            elif section in sections:
+                setattr(sections[section], key[1], copy_plain(value))
+
+        level.enemies = [roster[index] for index in state[("enemies",)]]
+
+        # 投射物放回物件池後依快照重新生成
+        manager = level.projectile_manager
+        manager.clear()
+        for owner_index, projectile_type, attrs, refs in state[("projectiles",)]:
+            owner = roster[owner_index] if owner_index is not None else None
+            projectile = manager.restore(projectile_type, owner)
+            if projectile is not None:
+                slot = projectile.slot
+                self._rebuild_object(projectile_type, attrs, refs, projectile)
+                projectile.owner = owner
+                projectile.slot = slot
+
+        level.health_item_spawner.items = [
+            self._rebuild_object(*item) for item in state[("health_items",)]
+        ]
+
+        level.clock.rewind_to(state[("clock",)])
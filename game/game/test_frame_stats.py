@@ -0,0 +1,63 @@
+"""
+幀時間報告的測試
+"""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+from constants import GAME_STATE
+from systems.frame_stats import FrameStatsRecorder, OUTCOME_COMPLETE
+
+SECTIONS = {"update.player": 1.0, "draw.other": 2.0}
+
+
+class FakeLevel:
+    """只提供記錄器需要的屬性的關卡"""
+
+    def __init__(self, level_number=1, seed=7):
+        self.level_number = level_number
+        self.seed = seed
+        self.level_complete = False
+        self.game_over = False
+
+
+class FakeStateManager:
+    def __init__(self, level):
+        self.current_state = GAME_STATE
+        self.current_level = level
+
+
+def play(recorder, level, frames, complete=False):
+    """記錄數幀，最後一幀時完成關卡"""
+    for i in range(frames):
+        if complete and i == frames - 1:
+            level.level_complete = True
+        recorder._on_frame(i, 3.0, SECTIONS)
+
+
+def test_complete_restart_complete(tmp_path):
+    """完成關卡後按 R 原地重新開始，再次完成時輸出第二份報告"""
+    level = FakeLevel()
+    recorder = FrameStatsRecorder(FakeStateManager(level), str(tmp_path))
+
+    play(recorder, level, 10, complete=True)
+    assert len(recorder.written) == 1
+
+    # 完成畫面停留的幀不屬於任何記錄
+    play(recorder, level, 5)
+    assert recorder.session is None
+
+    # R：GameLevel.restart() 在同一個物件上還原關卡
+    level.level_complete = False
+    play(recorder, level, 20, complete=True)
+
+    assert len(recorder.written) == 2
+    reports = []
+    for path in recorder.written:
+        with open(path, encoding="utf-8") as f:
+            reports.append(json.load(f))
+    assert [r["frames"] for r in reports] == [10, 20]
+    assert all(r["outcome"] == OUTCOME_COMPLETE for r in reports)
@@ -0,0 +1,46 @@
+"""
+重播系統的測試
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+import pygame
+
+from constants import LEVEL_1, MENU_STATE
+from main import Game
+from systems.replay import Replay
+from systems.save_system import save_system
+
+ESC_FRAME = 10
+
+
+def make_replay():
+    """21 步的重播，第 10 步按下 ESC 回到選單"""
+    frames = [[0, 0, 0, 0, []] for _ in range(21)]
+    frames[ESC_FRAME][4].append(pygame.K_ESCAPE)
+    return Replay(LEVEL_1, seed=1234, frames=frames)
+
+
+def test_replay_round_trip_with_escape(tmp_path):
+    """存檔再讀回的重播與原本相同，播放到 ESC 時停在選單並回報離開的關卡"""
+    path = str(tmp_path / "escape.rply")
+    replay = make_replay()
+    replay.save(path)
+    loaded = Replay.load(path)
+
+    assert loaded.level_number == replay.level_number
+    assert loaded.seed == replay.seed
+    assert loaded.frames == replay.frames
+
+    game = Game(headless=True)
+    save_system.persistent = True  # 模擬以視窗模式播放
+    result = game.run_replay(loaded, draw=False)
+
+    assert not save_system.persistent
+    assert game.state_manager.current_state == MENU_STATE
+    assert result["level"] == LEVEL_1
+    assert result["ticks"] == ESC_FRAME
+    assert result["recorded_ticks"] == len(replay)
@@ -0,0 +1,240 @@
+"""
+效能測試的共用工具
+
+在無視窗模式下執行，量測塔樓生成、遊戲更新、平台碰撞與繪製的耗時，
+並與 perf_baseline.json 中的基準比較。各測試模組以 perf_case 註冊量測項目。
+
+不同機器的速度不同，因此每個項目量測的前後都執行一段固定的校準工作，
+基準與比較都使用「量測耗時 / 校準耗時」的比值。每次量測至少持續一段固定的時間，
+取各批次的中位數，避免幾十微秒的項目被單次的雜訊左右。
+
+計時的斷言預設略過（一般的 pytest 只執行功能檢查），設定 TOWER_PERF_TESTS=1 才會比較基準。
+
+用法：
+    python -m pytest test_*.py            # 只執行功能測試
+    TOWER_PERF_TESTS=1 python -m pytest test_*.py   # 同時執行效能測試
+    python simple_test.py                 # 顯示目前的量測結果與基準
+    python simple_test.py --update-baseline   # 重新量測並寫入基準
+
+容許的退化比例可用環境變數 TOWER_PERF_TOLERANCE 調整（預設 0.5，即 50%）。
+"""
+
+import json
+import os
+import sys
+import time
+
+# 必須在匯入 pygame 之前設定，讓測試不需要顯示器與音效裝置
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+BASELINE_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "perf_baseline.json"
+)
+DEFAULT_TOLERANCE = 0.5
+PERF_REPEAT = 7  # 每個項目至少量測的批次數（取中位數）
+PERF_MIN_SECONDS = 0.25  # 每個項目至少量測的總時間
+
+# 註冊效能測試的模組（--update-baseline 時匯入以收集量測項目）
+PERF_MODULES = [
+    "test_spiral_tower",
+    "test_upgrade_system",
+    "test_circular_world",
+    "test_fixed_center",
+]
+
+# 名稱 -> (建立工作的函式, 每次量測的執行次數)
+PERF_CASES = {}
+
+
+def init_pygame():
+    """初始化無視窗的 pygame（繪製與 UI 字體需要）"""
+    if not pygame.get_init():
+        pygame.init()
+    if not pygame.font.get_init():
+        pygame.font.init()
+    if pygame.display.get_surface() is None:
+        pygame.display.set_mode((1, 1))
+
+
+def perf_case(name, number=1):
+    """
+    註冊效能量測項目的裝飾器
+
+    被裝飾的函式負責準備狀態，並返回要計時的無參數函式
+
+    Args:
+        name (str): 項目名稱（基準檔中的鍵）
+        number (int): 每次量測連續執行的次數
+    """
+
+    def register(setup):
+        PERF_CASES[name] = (setup, number)
+        return setup
+
+    return register
+
+
+def time_call(func, number=1, repeat=PERF_REPEAT, min_seconds=PERF_MIN_SECONDS):
+    """
+    量測函式的耗時
+
+    每批次連續呼叫 number 次，至少量測 repeat 批次且總時間至少 min_seconds
+
+    Returns:
+        float: 各批次平均每次呼叫毫秒數的中位數
+    """
+    samples = []
+    total = 0.0
+    while len(samples) < repeat or total < min_seconds:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        samples.append(elapsed * 1000.0 / number)
+        total += elapsed
+    samples.sort()
+    return samples[len(samples) // 2]
+
+
+def calibration_workload():
+    """校準用的固定工作：與遊戲相似的 Rect 建立與碰撞檢查"""
+    rects = [pygame.Rect(i * 7 % 1000, i * 13 % 6000, 80, 20) for i in range(200)]
+    hits = 0
+    for i in range(200):
+        probe = pygame.Rect(i * 5, i * 30, 30, 40)
+        for rect in rects:
+            if probe.colliderect(rect):
+                hits += 1
+    return hits
+
+
+def calibration_ms():
+    """這台機器目前執行校準工作的耗時"""
+    return time_call(calibration_workload, number=5)
+
+
+def measure(name):
+    """
+    量測一個已註冊的項目
+
+    項目前後各校準一次，取平均作為比值的分母，讓機器負載的變化同時影響兩者
+
+    Returns:
+        dict: {"ms": 毫秒, "ratio": 相對於校準工作的比值}
+    """
+    init_pygame()
+    setup, number = PERF_CASES[name]
+    func = setup()
+    before = calibration_ms()
+    ms = time_call(func, number)
+    calibration = (before + calibration_ms()) / 2.0
+    return {"ms": ms, "ratio": ms / calibration, "calibration_ms": calibration}
+
+
+def perf_tests_enabled():
+    """是否執行計時的斷言（預設關閉，設定 TOWER_PERF_TESTS=1 開啟）"""
+    return os.environ.get("TOWER_PERF_TESTS", "") not in ("", "0")
+
+
+def get_tolerance():
+    """容許的退化比例"""
+    value = os.environ.get("TOWER_PERF_TOLERANCE")
+    return float(value) if value else DEFAULT_TOLERANCE
+
+
+def load_baseline(path=BASELINE_PATH):
+    """讀取基準檔（不存在時返回空字典）"""
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f).get("cases", {})
+
+
+def save_baseline(results, path=BASELINE_PATH):
+    """將量測結果寫入基準檔"""
+    data = {
+        "cases": {
+            name: {
+                "ms": round(r["ms"], 6),
+                "ratio": round(r["ratio"], 6),
+                "calibration_ms": round(r["calibration_ms"], 6),
+            }
+            for name, r in results.items()
+        },
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+
+
+def check_regression(name):
+    """
+    量測項目並與基準比較
+
+    Returns:
+        tuple: (是否通過, 說明文字)；基準中沒有這個項目時返回 (None, 說明文字)
+    """
+    result = measure(name)
+    baseline = load_baseline().get(name)
+    if baseline is None:
+        return None, f"{name}: 基準中沒有此項目（{result['ms']:.3f} ms）"
+
+    tolerance = get_tolerance()
+    limit = baseline["ratio"] * (1.0 + tolerance)
+    change = result["ratio"] / baseline["ratio"] - 1.0
+    message = (
+        f"{name}: {result['ms']:.3f} ms，比值 {result['ratio']:.3f}"
+        f"（基準 {baseline['ratio']:.3f}，變化 {change:+.0%}，"
+        f"容許 +{tolerance:.0%}）"
+    )
+    print(message)
+    return result["ratio"] <= limit, message
+
+
+def assert_no_regression(name):
+    """效能測試的斷言：未開啟或沒有基準時略過，超過容許範圍時失敗"""
+    import pytest
+
+    if not perf_tests_enabled():
+        pytest.skip("效能測試預設略過（設定 TOWER_PERF_TESTS=1 執行）")
+    passed, message = check_regression(name)
+    if passed is None:
+        pytest.skip(message)
+    assert passed, "效能退化 - " + message
+
+
+def collect_cases():
+    """匯入所有效能測試模組以註冊量測項目"""
+    for module in PERF_MODULES:
+        __import__(module)
+
+
+def main(argv):
+    collect_cases()
+    init_pygame()
+
+    results = {name: measure(name) for name in PERF_CASES}
+    baseline = load_baseline()
+    for name, result in results.items():
+        line = (
+            f"{name:28} {result['ms']:9.3f} ms  比值 {result['ratio']:7.3f}"
+            f"（校準 {result['calibration_ms']:.3f} ms）"
+        )
+        if name in baseline:
+            change = result["ratio"] / baseline[name]["ratio"] - 1.0
+            line += f"  基準 {baseline[name]['ratio']:7.3f} ({change:+.0%})"
+        print(line)
+
+    if "--update-baseline" in argv:
+        save_baseline(results)
+        print(f"已寫入基準：{BASELINE_PATH}")
+
+
+if __name__ == "__main__":
+    # 以模組名稱重新匯入，讓測試模組註冊到同一份 PERF_CASES
+    import simple_test
+
+    simple_test.main(sys.argv[1:])
@@ -0,0 +1,54 @@
+"""
+玩家與平台碰撞檢測的效能測試
+"""
+
+from simple_test import perf_case, assert_no_regression
+
+from config.settings import *
+from levels.level_generator import LevelGenerator
+from src.player import Player
+
+# (x, y, vel_y)：落在安全起始平台上、在半空中、從平台下方撞上
+COLLISION_PROBES = [
+    (485, 0, 5),
+    (900, 2600, 5),
+    (120, 3000, -8),
+]
+
+
+def make_probe(x, y, vel_y):
+    """建立位於指定位置與速度的玩家"""
+    player = Player(x, y)
+    player.vel_y = vel_y
+    return player
+
+
+@perf_case("check_platform_collision", number=2000)
+def setup_collision():
+    """計時對整座塔樓的平台做一次碰撞檢測"""
+    platforms = LevelGenerator.generate_complete_tower()[0]
+    players = [make_probe(*probe) for probe in COLLISION_PROBES]
+
+    def check():
+        for player, (x, y, vel_y) in zip(players, COLLISION_PROBES):
+            player.x = x
+            player.y = y
+            player.vel_y = vel_y
+            player.check_platform_collision(platforms)
+
+    return check
+
+
+def test_landing_on_start_platform():
+    """從上方落到安全起始平台時會站在平台上"""
+    platforms = LevelGenerator.generate_complete_tower()[0]
+    player = make_probe(*COLLISION_PROBES[0])
+    player.check_platform_collision(platforms)
+
+    assert player.on_ground
+    assert player.vel_y == 0
+
+
+def test_check_platform_collision_performance():
+    """平台碰撞檢測沒有效能退化"""
+    assert_no_regression("check_platform_collision")
@@ -0,0 +1,50 @@
+"""
+遊戲繪製的效能測試 - 攝影機跟隨玩家置中時繪製整個畫面
+"""
+
+import pygame
+
+from simple_test import init_pygame, perf_case, assert_no_regression
+
+from config.settings import *
+from src.game import Game
+
+# 量測繪製時玩家所在的高度（起點、區域交界的安全平台附近、塔的深處）
+DRAW_HEIGHTS = [-20, SECTION_HEIGHT - 100, 3 * SECTION_HEIGHT + 400]
+
+
+def center_camera(game, y):
+    """將玩家移到指定高度，攝影機置中在玩家身上"""
+    game.player.y = y
+    game.camera_y = y - WINDOW_HEIGHT // 2
+
+
+@perf_case("game_draw", number=20)
+def setup_draw():
+    """計時在不同高度繪製一幀"""
+    init_pygame()
+    game = Game()
+    surface = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
+
+    def draw():
+        for y in DRAW_HEIGHTS:
+            center_camera(game, y)
+            game.draw(surface)
+
+    return draw
+
+
+def test_camera_keeps_player_centered():
+    """更新後攝影機會往玩家的位置靠近"""
+    init_pygame()
+    game = Game()
+    center_camera(game, DRAW_HEIGHTS[-1])
+    game.update()
+
+    offset = game.player.y - game.camera_y
+    assert abs(offset - WINDOW_HEIGHT // 2) < WINDOW_HEIGHT // 2
+
+
+def test_game_draw_performance():
+    """遊戲繪製沒有效能退化"""
+    assert_no_regression("game_draw")
@@ -0,0 +1,33 @@
+"""
+塔樓生成的效能測試
+"""
+
+from simple_test import perf_case, assert_no_regression
+
+from config.settings import *
+from levels.level_generator import LevelGenerator
+
+
+@perf_case("generate_complete_tower", number=200)
+def setup_tower_generation():
+    """計時完整塔樓的生成"""
+    return LevelGenerator.generate_complete_tower
+
+
+def test_tower_covers_all_sections():
+    """塔樓的每個區域都有平台"""
+    platforms, enemies, cheeses = LevelGenerator.generate_complete_tower()
+
+    for i in range(TOTAL_SECTIONS):
+        section_y = i * SECTION_HEIGHT
+        in_section = [
+            p
+            for p in platforms
+            if section_y - 100 <= p.rect.y < section_y + SECTION_HEIGHT
+        ]
+        assert in_section, f"區域 {i + 1} 沒有平台"
+
+
+def test_generate_complete_tower_performance():
+    """塔樓生成沒有效能退化"""
+    assert_no_regression("generate_complete_tower")
@@ -0,0 +1,77 @@
+"""
+遊戲更新的效能測試 - 以固定的腳本操作玩家一路往下，經過每個區域的升級選單
+"""
+
+from simple_test import init_pygame, perf_case, assert_no_regression
+
+from config.settings import *
+from src.game import Game
+
+DESCENT_FRAMES = 1500  # 腳本下降的幀數（足以抵達塔底）
+STALL_FRAMES = 20  # 水平位置停滯多少幀後轉向
+
+
+def run_descent(game, frames=DESCENT_FRAMES):
+    """
+    以腳本操作玩家下降：持續朝同一方向走，被擋住時轉向，
+    出現升級選單時選擇第一個選項
+
+    Returns:
+        int: 套用的升級次數
+    """
+    direction = 1
+    last_x = None
+    stall = 0
+    upgrades = 0
+
+    for _ in range(frames):
+        if game.game_state == "upgrade":
+            game.apply_upgrade(game.upgrade_options[0]["type"])
+            upgrades += 1
+        if game.game_state != "playing":
+            break
+
+        player = game.player
+        if last_x is not None and abs(player.x - last_x) < 1:
+            stall += 1
+            if stall > STALL_FRAMES:
+                direction = -direction
+                stall = 0
+        else:
+            stall = 0
+        last_x = player.x
+
+        if direction > 0:
+            player.move_right()
+        else:
+            player.move_left()
+        game.update()
+
+    return upgrades
+
+
+@perf_case("game_update_descent")
+def setup_descent():
+    """計時整段腳本下降（每次量測使用新的遊戲）"""
+    init_pygame()
+
+    def descent():
+        run_descent(Game())
+
+    return descent
+
+
+def test_descent_reaches_every_section():
+    """腳本下降會經過所有區域的升級選單"""
+    init_pygame()
+    game = Game()
+    upgrades = run_descent(game)
+
+    assert upgrades == TOTAL_SECTIONS - 1
+    assert game.player.y >= (TOTAL_SECTIONS - 1) * SECTION_HEIGHT
+    assert game.player.max_health > PLAYER_MAX_HEALTH
+
+
+def test_game_update_performance():
+    """遊戲更新沒有效能退化"""
+    assert_no_regression("game_update_descent")